@@ -3,27 +3,110 @@ Main Agent Class
 Handles task execution and orchestration
 """
 
+import asyncio
+import functools
 import logging
+import os
+import pickle
+import threading
 import time
+from concurrent.futures import (
+    FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait,
+    TimeoutError as FutureTimeoutError
+)
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import AsyncIterator, Awaitable, Callable, Dict, Hashable, Iterator, List, Any, Optional, Tuple
 from .tool_registry import ToolRegistry
+from .tools import BaseTool, CancellationToken, TaskCancelled, TaskTimeout, ToolSpec
+from .history import HistoryStore, TaskHistory
+from .cache import ResultCache, normalize_task
+from .routing import BaseRouter
+from .metrics import AgentMetrics
+from .profiling import Profile, TaskProfiler
+from .events import EventBroker
+
+
+# Per-process tools used by process-pool batch workers, by name
+_worker_tools: Dict[str, ToolSpec] = {}
+
+
+def _init_worker(specs: Dict[str, bytes]):
+    """Receive the parent agent's tool specs in a batch worker process"""
+    _worker_tools.update((name, pickle.loads(spec)) for name, spec in specs.items())
+
+
+def _run_in_worker(tool_name: str, task: str, timeout: Optional[float] = None) -> Tuple[Any, float]:
+    """Run a single task inside a batch worker process, returning (result, seconds)"""
+    token = CancellationToken(timeout) if timeout is not None else None
+    started = time.perf_counter()
+    result = _worker_tools[tool_name].load().invoke(task, token)
+    return result, time.perf_counter() - started
+
+
+def _terminate_pool(pool: ProcessPoolExecutor):
+    """Kill the worker processes of a process pool without waiting for them"""
+    terminate = getattr(pool, "terminate_workers", None)
+    if terminate is not None:
+        terminate()
+        return
+    # Before Python 3.14 there is no public way to stop running workers
+    for process in list((getattr(pool, "_processes", None) or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False)
 
 
 class Agent:
     """Main AI Agent class for task automation"""
     
-    def __init__(self, name: str = "CodevAgent"):
+    def __init__(self, name: str = "CodevAgent", history: Optional[HistoryStore] = None,
+                 cache: Optional[ResultCache] = None, router: Optional[BaseRouter] = None,
+                 default_timeout: Optional[float] = None, metrics: Optional[AgentMetrics] = None,
+                 profiler: Optional[TaskProfiler] = None, coalesce: bool = True,
+                 events: Optional[EventBroker] = None):
         """
         Initialize the agent
         
         Args:
             name: Name of the agent
+            history: Task history store (defaults to a bounded in-memory store)
+            cache: Cache of tool results (optional, disabled by default)
+            router: Router choosing tools for tasks (defaults to keyword routing)
+            default_timeout: Time budget in seconds for tools without their
+                own ``timeout`` (None = unlimited)
+            metrics: Metrics to record routing, tool, history and task
+                outcomes in (optional, disabled by default)
+            profiler: Profiler for tasks run with ``profile`` and for its
+                ``sample_rate`` of all other tasks (defaults to profiling
+                only on request)
+            coalesce: Let concurrent identical tasks share one tool run
+                (tools can opt out with their ``coalesce`` attribute)
+            events: Broker to publish task start and finish events to
+                (optional, disabled by default)
         """
         self.name = name
-        self.tool_registry = ToolRegistry()
-        self.task_history: List[Dict[str, Any]] = []
+        self.default_timeout = default_timeout
+        self.tool_registry = ToolRegistry(router)
+        self.task_history: HistoryStore = history if history is not None else TaskHistory()
+        self.cache = cache
+        self.metrics = metrics
+        self.profiler = profiler if profiler is not None else TaskProfiler()
+        self.coalesce = coalesce
+        self.events = events
         self.logger = self._setup_logger()
+        self._lock = threading.Lock()
+        # Task IDs come from the history store, so numbering continues after
+        # stored tasks and processes sharing a store never reuse an ID
+        self._task_ids = self.task_history.task_ids()
+        self._limits: Dict[str, threading.BoundedSemaphore] = {}
+        # Cancellation tokens of running tasks, by task ID
+        self._running: Dict[int, CancellationToken] = {}
+        # Runs tools with a time budget so callers can stop waiting for them
+        self._timed_pool: Optional[ThreadPoolExecutor] = None
+        # Tool runs other callers can join, by (tool name, normalized task)
+        self._in_flight: Dict[Tuple[str, Hashable], Future] = {}
+        self._async_limits: Dict[str, asyncio.Semaphore] = {}
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
         
     def _setup_logger(self) -> logging.Logger:
         """Setup logging configuration"""
@@ -45,23 +128,675 @@ class Agent:
         
         return logger
     
-    def execute_task(self, task: str, tool_name: Optional[str] = None) -> Dict[str, Any]:
+    def execute_task(self, task: str, tool_name: Optional[str] = None,
+                     timeout: Optional[float] = None, profile: Optional[str] = None) -> Dict[str, Any]:
         """
         Execute a task using available tools
         
+        Safe to call from many threads at once; concurrent runs of the same
+        tool are bounded by the tool's ``max_concurrency`` setting.
+        
+        With a time budget, the call returns once the budget is spent even
+        if the tool keeps running; the task is recorded with status
+        "timeout" and the tool's cancellation token is cancelled.
+        
+        With ``profile``, the returned dictionary also has a "profile" key
+        holding the task's profile as collapsed stacks. The profile is not
+        stored in history.
+        
+        Args:
+            task: Task description
+            tool_name: Specific tool to use (optional)
+            timeout: Time budget in seconds (defaults to the tool's
+                ``timeout``, then the agent's ``default_timeout``)
+            profile: Profile the task: "trace" to time every call, "sample"
+                to sample its stack every ``profiler.interval`` seconds (a
+                shorter task gets one sample, taken where it finished)
+        
+        Returns:
+            Dictionary with execution results
+        """
+        if profile is None and not self.profiler.sampled():
+            return self._execute_task(task, tool_name, timeout)
+        
+        task_profile = self.profiler.start(profile)
+        with task_profile.attach():
+            result = self._execute_task(task, tool_name, timeout, task_profile)
+        self.profiler.finish(task_profile)
+        
+        if profile is None:
+            return result
+        return dict(result, profile=task_profile.collapsed())
+    
+    def _execute_task(self, task: str, tool_name: Optional[str], timeout: Optional[float],
+                      profile: Optional[Profile] = None) -> Dict[str, Any]:
+        """Run a task for ``execute_task``, following ``profile`` onto helper threads"""
+        start_time = time.perf_counter()
+        result = self._start_task(task)
+        
+        try:
+            tool_name, tool = self._resolve_tool(task, tool_name)
+            result["tool_used"] = tool_name
+            
+            # Execute the tool
+            if not self._load_cached(result, tool):
+                token = self._new_token(result, tool, timeout)
+                result["result"] = self._call_shared(
+                    result, tool, token, lambda: self._call_tool(tool, task, token, profile)
+                )
+                self._store_cached(tool, task, result["result"])
+            result["status"] = "completed"
+            
+            self.logger.info(f"Task {result['task_id']} completed successfully")
+            
+        except Exception as e:
+            self._fail_task(result, e)
+        
+        return self._finish_task(result, start_time)
+    
+    def stream_task(self, task: str, tool_name: Optional[str] = None,
+                    timeout: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Execute a task, yielding its output as the tool produces it
+        
+        Yields event dictionaries whose "event" key is one of:
+        
+        - "start": a tool was selected (``task_id``, ``tool_used``)
+        - "chunk": a piece of output (``task_id``, ``data``)
+        - "end": the task finished (``result`` holds the task record, as
+          returned by ``execute_task``)
+        
+        Results served from the cache, and tools that do not stream, produce
+        no chunks; their output is only in the "end" event. The time budget
+        is checked between chunks.
+        
+        Args:
+            task: Task description
+            tool_name: Specific tool to use (optional)
+            timeout: Time budget in seconds (defaults as for ``execute_task``)
+        
+        Returns:
+            Iterator of events
+        """
+        start_time = time.perf_counter()
+        result = self._start_task(task)
+        
+        try:
+            tool_name, tool = self._resolve_tool(task, tool_name)
+            result["tool_used"] = tool_name
+            yield {"event": "start", "task_id": result["task_id"], "tool_used": tool_name}
+            
+            # Execute the tool, passing chunks through as they arrive
+            if not self._load_cached(result, tool):
+                token = self._new_token(result, tool, timeout)
+                with self._tool_slot(tool, token):
+                    chunks = tool.stream(task)
+                    # Time spent by the consumer between chunks is not tool time
+                    tool_time = 0.0
+                    while True:
+                        started = time.perf_counter()
+                        try:
+                            chunk = next(chunks)
+                        except StopIteration as stop:
+                            result["result"] = stop.value
+                            break
+                        finally:
+                            tool_time += time.perf_counter() - started
+                        if token.cancelled:
+                            chunks.close()
+                            token.raise_if_cancelled()
+                        yield {"event": "chunk", "task_id": result["task_id"], "data": chunk}
+                    if self.metrics is not None:
+                        self.metrics.record_tool(tool_name, tool_time)
+                self._store_cached(tool, task, result["result"])
+            result["status"] = "completed"
+            
+            self.logger.info(f"Task {result['task_id']} completed successfully")
+            
+        except GeneratorExit:
+            # The consumer stopped reading; still record the task
+            self._fail_task(result, RuntimeError("Stream closed before the task finished"))
+            self._finish_task(result, start_time)
+            raise
+        except Exception as e:
+            self._fail_task(result, e)
+        
+        yield {"event": "end", "result": self._finish_task(result, start_time)}
+    
+    async def astream_task(self, task: str, tool_name: Optional[str] = None,
+                           timeout: Optional[float] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute a task without blocking the event loop, yielding its output
+        
+        Yields the same events as ``stream_task``; the tool runs in the
+        event loop's default executor.
+        
+        Args:
+            task: Task description
+            tool_name: Specific tool to use (optional)
+            timeout: Time budget in seconds (defaults as for ``execute_task``)
+        
+        Returns:
+            Async iterator of events
+        """
+        loop = asyncio.get_running_loop()
+        events = self.stream_task(task, tool_name, timeout)
+        done = object()
+        
+        try:
+            while True:
+                event = await loop.run_in_executor(None, next, events, done)
+                if event is done:
+                    break
+                yield event
+        finally:
+            events.close()
+    
+    def execute_batch(
+        self,
+        tasks: List[str],
+        tool_name: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        executor: str = "thread",
+        ordered: bool = True,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Execute many tasks concurrently on a worker pool
+        
+        Task IDs are allocated up front in submission order, so they match
+        the position of each task in ``tasks`` regardless of which worker
+        finishes first. History records are appended as tasks finish.
+        
+        Each task's time budget starts when it is submitted. Tasks that
+        exceed it are recorded as "timeout" without waiting for them; with
+        the process executor, workers still running them are terminated.
+        
+        Args:
+            tasks: Task descriptions
+            tool_name: Specific tool to use for every task (optional)
+            max_workers: Pool size (defaults to the number of CPUs)
+            executor: "thread" for I/O-bound tools, "process" for CPU-bound tools.
+                Process workers get copies of this agent's tool specs; tools
+                registered as instances are pickled, and tasks of tools that
+                can't be pickled fail
+            ordered: Return results in submission order instead of completion order
+            timeout: Time budget in seconds per task (defaults as for ``execute_task``)
+        
+        Returns:
+            Dictionary with per-task results and throughput numbers
+        """
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown executor '{executor}', expected 'thread' or 'process'")
+        
+        max_workers = max_workers or os.cpu_count() or 1
+        batch_start = time.perf_counter()
+        records = [self._start_task(task) for task in tasks]
+        results: List[Dict[str, Any]] = []
+        # Route the whole batch at once; routers can score it in one pass
+        if tool_name:
+            routes = [tool_name] * len(tasks)
+        else:
+            routes = self.tool_registry.router.route_batch(tasks)
+            if self.metrics is not None:
+                self.metrics.record_routes(routes)
+        
+        # Tools that can't be sent to worker processes, with the reason
+        unsendable: Dict[str, str] = {}
+        if executor == "process":
+            specs = {}
+            for name in set(routes):
+                if not self.tool_registry.has_tool(name):
+                    continue
+                try:
+                    specs[name] = pickle.dumps(self.tool_registry.get_spec(name))
+                except Exception as e:
+                    unsendable[name] = f"Tool '{name}' can't be sent to worker processes ({e}); use the thread executor"
+            pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_worker,
+                initargs=(specs,)
+            )
+        else:
+            pool = ThreadPoolExecutor(max_workers=max_workers)
+        
+        self.logger.info(
+            f"Starting batch of {len(records)} tasks on {max_workers} {executor} workers"
+        )
+        
+        futures: Dict[Future, Tuple[Dict[str, Any], BaseTool, float, CancellationToken]] = {}
+        # Set when a timed-out task may still be running in the pool
+        abandoned = False
+        try:
+            for record, route in zip(records, routes):
+                start_time = time.perf_counter()
+                try:
+                    # Tools are selected here so routing stays in one place;
+                    # process workers only receive the tool name
+                    name, tool = self._resolve_tool(record["task"], route)
+                    record["tool_used"] = name
+                    if name in unsendable:
+                        raise ValueError(unsendable[name])
+                    if self._load_cached(record, tool):
+                        record["status"] = "completed"
+                        results.append(self._finish_task(record, start_time))
+                        continue
+                    token = self._new_token(record, tool, timeout)
+                    if executor == "process":
+                        future = pool.submit(_run_in_worker, name, record["task"], token.timeout)
+                    else:
+                        future = pool.submit(
+                            self._call_shared, record, tool, token,
+                            functools.partial(self._run_tool, tool, record["task"], token)
+                        )
+                except Exception as e:
+                    self._fail_task(record, e)
+                    results.append(self._finish_task(record, start_time))
+                    continue
+                futures[future] = (record, tool, start_time, token)
+            
+            pending = set(futures)
+            while pending:
+                deadlines = [futures[f][3].deadline for f in pending if futures[f][3].deadline is not None]
+                wait_time = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+                done, pending = wait(pending, timeout=wait_time, return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    record, tool, start_time, token = futures[future]
+                    try:
+                        if executor == "process":
+                            record["result"], seconds = future.result()
+                            if self.metrics is not None:
+                                self.metrics.record_tool(tool.name, seconds)
+                        else:
+                            record["result"] = future.result()
+                        record["status"] = "completed"
+                        self._store_cached(tool, record["task"], record["result"])
+                    except Exception as e:
+                        self._fail_task(record, e)
+                    results.append(self._finish_task(record, start_time))
+                
+                for future in [f for f in pending if futures[f][3].expired]:
+                    pending.discard(future)
+                    record, tool, start_time, token = futures[future]
+                    token.expire()
+                    if not future.cancel():
+                        abandoned = True
+                    self._fail_task(record, token.exception())
+                    results.append(self._finish_task(record, start_time))
+        finally:
+            if abandoned and executor == "process":
+                _terminate_pool(pool)
+            else:
+                # Threads can't be stopped; leave abandoned ones to finish
+                # on their own instead of waiting for them
+                pool.shutdown(wait=not abandoned)
+        
+        if ordered:
+            results.sort(key=lambda r: r["task_id"])
+        
+        duration = time.perf_counter() - batch_start
+        completed = sum(1 for r in results if r["status"] == "completed")
+        timed_out = sum(1 for r in results if r["status"] == "timeout")
+        
+        self.logger.info(f"Batch finished: {completed}/{len(results)} tasks in {duration:.2f}s")
+        
+        return {
+            "results": results,
+            "total": len(results),
+            "completed": completed,
+            "failed": len(results) - completed,
+            "timed_out": timed_out,
+            "executor": executor,
+            "max_workers": max_workers,
+            "duration": duration,
+            "throughput": len(results) / duration if duration > 0 else 0.0
+        }
+    
+    async def aexecute_task(self, task: str, tool_name: Optional[str] = None,
+                            timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Execute a task without blocking the event loop
+        
+        Concurrent executions of the same tool are bounded by the tool's
+        ``max_concurrency`` setting.
+        
         Args:
             task: Task description
             tool_name: Specific tool to use (optional)
+            timeout: Time budget in seconds (defaults as for ``execute_task``)
         
         Returns:
             Dictionary with execution results
         """
-        start_time = time.time()
-        task_id = len(self.task_history) + 1
+        start_time = time.perf_counter()
+        result = self._start_task(task)
+        
+        try:
+            tool_name, tool = self._resolve_tool(task, tool_name)
+            result["tool_used"] = tool_name
+            
+            # Execute the tool
+            if not self._load_cached(result, tool):
+                token = self._new_token(result, tool, timeout)
+                if token.deadline is None:
+                    result["result"] = await self._arun_tool(tool, task, token)
+                else:
+                    try:
+                        result["result"] = await asyncio.wait_for(
+                            self._arun_tool(tool, task, token), token.remaining()
+                        )
+                    except asyncio.TimeoutError:
+                        token.expire()
+                        raise token.exception()
+                self._store_cached(tool, task, result["result"])
+            result["status"] = "completed"
+            
+            self.logger.info(f"Task {result['task_id']} completed successfully")
+            
+        except Exception as e:
+            self._fail_task(result, e)
+        
+        return self._finish_task(result, start_time)
+    
+    async def aexecute_batch(
+        self,
+        tasks: List[str],
+        tool_name: Optional[str] = None,
+        max_concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Execute many tasks concurrently on the running event loop
+        
+        Args:
+            tasks: Task descriptions
+            tool_name: Specific tool to use for every task (optional)
+            max_concurrency: Maximum number of tasks in flight (None = unbounded)
+        
+        Returns:
+            List of task results in submission order
+        """
+        if max_concurrency is None:
+            return list(await asyncio.gather(
+                *(self.aexecute_task(task, tool_name) for task in tasks)
+            ))
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def run(task: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.aexecute_task(task, tool_name)
+        
+        return list(await asyncio.gather(*(run(task) for task in tasks)))
+    
+    def cancel_task(self, task_id: int) -> bool:
+        """
+        Request cancellation of a running task
+        
+        Cancellation is cooperative: tools that support it stop at their
+        next check and the task is recorded as "cancelled".
+        
+        Args:
+            task_id: Task ID
+        
+        Returns:
+            True if the task was running
+        """
+        token = self._running.get(task_id)
+        if token is None:
+            return False
+        token.cancel(f"Task {task_id} cancelled")
+        return True
+    
+    def _new_token(self, result: Dict[str, Any], tool: BaseTool,
+                   timeout: Optional[float] = None) -> CancellationToken:
+        """
+        Create and register the cancellation token of a task
+        
+        Args:
+            result: Task record
+            tool: Tool selected for the task
+            timeout: Time budget requested by the caller
+        
+        Returns:
+            Token whose deadline is the first budget that applies: the
+            caller's, the tool's, then the agent's default
+        """
+        for budget in (timeout, tool.timeout, self.default_timeout):
+            if budget is not None:
+                break
+        token = CancellationToken(budget)
+        self._running[result["task_id"]] = token
+        return token
+    
+    def _get_limit(self, tool: BaseTool) -> Optional[threading.BoundedSemaphore]:
+        """
+        Get the semaphore bounding concurrent runs of a tool across threads
+        
+        Args:
+            tool: Tool instance
+        
+        Returns:
+            Semaphore, or None if the tool is unbounded
+        """
+        if tool.max_concurrency is None:
+            return None
+        
+        limit = self._limits.get(tool.name)
+        if limit is None:
+            with self._lock:
+                limit = self._limits.setdefault(tool.name, threading.BoundedSemaphore(tool.max_concurrency))
+        return limit
+    
+    @contextmanager
+    def _tool_slot(self, tool: BaseTool, token: Optional[CancellationToken] = None):
+        """
+        Hold one of a tool's concurrency slots
+        
+        Args:
+            tool: Tool instance
+            token: Cancellation token; waiting for a slot stops at its deadline
+        
+        Raises:
+            TaskTimeout: If no slot became free before the deadline
+        """
+        limit = self._get_limit(tool)
+        if limit is None:
+            yield
+            return
+        
+        if not limit.acquire(timeout=token.remaining() if token is not None else None):
+            token.expire()
+            token.raise_if_cancelled()
+        try:
+            yield
+        finally:
+            limit.release()
+    
+    def _run_tool(self, tool: BaseTool, task: str, token: Optional[CancellationToken] = None) -> Any:
+        """Run a tool, waiting for a free slot if its concurrency is limited"""
+        with self._tool_slot(tool, token):
+            # Don't start work that has already been cancelled or timed out
+            if token is not None:
+                token.raise_if_cancelled()
+            if self.metrics is None:
+                return tool.invoke(task, token)
+            started = time.perf_counter()
+            try:
+                return tool.invoke(task, token)
+            finally:
+                self.metrics.record_tool(tool.name, time.perf_counter() - started)
+    
+    def _call_tool(self, tool: BaseTool, task: str, token: CancellationToken,
+                   profile: Optional[Profile] = None) -> Any:
+        """
+        Run a tool, giving up on it once the token's deadline passes
+        
+        Tools with a deadline run on a helper thread so the caller can stop
+        waiting even if the tool ignores its token; ``profile`` is attached
+        to that thread as well.
+        
+        Raises:
+            TaskTimeout: If the deadline passed first
+        """
+        if token.deadline is None:
+            return self._run_tool(tool, task, token)
+        
+        if self._timed_pool is None:
+            with self._lock:
+                if self._timed_pool is None:
+                    self._timed_pool = ThreadPoolExecutor(thread_name_prefix=f"{self.name}-timed")
+        
+        run = self._run_tool if profile is None else profile.wrap(self._run_tool)
+        future = self._timed_pool.submit(run, tool, task, token)
+        try:
+            return future.result(timeout=token.remaining())
+        except FutureTimeoutError:
+            # A TimeoutError raised by the tool itself is an ordinary failure
+            if future.done():
+                raise
+            future.cancel()
+            token.expire()
+            raise token.exception()
+    
+    def _call_shared(self, result: Dict[str, Any], tool: BaseTool, token: CancellationToken,
+                     run: Callable[[], Any]) -> Any:
+        """
+        Run a tool once for all concurrent callers with the same task
+        
+        The first caller for a (tool, normalized task) pair runs ``run``;
+        callers arriving while it is running wait for and share its result
+        or error, and their records are marked "coalesced". Each waiter
+        keeps its own deadline and cancellation. If the first caller gave
+        up because of its own deadline or cancellation, waiters start over
+        instead of sharing that outcome. Nothing is kept once the run
+        finishes, so no caller sees a stale result.
+        
+        Args:
+            result: Task record of the caller
+            tool: Tool selected for the task
+            token: Cancellation token of the caller
+            run: Runs the tool for this caller
+        
+        Returns:
+            Tool result
+        """
+        if not (self.coalesce and tool.coalesce):
+            return run()
+        
+        normalize = self.cache.normalize if self.cache is not None else normalize_task
+        key = (tool.name, normalize(result["task"]))
+        
+        while True:
+            with self._lock:
+                shared = self._in_flight.get(key)
+                if shared is None:
+                    shared = self._in_flight[key] = Future()
+                    break
+            
+            result["coalesced"] = True
+            self.logger.info(f"Task {result['task_id']} joined an identical running task")
+            try:
+                return self._wait_shared(shared, token)
+            except TaskCancelled:
+                if token.cancelled:
+                    raise
+                # The run was abandoned by its own caller; try again
+                result.pop("coalesced", None)
+        
+        try:
+            value = run()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            shared.set_exception(e)
+            raise
+        with self._lock:
+            del self._in_flight[key]
+        shared.set_result(value)
+        return value
+    
+    def _wait_shared(self, shared: Future, token: CancellationToken) -> Any:
+        """
+        Wait for a shared tool run, giving up on the caller's deadline or cancellation
+        
+        Raises:
+            TaskTimeout: If the caller's deadline passed first
+            TaskCancelled: If the caller was cancelled first
+        """
+        while True:
+            # Wake up now and then to notice cancel_task()
+            remaining = token.remaining()
+            try:
+                return shared.result(timeout=0.1 if remaining is None else min(remaining, 0.1))
+            except FutureTimeoutError:
+                # A TimeoutError raised by the tool itself is shared like any error
+                if shared.done():
+                    raise
+                token.raise_if_cancelled()
+    
+    async def _arun_tool(self, tool: BaseTool, task: str, token: CancellationToken) -> Any:
+        """Run a tool asynchronously, waiting for a free slot if its concurrency is limited"""
+        # Tools that don't take a token may override aexecute with the older signature
+        call = tool.aexecute(task, token) if tool.supports_cancellation else tool.aexecute(task)
+        if self.metrics is not None:
+            call = self._timed_call(tool, call)
+        limit = self._get_async_limit(tool)
+        if limit is None:
+            return await call
+        async with limit:
+            return await call
+    
+    async def _timed_call(self, tool: BaseTool, call: Awaitable) -> Any:
+        """Await a tool call, recording how long it ran"""
+        started = time.perf_counter()
+        try:
+            return await call
+        finally:
+            self.metrics.record_tool(tool.name, time.perf_counter() - started)
+    
+    def _get_async_limit(self, tool: BaseTool) -> Optional[asyncio.Semaphore]:
+        """
+        Get the semaphore bounding concurrent async runs of a tool
+        
+        Semaphores belong to one event loop, so they are recreated when the
+        agent is driven from a different loop.
+        
+        Args:
+            tool: Tool instance
+        
+        Returns:
+            Semaphore, or None if the tool is unbounded
+        """
+        if tool.max_concurrency is None:
+            return None
+        
+        loop = asyncio.get_running_loop()
+        if loop is not self._async_loop:
+            self._async_loop = loop
+            self._async_limits = {}
+        
+        if tool.name not in self._async_limits:
+            self._async_limits[tool.name] = asyncio.Semaphore(tool.max_concurrency)
+        return self._async_limits[tool.name]
+    
+    def _start_task(self, task: str) -> Dict[str, Any]:
+        """
+        Allocate a task ID and build the initial task record
+        
+        Args:
+            task: Task description
+        
+        Returns:
+            Pending task record
+        """
+        task_id = next(self._task_ids)
         
         self.logger.info(f"Starting task {task_id}: {task}")
+        if self.events is not None:
+            self.events.publish("task", task_id=task_id, task=task, status="started")
         
-        result = {
+        return {
             "task_id": task_id,
             "task": task,
             "status": "pending",
@@ -71,40 +806,111 @@ class Agent:
             "start_time": datetime.now().isoformat(),
             "duration": 0
         }
+    
+    def _resolve_tool(self, task: str, tool_name: Optional[str] = None) -> Tuple[str, BaseTool]:
+        """
+        Select the tool that should run a task
         
-        try:
-            # Select appropriate tool
-            if tool_name:
-                if not self.tool_registry.has_tool(tool_name):
-                    raise ValueError(f"Tool '{tool_name}' not found")
-                tool = self.tool_registry.get_tool(tool_name)
-            else:
-                # Auto-select tool based on task keywords
-                tool_name = self._select_tool(task)
-                tool = self.tool_registry.get_tool(tool_name)
-            
-            self.logger.info(f"Using tool: {tool_name}")
-            result["tool_used"] = tool_name
-            
-            # Execute the tool
-            tool_result = tool.execute(task)
-            
-            result["status"] = "completed"
-            result["result"] = tool_result
-            
-            self.logger.info(f"Task {task_id} completed successfully")
-            
-        except Exception as e:
+        Args:
+            task: Task description
+            tool_name: Specific tool to use (optional)
+        
+        Returns:
+            Tuple of (tool name, tool instance)
+        
+        Raises:
+            ValueError: If the requested tool does not exist
+        """
+        # Select appropriate tool
+        if tool_name:
+            if not self.tool_registry.has_tool(tool_name):
+                raise ValueError(f"Tool '{tool_name}' not found")
+            tool = self.tool_registry.get_tool(tool_name)
+        else:
+            # Auto-select tool based on task keywords
+            started = time.perf_counter()
+            tool_name = self._select_tool(task)
+            if self.metrics is not None:
+                self.metrics.record_route(tool_name, time.perf_counter() - started)
+            tool = self.tool_registry.get_tool(tool_name)
+        
+        self.logger.info(f"Using tool: {tool_name}")
+        
+        return tool_name, tool
+    
+    def _load_cached(self, result: Dict[str, Any], tool: BaseTool) -> bool:
+        """
+        Fill a task record from the result cache
+        
+        Args:
+            result: Task record
+            tool: Tool selected for the task
+        
+        Returns:
+            True on a cache hit
+        """
+        if self.cache is None:
+            return False
+        
+        hit = False
+        if self.cache.is_cacheable(tool):
+            hit, value = self.cache.get(tool.name, result["task"])
+            if hit:
+                result["result"] = value
+                self.logger.info(f"Task {result['task_id']} served from cache")
+        
+        result["cached"] = hit
+        return hit
+    
+    def _store_cached(self, tool: BaseTool, task: str, value: Any):
+        """Store a tool result in the result cache"""
+        if self.cache is not None and self.cache.is_cacheable(tool):
+            self.cache.set(tool.name, task, value)
+    
+    def _fail_task(self, result: Dict[str, Any], error: Exception):
+        """Mark a task record as failed, timed out or cancelled"""
+        if isinstance(error, TaskTimeout):
+            result["status"] = "timeout"
+        elif isinstance(error, TaskCancelled):
+            result["status"] = "cancelled"
+        else:
             result["status"] = "failed"
-            result["error"] = str(e)
-            self.logger.error(f"Task {task_id} failed: {str(e)}")
+        result["error"] = str(error)
+        self.logger.error(f"Task {result['task_id']} {result['status']}: {str(error)}")
+    
+    def _finish_task(self, result: Dict[str, Any], start_time: float) -> Dict[str, Any]:
+        """
+        Stamp the end time of a task record and store it in history
+        
+        Args:
+            result: Task record
+            start_time: Time the task started, from time.perf_counter()
+        
+        Returns:
+            The finished task record
+        """
+        self._running.pop(result["task_id"], None)
         
         # Calculate duration
-        result["duration"] = time.time() - start_time
         result["end_time"] = datetime.now().isoformat()
+        finished = time.perf_counter()
+        result["duration"] = finished - start_time
         
         # Store in history
-        self.task_history.append(result)
+        if self.metrics is None:
+            self.task_history.append(result)
+        else:
+            # The history write is timed from the end of the task
+            self.task_history.append(result)
+            self.metrics.record_task(result["tool_used"], result["status"], time.perf_counter() - finished)
+        
+        # Results can be large, so subscribers fetch them separately
+        if self.events is not None:
+            self.events.publish(
+                "task", task_id=result["task_id"], task=result["task"],
+                status=result["status"], tool_used=result["tool_used"],
+                duration=result["duration"], error=result["error"]
+            )
         
         return result
     
@@ -118,39 +924,40 @@ class Agent:
         Returns:
             Tool name
         """
-        task_lower = task.lower()
+        return self.tool_registry.router.route(task)
+    
+    def explain_route(self, task: str) -> Dict[str, Any]:
+        """
+        Explain how a task would be routed
         
-        # Simple keyword-based selection
-        if any(keyword in task_lower for keyword in ["search", "find", "lookup", "query"]):
-            return "search"
-        elif any(keyword in task_lower for keyword in ["code", "generate", "create", "implement", "write"]):
-            return "code_generator"
-        elif any(keyword in task_lower for keyword in ["document", "doc", "explain", "describe", "define"]):
-            return "docs"
-        else:
-            # Default to search
-            return "search"
+        Args:
+            task: Task description
+        
+        Returns:
+            Chosen tool, per-tool scores and the matches behind them
+        """
+        return self.tool_registry.router.explain(task)
     
     def get_task_history(self) -> List[Dict[str, Any]]:
         """Get all task execution history"""
-        return self.task_history
+        return self.task_history.to_list()
     
     def get_task_by_id(self, task_id: int) -> Optional[Dict[str, Any]]:
         """Get specific task by ID"""
-        for task in self.task_history:
-            if task["task_id"] == task_id:
-                return task
-        return None
+        return self.task_history.get(task_id)
     
     def list_tools(self) -> List[str]:
         """List all available tools"""
         return self.tool_registry.list_tools()
     
     def get_tool_info(self, tool_name: str) -> Dict[str, Any]:
-        """Get information about a specific tool"""
-        tool = self.tool_registry.get_tool(tool_name)
-        return {
-            "name": tool.name,
-            "description": tool.description,
-            "version": getattr(tool, "version", "1.0.0")
-        }
+        """Get information about a specific tool, without loading it"""
+        return self.tool_registry.get_spec(tool_name).info()
+    
+    def close(self):
+        """Flush and release the history store and result cache"""
+        if self._timed_pool is not None:
+            self._timed_pool.shutdown(wait=False)
+        self.task_history.close()
+        if self.cache is not None:
+            self.cache.close()
@@ -0,0 +1,11 @@
+"""
+Cache package
+Caching of tool results
+"""
+
+from .base_backend import CacheBackend
+from .memory_backend import MemoryBackend
+from .sqlite_backend import SQLiteCacheBackend
+from .result_cache import ResultCache, normalize_task
+
+__all__ = ["CacheBackend", "MemoryBackend", "SQLiteCacheBackend", "ResultCache", "normalize_task"]
@@ -0,0 +1,55 @@
+"""
+Base Cache Backend
+Abstract storage interface used by the result cache
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class CacheBackend(ABC):
+    """Abstract base class for result cache storage"""
+    
+    @abstractmethod
+    def get(self, key: Tuple[str, Hashable]) -> Tuple[bool, Any]:
+        """
+        Look up an entry, dropping it if it has expired
+        
+        Args:
+            key: (tool name, normalized task) key
+        
+        Returns:
+            Tuple of (hit, value); value is None on a miss
+        """
+        pass
+    
+    @abstractmethod
+    def set(self, key: Tuple[str, Hashable], value: Any, ttl: Optional[float]):
+        """
+        Store an entry, evicting others if the backend is full
+        
+        Args:
+            key: (tool name, normalized task) key
+            value: Tool result
+            ttl: Seconds the entry stays valid (None = until evicted)
+        """
+        pass
+    
+    @abstractmethod
+    def clear(self):
+        """Remove every entry"""
+        pass
+    
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get storage counters
+        
+        Returns:
+            Entries, bytes, evictions and expirations
+        """
+        pass
+    
+    def close(self):
+        """Release any resources held by the backend"""
+        pass
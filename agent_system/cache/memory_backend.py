@@ -0,0 +1,141 @@
+"""
+Memory Cache Backend
+In-process cache storage with LRU or LFU eviction
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+from .base_backend import CacheBackend
+from ..history.records import approx_size
+
+
+class _Entry:
+    """Cached value with its expiry time and bookkeeping"""
+    
+    __slots__ = ("value", "expires_at", "size", "hits")
+    
+    def __init__(self, value: Any, expires_at: float, size: int):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+        self.hits = 0
+
+
+class MemoryBackend(CacheBackend):
+    """Cache storage private to the current process"""
+    
+    POLICIES = ("lru", "lfu")
+    
+    def __init__(self, max_entries: Optional[int] = 10000, max_bytes: Optional[int] = None,
+                 policy: str = "lru"):
+        """
+        Initialize the backend
+        
+        Args:
+            max_entries: Maximum number of entries (None = unlimited)
+            max_bytes: Approximate memory budget in bytes (None = unlimited)
+            policy: Eviction policy, "lru" or "lfu"
+        
+        Raises:
+            ValueError: If the policy is unknown
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown eviction policy '{policy}', expected 'lru' or 'lfu'")
+        
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.policy = policy
+        
+        self._entries: "OrderedDict[Tuple[str, Hashable], _Entry]" = OrderedDict()
+        # LFU buckets: hit count -> keys in least recently used order
+        self._buckets: Dict[int, "OrderedDict[Tuple[str, Hashable], None]"] = {}
+        self._bytes = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._lock = threading.Lock()
+    
+    def get(self, key: Tuple[str, Hashable]) -> Tuple[bool, Any]:
+        """Look up an entry, dropping it if it has expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            
+            if entry.expires_at and entry.expires_at < time.time():
+                self._remove(key)
+                self._expirations += 1
+                return False, None
+            
+            self._touch(key, entry)
+            return True, entry.value
+    
+    def set(self, key: Tuple[str, Hashable], value: Any, ttl: Optional[float]):
+        """Store an entry, evicting others if the backend is full"""
+        entry = _Entry(value, time.time() + ttl if ttl else 0.0, approx_size(value))
+        
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            if self.policy == "lfu":
+                self._buckets.setdefault(0, OrderedDict())[key] = None
+            self._evict()
+    
+    def _touch(self, key: Tuple[str, Hashable], entry: _Entry):
+        """Record a hit for the eviction policy"""
+        if self.policy == "lru":
+            self._entries.move_to_end(key)
+            return
+        
+        bucket = self._buckets[entry.hits]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[entry.hits]
+        entry.hits += 1
+        self._buckets.setdefault(entry.hits, OrderedDict())[key] = None
+    
+    def _remove(self, key: Tuple[str, Hashable]):
+        """Drop an entry if present"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry.size
+        if self.policy == "lfu":
+            bucket = self._buckets[entry.hits]
+            del bucket[key]
+            if not bucket:
+                del self._buckets[entry.hits]
+    
+    def _victim(self) -> Tuple[str, Hashable]:
+        """Pick the entry to evict next"""
+        if self.policy == "lru":
+            return next(iter(self._entries))
+        return next(iter(self._buckets[min(self._buckets)]))
+    
+    def _evict(self):
+        """Evict entries until the size limits are met"""
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            self._remove(self._victim())
+            self._evictions += 1
+    
+    def clear(self):
+        """Remove every entry"""
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+            self._bytes = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get storage counters"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "evictions": self._evictions,
+                "expirations": self._expirations
+            }
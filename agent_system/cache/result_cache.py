@@ -0,0 +1,136 @@
+"""
+Result Cache
+TTL cache of tool results in front of a pluggable storage backend
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from .base_backend import CacheBackend
+from .memory_backend import MemoryBackend
+
+
+def normalize_task(task: str) -> str:
+    """
+    Normalize a task description for use in cache keys
+    
+    Args:
+        task: Task description
+    
+    Returns:
+        Task with surrounding whitespace removed and inner runs collapsed
+    """
+    return " ".join(task.split())
+
+
+class ResultCache:
+    """Thread-safe cache of tool results keyed on (tool, normalized task)"""
+    
+    def __init__(self, max_entries: Optional[int] = 10000, max_bytes: Optional[int] = None,
+                 default_ttl: Optional[float] = 300.0, tool_ttls: Optional[Dict[str, Optional[float]]] = None,
+                 policy: str = "lru", normalize: Callable[[str], Hashable] = normalize_task,
+                 backend: Optional[CacheBackend] = None):
+        """
+        Initialize the cache
+        
+        Args:
+            max_entries: Maximum number of entries (None = unlimited)
+            max_bytes: Approximate memory budget in bytes (None = unlimited)
+            default_ttl: Seconds an entry stays valid (None = until evicted)
+            tool_ttls: Per-tool TTL overrides; a TTL of 0 disables caching for that tool
+            policy: Eviction policy, "lru" or "lfu"
+            normalize: Function turning a task into the task part of the key
+            backend: Storage backend; defaults to a process-local MemoryBackend
+                built from max_entries, max_bytes and policy
+        """
+        self.default_ttl = default_ttl
+        self.tool_ttls = dict(tool_ttls or {})
+        self.normalize = normalize
+        self.backend = backend if backend is not None else MemoryBackend(max_entries, max_bytes, policy)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+    
+    def ttl_for(self, tool_name: str) -> Optional[float]:
+        """
+        Get the TTL that applies to a tool
+        
+        Args:
+            tool_name: Tool name
+        
+        Returns:
+            TTL in seconds, or None for no expiry
+        """
+        return self.tool_ttls.get(tool_name, self.default_ttl)
+    
+    def is_cacheable(self, tool: Any) -> bool:
+        """
+        Check whether results of a tool may be cached
+        
+        Args:
+            tool: Tool instance
+        
+        Returns:
+            False if the tool opted out or its TTL is 0
+        """
+        return getattr(tool, "cacheable", True) and self.ttl_for(tool.name) != 0
+    
+    def get(self, tool_name: str, task: str) -> Tuple[bool, Any]:
+        """
+        Look up a cached result
+        
+        Cached values may be shared between callers and must not be modified.
+        
+        Args:
+            tool_name: Tool name
+            task: Task description
+        
+        Returns:
+            Tuple of (hit, value); value is None on a miss
+        """
+        hit, value = self.backend.get((tool_name, self.normalize(task)))
+        
+        with self._lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+        
+        return hit, value
+    
+    def set(self, tool_name: str, task: str, value: Any):
+        """
+        Store a result
+        
+        Args:
+            tool_name: Tool name
+            task: Task description
+            value: Tool result
+        """
+        ttl = self.ttl_for(tool_name)
+        if ttl != 0:
+            self.backend.set((tool_name, self.normalize(task)), value, ttl)
+    
+    def clear(self):
+        """Remove every entry"""
+        self.backend.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters
+        
+        Hits and misses count lookups made by this process; the remaining
+        counters come from the backend.
+        
+        Returns:
+            Hits, misses, hit rate and backend counters
+        """
+        with self._lock:
+            stats = {"hits": self._hits, "misses": self._misses}
+        stats.update(self.backend.stats())
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+    
+    def close(self):
+        """Release the backend's resources"""
+        self.backend.close()
@@ -0,0 +1,200 @@
+"""
+SQLite Cache Backend
+Cache storage in a local SQLite file shared by every process on the host
+"""
+
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+from .base_backend import CacheBackend
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS result_cache (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires_at REAL NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_result_cache_last_access ON result_cache (last_access);
+CREATE INDEX IF NOT EXISTS idx_result_cache_hits ON result_cache (hits, last_access);
+"""
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Cache storage shared between processes through a SQLite database"""
+    
+    POLICIES = {"lru": "last_access", "lfu": "hits, last_access"}
+    
+    def __init__(self, path: str, max_entries: Optional[int] = 100000, policy: str = "lru",
+                 evict_every: int = 64):
+        """
+        Open or create the cache database
+        
+        The database runs in WAL mode so readers in one worker never wait
+        for a writer in another; SQLite's file locking serializes writers.
+        Values are pickled, so the file must only be writable by trusted
+        processes.
+        
+        Hits don't write to the database: their access times and counts
+        are buffered in memory and written in one transaction before each
+        eviction pass, which is the only reader of them.
+        
+        Args:
+            path: Database file path
+            max_entries: Maximum number of entries (None = unlimited)
+            policy: Eviction policy, "lru" or "lfu"
+            evict_every: Number of writes between size checks
+        
+        Raises:
+            ValueError: If the policy is unknown
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown eviction policy '{policy}', expected 'lru' or 'lfu'")
+        
+        self.path = path
+        self.max_entries = max_entries
+        self.policy = policy
+        self.evict_every = evict_every
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._evictions = 0
+        self._expirations = 0
+        # Buffered hits: key -> (last access, hit count)
+        self._accesses: Dict[str, Tuple[float, int]] = {}
+        
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, timeout=30)
+            # Cached data can be recomputed, so durability is not needed
+            conn.execute("PRAGMA synchronous=OFF")
+            self._local.conn = conn
+        return conn
+    
+    @staticmethod
+    def _key(key: Tuple[str, Hashable]) -> str:
+        """Serialize a cache key"""
+        tool_name, task = key
+        return f"{tool_name}\x00{task}"
+    
+    def get(self, key: Tuple[str, Hashable]) -> Tuple[bool, Any]:
+        """Look up an entry, dropping it if it has expired"""
+        conn = self._connect()
+        db_key = self._key(key)
+        row = conn.execute(
+            "SELECT value, expires_at FROM result_cache WHERE key = ?", (db_key,)
+        ).fetchone()
+        if row is None:
+            return False, None
+        
+        now = time.time()
+        value, expires_at = row
+        if expires_at and expires_at < now:
+            conn.execute("DELETE FROM result_cache WHERE key = ? AND expires_at = ?", (db_key, expires_at))
+            with self._lock:
+                self._expirations += 1
+            return False, None
+        
+        with self._lock:
+            _, hits = self._accesses.get(db_key, (now, 0))
+            self._accesses[db_key] = (now, hits + 1)
+        return True, pickle.loads(value)
+    
+    def set(self, key: Tuple[str, Hashable], value: Any, ttl: Optional[float]):
+        """Store an entry, evicting others if the cache is full"""
+        now = time.time()
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO result_cache (key, value, expires_at, size, last_access, hits) "
+            "VALUES (?, ?, ?, ?, ?, 0)",
+            (self._key(key), data, now + ttl if ttl else 0.0, len(data), now)
+        )
+        
+        with self._lock:
+            self._writes += 1
+            check = self._writes % self.evict_every == 0
+        if check:
+            self._evict(conn, now)
+    
+    def _flush_accesses(self, conn: sqlite3.Connection):
+        """Write the buffered hits to the database"""
+        with self._lock:
+            accesses, self._accesses = self._accesses, {}
+        if not accesses:
+            return
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(
+                "UPDATE result_cache SET last_access = MAX(last_access, ?), hits = hits + ? WHERE key = ?",
+                [(last_access, hits, key) for key, (last_access, hits) in accesses.items()]
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """Drop expired entries, then the least valuable ones over the size limit"""
+        # Eviction order depends on access times and hit counts
+        self._flush_accesses(conn)
+        expired = conn.execute(
+            "DELETE FROM result_cache WHERE expires_at > 0 AND expires_at < ?", (now,)
+        ).rowcount
+        evicted = 0
+        
+        if self.max_entries is not None:
+            (count,) = conn.execute("SELECT COUNT(*) FROM result_cache").fetchone()
+            if count > self.max_entries:
+                evicted = conn.execute(
+                    "DELETE FROM result_cache WHERE key IN ("
+                    f"SELECT key FROM result_cache ORDER BY {self.POLICIES[self.policy]} LIMIT ?)",
+                    (count - self.max_entries,)
+                ).rowcount
+        
+        with self._lock:
+            self._expirations += expired
+            self._evictions += evicted
+    
+    def clear(self):
+        """Remove every entry"""
+        with self._lock:
+            self._accesses.clear()
+        self._connect().execute("DELETE FROM result_cache")
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get storage counters
+        
+        Entries and bytes cover the shared database; evictions and
+        expirations count only those performed by this process.
+        """
+        entries, size = self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM result_cache"
+        ).fetchone()
+        with self._lock:
+            return {
+                "entries": entries,
+                "bytes": size,
+                "evictions": self._evictions,
+                "expirations": self._expirations
+            }
+    
+    def close(self):
+        """Write buffered hits and close this thread's connection"""
+        self._flush_accesses(self._connect())
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -3,10 +3,17 @@ CLI Interface
 Command-line interface for the AI Agent
 """
 
+import os
 import sys
 import argparse
-from typing import Optional
+import urllib.error
+import urllib.request
+from typing import List, Optional
 from .agent import Agent
+from .cache import SQLiteCacheBackend
+from .metrics import AgentMetrics
+from .search import InvertedIndex, write_index
+from .workflow import Workflow, WorkflowError, WorkflowRunner
 
 
 class CLI:
@@ -14,7 +21,7 @@ class CLI:
     
     def __init__(self):
         """Initialize CLI"""
-        self.agent = Agent()
+        self.agent = Agent(metrics=AgentMetrics())
         self.parser = self._setup_parser()
     
     def _setup_parser(self) -> argparse.ArgumentParser:
@@ -26,8 +33,12 @@ class CLI:
 Examples:
   %(prog)s execute "Search for Python tutorials"
   %(prog)s execute "Generate a REST API function" --tool code_generator
+  %(prog)s batch tasks.txt --workers 8 --executor process
+  %(prog)s workflow scaffold.json --param topic=Flask --memo-db memo.db
+  %(prog)s build-index corpus/ search.idx
   %(prog)s list-tools
   %(prog)s history
+  %(prog)s metrics --url http://localhost:5000
   %(prog)s interactive
             """
         )
@@ -38,10 +49,51 @@ Examples:
         execute_parser = subparsers.add_parser("execute", help="Execute a task")
         execute_parser.add_argument("task", help="Task description")
         execute_parser.add_argument("--tool", "-t", help="Specific tool to use")
+        execute_parser.add_argument("--stream", "-s", action="store_true",
+                                    help="Print output as the tool produces it")
+        execute_parser.add_argument("--timeout", type=float, help="Time budget in seconds")
+        execute_parser.add_argument("--profile", "-p", metavar="FILE",
+                                    help="Write a profile of the task to FILE as collapsed stacks")
+        execute_parser.add_argument(
+            "--profile-mode", choices=["trace", "sample"], default="trace",
+            help="trace: time every call; sample: sample the stack every millisecond (default: trace)"
+        )
+        
+        # Batch command
+        batch_parser = subparsers.add_parser("batch", help="Execute tasks from a file, one per line")
+        batch_parser.add_argument("file", help="File with one task per line")
+        batch_parser.add_argument("--tool", "-t", help="Specific tool to use")
+        batch_parser.add_argument("--workers", "-w", type=int, help="Number of workers (default: CPU count)")
+        batch_parser.add_argument(
+            "--executor", "-e", choices=["thread", "process"], default="thread",
+            help="Worker pool type (default: thread)"
+        )
+        batch_parser.add_argument("--timeout", type=float, help="Time budget per task in seconds")
+        batch_parser.add_argument("--metrics", "-m", action="store_true",
+                                  help="Show per-tool latency and error metrics afterwards")
+        
+        # Workflow command
+        workflow_parser = subparsers.add_parser("workflow", help="Run a workflow of tool steps from a JSON file")
+        workflow_parser.add_argument("file", help="Workflow definition (JSON)")
+        workflow_parser.add_argument("--param", "-P", action="append", default=[], metavar="NAME=VALUE",
+                                     help="Workflow parameter (repeatable)")
+        workflow_parser.add_argument("--workers", "-w", type=int, help="Maximum steps run at once")
+        workflow_parser.add_argument("--timeout", type=float, help="Time budget per step in seconds")
+        workflow_parser.add_argument("--memo-db", metavar="FILE",
+                                     help="Keep step results in FILE so re-runs only recompute changed steps")
+        
+        # Build index command
+        index_parser = subparsers.add_parser("build-index", help="Build a search index file from a corpus")
+        index_parser.add_argument("sources", nargs="+", help="Corpus files or directories")
+        index_parser.add_argument("output", help="Index file to write")
         
         # List tools command
         subparsers.add_parser("list-tools", help="List all available tools")
         
+        # Route command
+        route_parser = subparsers.add_parser("route", help="Show which tool a task would be routed to")
+        route_parser.add_argument("task", help="Task description")
+        
         # Tool info command
         info_parser = subparsers.add_parser("tool-info", help="Get information about a tool")
         info_parser.add_argument("tool_name", help="Name of the tool")
@@ -49,20 +101,177 @@ Examples:
         # History command
         subparsers.add_parser("history", help="Show task execution history")
         
+        # Metrics command
+        # A new CLI process has recorded nothing, so metrics come from a
+        # running server; batch --metrics shows the metrics of a batch run
+        metrics_parser = subparsers.add_parser(
+            "metrics", help="Show the task, routing and tool metrics of a running web server"
+        )
+        metrics_parser.add_argument("--url", required=True,
+                                    help="Web server URL, such as http://localhost:5000")
+        
         # Interactive mode command
         subparsers.add_parser("interactive", help="Start interactive mode")
         
         return parser
     
-    def execute_task(self, task: str, tool: Optional[str] = None):
-        """Execute a single task"""
+    def execute_task(self, task: str, tool: Optional[str] = None, timeout: Optional[float] = None,
+                     profile: Optional[str] = None, profile_mode: str = "trace"):
+        """Execute a single task, optionally writing its profile to a file"""
         print(f"\n{'='*60}")
         print(f"Executing task: {task}")
         print(f"{'='*60}\n")
         
-        result = self.agent.execute_task(task, tool)
+        result = self.agent.execute_task(
+            task, tool, timeout=timeout, profile=profile_mode if profile else None
+        )
         
         self._print_result(result)
+        
+        if profile:
+            with open(profile, "w", encoding="utf-8") as f:
+                f.write(result["profile"])
+            stacks = result['profile'].splitlines()
+            print(f"Profile written to {profile} ({len(stacks)} stacks)")
+            if profile_mode == "sample" and sum(int(line.rsplit(" ", 1)[1]) for line in stacks) <= 1:
+                print("The task finished within one sampling interval; "
+                      "use --profile-mode trace to time every call")
+            print(f"Render it with: flamegraph.pl {profile} > flamegraph.svg\n")
+    
+    def stream_task(self, task: str, tool: Optional[str] = None, timeout: Optional[float] = None):
+        """Execute a single task, printing output as it is produced"""
+        print(f"\n{'='*60}")
+        print(f"Executing task: {task}")
+        print(f"{'='*60}\n")
+        
+        streamed = False
+        for event in self.agent.stream_task(task, tool, timeout=timeout):
+            if event["event"] == "chunk":
+                print(event["data"], end="", flush=True)
+                streamed = True
+            elif event["event"] == "end":
+                result = event["result"]
+        
+        # Tools that do not stream only deliver their output at the end
+        if not streamed:
+            self._print_result(result)
+            return
+        
+        print(f"\n\nTask ID: {result['task_id']}")
+        print(f"Status: {result['status']}")
+        print(f"Tool Used: {result['tool_used']}")
+        print(f"Duration: {result['duration']:.2f} seconds")
+        if result['status'] != 'completed':
+            print(f"\nError: {result['error']}")
+        print(f"\n{'='*60}\n")
+    
+    def execute_batch(self, path: str, tool: Optional[str] = None,
+                      workers: Optional[int] = None, executor: str = "thread",
+                      timeout: Optional[float] = None, metrics: bool = False):
+        """Execute all tasks listed in a file"""
+        with open(path, "r", encoding="utf-8") as f:
+            tasks = [line.strip() for line in f if line.strip()]
+        
+        if not tasks:
+            print(f"\nNo tasks found in {path}\n")
+            return
+        
+        summary = self.agent.execute_batch(
+            tasks, tool, max_workers=workers, executor=executor, timeout=timeout
+        )
+        
+        print("\n=== Batch Summary ===\n")
+        print(f"Tasks: {summary['total']}")
+        print(f"Completed: {summary['completed']}")
+        print(f"Failed: {summary['failed']} ({summary['timed_out']} timed out)")
+        print(f"Workers: {summary['max_workers']} ({summary['executor']})")
+        print(f"Duration: {summary['duration']:.2f} seconds")
+        print(f"Throughput: {summary['throughput']:.1f} tasks/second")
+        
+        for result in summary['results']:
+            if result['status'] != 'completed':
+                print(f"  Task #{result['task_id']} failed: {result['error']}")
+        print()
+        
+        if metrics:
+            self.show_metrics()
+    
+    def run_workflow(self, path: str, params: List[str], workers: Optional[int] = None,
+                     timeout: Optional[float] = None, memo_db: Optional[str] = None):
+        """Run a workflow file and print the outcome of each step"""
+        values = {}
+        for param in params:
+            name, sep, value = param.partition("=")
+            if not sep:
+                self.parser.error(f"Invalid --param '{param}', expected NAME=VALUE")
+            values[name] = value
+        
+        runner = WorkflowRunner(
+            self.agent, max_workers=workers,
+            memo_backend=SQLiteCacheBackend(memo_db) if memo_db else None
+        )
+        try:
+            workflow = Workflow.load(path)
+            summary = runner.run(workflow, values, timeout=timeout)
+        except WorkflowError as e:
+            print(f"\nError: {e}\n")
+            return
+        finally:
+            runner.memo.close()
+        
+        print(f"\n=== Workflow: {summary['workflow']} ===\n")
+        for name, step in summary['steps'].items():
+            source = "memoized" if step.get('memoized') else f"task #{step['task_id']}" if 'task_id' in step else "-"
+            print(f"{name}: {step['status']} ({source})")
+            if step['status'] != 'completed':
+                print(f"  Error: {step['error']}")
+        print(f"\nStatus: {summary['status']}")
+        print(f"Steps: {summary['completed']}/{len(summary['steps'])} completed, {summary['memoized']} memoized")
+        print(f"Duration: {summary['duration']:.2f} seconds\n")
+        
+        # The final steps are the workflow's outputs
+        for name, step in summary['steps'].items():
+            if step['status'] == 'completed' and not workflow.dependents(name):
+                self._print_result(dict(step, task_id=step.get('task_id', f"{name} (memoized)")))
+    
+    def fetch_metrics(self, url: str):
+        """Print the metrics of a running web server in the Prometheus text format"""
+        try:
+            with urllib.request.urlopen(url.rstrip("/") + "/metrics", timeout=10) as response:
+                print(response.read().decode("utf-8"), end="")
+        except (urllib.error.URLError, ValueError) as e:
+            print(f"\nError: Could not fetch metrics from {url}: {e}\n")
+    
+    def show_metrics(self):
+        """Show the metrics of tasks run by this CLI session"""
+        summary = self.agent.metrics.summary()
+        if not summary["tools"]:
+            print("\nNo tasks executed yet.\n")
+            return
+        
+        def ms(seconds):
+            return f"{seconds * 1000:.3f}ms" if seconds is not None else "-"
+        
+        print("\n=== Metrics ===\n")
+        for tool_name, stats in sorted(summary["tools"].items()):
+            print(f"{tool_name or '(no tool)'}:")
+            print(f"  Tasks: {stats['tasks']:g} ({stats['error_rate']:.1%} errors), routed: {stats['routed']:g}")
+            if "p50" in stats:
+                print(f"  Latency: p50 {ms(stats['p50'])}, p90 {ms(stats['p90'])}, p99 {ms(stats['p99'])}")
+        print(f"\nHistory writes: {summary['history_writes']} (p99 {ms(summary['history_write_p99'])})\n")
+    
+    def build_index(self, sources: List[str], output: str):
+        """Build a prebuilt search index from corpus files"""
+        index = InvertedIndex()
+        for source in sources:
+            if os.path.isdir(source):
+                index.load_directory(source)
+            else:
+                index.load_file(source)
+        
+        write_index(index, output)
+        print(f"\nIndexed {index.num_docs} documents ({len(index.terms)} terms) into {output}")
+        print(f"Use it with: CODEV_SEARCH_INDEX={output}\n")
     
     def _print_result(self, result: dict):
         """Print task execution result"""
@@ -100,6 +309,18 @@ Examples:
             print(f"- {info['name']}: {info['description']}")
         print()
     
+    def explain_route(self, task: str):
+        """Show the routing score breakdown for a task"""
+        explanation = self.agent.explain_route(task)
+        print(f"\n=== Route: {explanation['tool']} ===\n")
+        for tool_name, score in sorted(explanation["scores"].items(), key=lambda item: -item[1]):
+            print(f"- {tool_name}: {score:.4g}")
+        if explanation.get("matches"):
+            print("\nMatches:")
+            for match in explanation["matches"]:
+                print(f"  '{match['text']}' -> {match['tool']} (+{match['weight']:g})")
+        print()
+    
     def show_tool_info(self, tool_name: str):
         """Show detailed information about a tool"""
         try:
@@ -136,6 +357,7 @@ Examples:
         print("  - Type your task to execute it")
         print("  - 'tools' - List available tools")
         print("  - 'history' - Show task history")
+        print("  - 'metrics' - Show latency and error metrics")
         print("  - 'exit' or 'quit' - Exit interactive mode")
         print("\n" + "="*60 + "\n")
         
@@ -158,6 +380,10 @@ Examples:
                     self.show_history()
                     continue
                 
+                if user_input.lower() == "metrics":
+                    self.show_metrics()
+                    continue
+                
                 # Execute as task
                 result = self.agent.execute_task(user_input)
                 self._print_result(result)
@@ -177,13 +403,38 @@ Examples:
             return
         
         if parsed_args.command == "execute":
-            self.execute_task(parsed_args.task, parsed_args.tool)
+            if parsed_args.stream and parsed_args.profile:
+                self.parser.error("--profile can't be combined with --stream")
+            if parsed_args.stream:
+                self.stream_task(parsed_args.task, parsed_args.tool, parsed_args.timeout)
+            else:
+                self.execute_task(
+                    parsed_args.task, parsed_args.tool, parsed_args.timeout,
+                    parsed_args.profile, parsed_args.profile_mode
+                )
+        elif parsed_args.command == "batch":
+            self.execute_batch(
+                parsed_args.file, parsed_args.tool,
+                parsed_args.workers, parsed_args.executor, parsed_args.timeout,
+                parsed_args.metrics
+            )
+        elif parsed_args.command == "workflow":
+            self.run_workflow(
+                parsed_args.file, parsed_args.param, parsed_args.workers,
+                parsed_args.timeout, parsed_args.memo_db
+            )
+        elif parsed_args.command == "build-index":
+            self.build_index(parsed_args.sources, parsed_args.output)
         elif parsed_args.command == "list-tools":
             self.list_tools()
+        elif parsed_args.command == "route":
+            self.explain_route(parsed_args.task)
         elif parsed_args.command == "tool-info":
             self.show_tool_info(parsed_args.tool_name)
         elif parsed_args.command == "history":
             self.show_history()
+        elif parsed_args.command == "metrics":
+            self.fetch_metrics(parsed_args.url)
         elif parsed_args.command == "interactive":
             self.interactive_mode()
 
@@ -0,0 +1,8 @@
+"""
+Events package
+Push delivery of task lifecycle events
+"""
+
+from .broker import EventBroker
+
+__all__ = ["EventBroker"]
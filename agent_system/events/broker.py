@@ -0,0 +1,164 @@
+"""
+Event Broker
+Fan-out of task lifecycle events to many subscribers
+"""
+
+import itertools
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class EventBroker:
+    """
+    Publishes events to any number of subscribers
+    
+    Events go into one shared ring buffer, numbered in publication order.
+    A subscriber is nothing but the number of the last event it has seen,
+    so idle subscribers cost no memory per event and publishing does not
+    depend on how many there are. Subscribers that fall more than
+    ``buffer_size`` events behind skip the events they missed.
+    
+    Event numbers double as resume points: a client that reconnects with
+    the number of its last event gets everything it missed that is still
+    buffered. Numbers restart at 1 in every broker, so clients should keep
+    the broker's ``epoch`` with them and only resume from a number with a
+    matching epoch (see ``resume_point``).
+    """
+    
+    def __init__(self, buffer_size: int = 1024):
+        """
+        Initialize an empty broker
+        
+        Args:
+            buffer_size: Number of recent events kept for subscribers
+        """
+        self.buffer_size = buffer_size
+        self._events: "deque[Dict[str, Any]]" = deque(maxlen=buffer_size)
+        self._ids = itertools.count(1)
+        self.epoch = uuid.uuid4().hex[:12]
+        self._last_id = 0
+        self._condition = threading.Condition()
+        self._closed = False
+        self._subscribers = 0
+    
+    @property
+    def last_id(self) -> int:
+        """Number of the most recent event (0 before the first one)"""
+        return self._last_id
+    
+    @property
+    def subscribers(self) -> int:
+        """Number of active subscriptions"""
+        return self._subscribers
+    
+    def resume_point(self, epoch: Optional[str], last_id: int) -> int:
+        """
+        Get the event to resume after for a reconnecting client
+        
+        Args:
+            epoch: Epoch of the broker that published the client's last event
+            last_id: Number of the client's last event
+        
+        Returns:
+            ``last_id`` if it came from this broker, otherwise 0 so the
+            client gets every buffered event
+        """
+        if epoch != self.epoch or last_id > self._last_id:
+            return 0
+        return last_id
+    
+    def publish(self, event: str, **data: Any) -> int:
+        """
+        Publish an event to every subscriber
+        
+        Args:
+            event: Event type, such as "started" or "completed"
+            data: Event fields
+        
+        Returns:
+            Event number
+        """
+        with self._condition:
+            event_id = next(self._ids)
+            self._events.append(dict(
+                data, id=event_id, event=event, timestamp=datetime.now().isoformat()
+            ))
+            self._last_id = event_id
+            self._condition.notify_all()
+        return event_id
+    
+    def events_after(self, last_id: int) -> List[Dict[str, Any]]:
+        """
+        Get the buffered events newer than an event
+        
+        Args:
+            last_id: Number of the last event already seen
+        
+        Returns:
+            Events in publication order
+        """
+        with self._condition:
+            return self._after(last_id)
+    
+    def _after(self, last_id: int) -> List[Dict[str, Any]]:
+        """Buffered events newer than ``last_id``; the condition must be held"""
+        if last_id >= self._last_id:
+            return []
+        # Event numbers are consecutive, so the position is known
+        start = max(0, len(self._events) - (self._last_id - last_id))
+        return list(itertools.islice(self._events, start, None))
+    
+    def listen(self, last_id: Optional[int] = None,
+               heartbeat: Optional[float] = None) -> Iterator[Optional[Dict[str, Any]]]:
+        """
+        Subscribe to events
+        
+        Args:
+            last_id: Number of the last event already seen; buffered newer
+                events are delivered first (None = only new events). A
+                number this broker hasn't reached yet can only come from
+                another broker, so it replays every buffered event
+            heartbeat: Yield None after this many seconds without events,
+                so callers can check their connection
+        
+        Returns:
+            Iterator of events that ends when the broker is closed
+        """
+        with self._condition:
+            if last_id is None:
+                cursor = self._last_id
+            else:
+                cursor = last_id if last_id <= self._last_id else 0
+            self._subscribers += 1
+        try:
+            while True:
+                with self._condition:
+                    deadline = time.monotonic() + heartbeat if heartbeat is not None else None
+                    while not self._closed and self._last_id <= cursor:
+                        remaining = None if deadline is None else deadline - time.monotonic()
+                        if remaining is not None and remaining <= 0:
+                            break
+                        self._condition.wait(remaining)
+                    if self._closed:
+                        return
+                    events = self._after(cursor)
+                
+                if not events:
+                    yield None
+                    continue
+                cursor = events[-1]["id"]
+                for event in events:
+                    yield event
+        finally:
+            with self._condition:
+                self._subscribers -= 1
+    
+    def close(self):
+        """End every subscription"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
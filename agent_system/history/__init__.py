@@ -0,0 +1,11 @@
+"""
+History package
+Storage for task execution history
+"""
+
+from .records import TaskRecord
+from .base_store import HistoryStore
+from .memory_store import RetentionPolicy, TaskHistory
+from .sqlite_store import SQLiteTaskHistory
+
+__all__ = ["TaskRecord", "HistoryStore", "RetentionPolicy", "TaskHistory", "SQLiteTaskHistory"]
@@ -0,0 +1,146 @@
+"""
+Base History Store
+Abstract interface for task history storage
+"""
+
+import itertools
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class HistoryStore(ABC):
+    """Abstract base class for task history stores"""
+    
+    @abstractmethod
+    def append(self, result: Dict[str, Any]):
+        """
+        Store a finished task
+        
+        Args:
+            result: Task result as returned by Agent.execute_task
+        """
+        pass
+    
+    @abstractmethod
+    def get(self, task_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Look up a task by ID
+        
+        Args:
+            task_id: Task ID
+        
+        Returns:
+            Task result, or None if unknown or evicted
+        """
+        pass
+    
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of stored tasks"""
+        pass
+    
+    @abstractmethod
+    def iter_records(self, status: Optional[str] = None, since: Optional[float] = None,
+                     until: Optional[float] = None, tool: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over stored tasks, newest first
+        
+        Args:
+            status: Only tasks with this status
+            since: Only tasks started at or after this time (seconds since the epoch)
+            until: Only tasks started before this time (seconds since the epoch)
+            tool: Only tasks run by this tool
+        
+        Returns:
+            Iterator of task results
+        """
+        pass
+    
+    def page(self, limit: int, before: Optional[int] = None, status: Optional[str] = None,
+             since: Optional[float] = None, until: Optional[float] = None,
+             tool: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get one page of tasks in descending task ID order
+        
+        Args:
+            limit: Maximum number of tasks
+            before: Only tasks with a lower ID (the previous page's last ID)
+            status: Only tasks with this status
+            since: Only tasks started at or after this time (seconds since the epoch)
+            until: Only tasks started before this time (seconds since the epoch)
+            tool: Only tasks run by this tool
+        
+        Returns:
+            List of task results
+        """
+        records = [
+            record for record in self.iter_records(status, since, until, tool)
+            if before is None or record["task_id"] < before
+        ]
+        records.sort(key=lambda record: record["task_id"], reverse=True)
+        return records[:limit]
+    
+    @abstractmethod
+    def changes(self, after: int = 0, limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Get the tasks stored after a position in the store's write order
+        
+        Task IDs are handed out when tasks start, but tasks are stored when
+        they finish, so a task with a low ID can be stored after one with a
+        higher ID. Positions follow storage order instead: passing back the
+        returned position gets every later task, and a task stored again
+        comes back again. A position the store never handed out, such as one
+        from before an in-memory store was recreated, starts over from the
+        beginning.
+        
+        Args:
+            after: Position returned by an earlier call (0 = the beginning)
+            limit: Maximum number of tasks (None = no limit)
+        
+        Returns:
+            Tuple of (tasks in storage order, position to pass as ``after`` next)
+        """
+        pass
+    
+    def last_task_id(self) -> int:
+        """
+        Get the highest stored task ID
+        
+        Returns:
+            Highest task ID, or 0 if the store is empty
+        """
+        return max((record["task_id"] for record in self.iter_records()), default=0)
+    
+    def task_ids(self) -> Iterator[int]:
+        """
+        Get the source of IDs for new tasks
+        
+        The default counts up from the highest stored ID in this process.
+        Stores shared between processes must hand out IDs no other
+        process uses. The iterator must be safe to use from many threads.
+        
+        Returns:
+            Iterator of unused task IDs
+        """
+        # next() on a count is atomic, so no lock is needed
+        return itertools.count(self.last_task_id() + 1)
+    
+    @abstractmethod
+    def clear(self):
+        """Remove every stored task"""
+        pass
+    
+    def to_list(self) -> List[Dict[str, Any]]:
+        """
+        Get every stored task, oldest first
+        
+        Returns:
+            List of task results
+        """
+        records = list(self.iter_records())
+        records.reverse()
+        return records
+    
+    def close(self):
+        """Release any resources held by the store"""
+        pass
@@ -0,0 +1,268 @@
+"""
+In-Memory History Store
+Bounded, indexed task history kept in process memory
+"""
+
+import bisect
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from .base_store import HistoryStore
+from .records import TaskRecord
+
+
+class RetentionPolicy:
+    """Limits on how much history a store keeps"""
+    
+    def __init__(self, max_entries: Optional[int] = None, max_age: Optional[float] = None,
+                 max_bytes: Optional[int] = None):
+        """
+        Initialize retention policy
+        
+        Args:
+            max_entries: Maximum number of records (None = unlimited)
+            max_age: Maximum record age in seconds (None = unlimited)
+            max_bytes: Approximate memory budget in bytes (None = unlimited).
+                Record sizes are only estimated when this is set, so set it
+                before records are stored
+        """
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+
+
+class TaskHistory(HistoryStore):
+    """Task history with O(1) lookup by ID and oldest-first eviction"""
+    
+    DEFAULT_MAX_ENTRIES = 100000
+    # Buffered appends that trigger a merge into the indexes
+    MERGE_THRESHOLD = 64
+    
+    def __init__(self, retention: Optional[RetentionPolicy] = None):
+        """
+        Initialize an empty history
+        
+        Args:
+            retention: Retention policy (defaults to the last 100000 records)
+        """
+        self.retention = retention or RetentionPolicy(max_entries=self.DEFAULT_MAX_ENTRIES)
+        # Insertion order is completion order, so the front holds the oldest records
+        self._records: "OrderedDict[int, TaskRecord]" = OrderedDict()
+        self._by_status: Dict[str, Dict[int, None]] = {}
+        # Sorted task IDs for paging; evicted IDs are dropped lazily
+        self._ids: List[int] = []
+        self._bytes = 0
+        # Position of the last merged record in write order (see changes)
+        self._seq = 0
+        self._lock = threading.RLock()
+        # Appended records not yet merged into the indexes. deque.append is
+        # atomic, so appending threads never wait for the lock
+        self._pending: "deque[TaskRecord]" = deque()
+    
+    def append(self, result: Dict[str, Any]):
+        """
+        Store a finished task
+        
+        The record is buffered without locking. Once enough records are
+        buffered, whichever appending thread finds the lock free merges
+        them; readers merge any remaining records before reading.
+        """
+        self._pending.append(TaskRecord.from_dict(result, measure=self.retention.max_bytes is not None))
+        
+        if len(self._pending) >= self.MERGE_THRESHOLD and self._lock.acquire(blocking=False):
+            try:
+                self._merge()
+            finally:
+                self._lock.release()
+    
+    def _merge(self):
+        """Move buffered records into the indexes and apply the retention policy (lock held)"""
+        pending = self._pending
+        if not pending:
+            return
+        
+        while True:
+            try:
+                record = pending.popleft()
+            except IndexError:
+                break
+            if self._remove(record.task_id) is None:
+                if not self._ids or record.task_id > self._ids[-1]:
+                    self._ids.append(record.task_id)
+                else:
+                    bisect.insort(self._ids, record.task_id)
+            self._seq += 1
+            record.seq = self._seq
+            self._records[record.task_id] = record
+            self._by_status.setdefault(record.status, {})[record.task_id] = None
+            self._bytes += record.size
+        
+        self._evict()
+    
+    def _remove(self, task_id: int) -> Optional[TaskRecord]:
+        """Drop a record and its index entries"""
+        record = self._records.pop(task_id, None)
+        if record is not None:
+            self._by_status[record.status].pop(task_id, None)
+            self._bytes -= record.size
+        return record
+    
+    def _evict(self):
+        """Drop the oldest records until the retention policy is met"""
+        policy = self.retention
+        records = self._records
+        
+        if policy.max_entries is not None:
+            while len(records) > policy.max_entries:
+                self._remove(next(iter(records)))
+        
+        if policy.max_bytes is not None:
+            while records and self._bytes > policy.max_bytes:
+                self._remove(next(iter(records)))
+        
+        if policy.max_age is not None:
+            cutoff = time.time() - policy.max_age
+            while records and records[next(iter(records))].end_ts < cutoff:
+                self._remove(next(iter(records)))
+        
+        if len(self._ids) > 2 * len(records) + 1024:
+            self._ids = [task_id for task_id in self._ids if task_id in records]
+    
+    def _flush(self):
+        """Merge buffered records so a read sees every append"""
+        if self._pending:
+            with self._lock:
+                self._merge()
+    
+    def get(self, task_id: int) -> Optional[Dict[str, Any]]:
+        """Look up a task by ID"""
+        self._flush()
+        record = self._records.get(task_id)
+        return record.to_dict() if record is not None else None
+    
+    def __len__(self) -> int:
+        self._flush()
+        return len(self._records)
+    
+    def last_task_id(self) -> int:
+        """Get the highest stored task ID"""
+        with self._lock:
+            self._merge()
+            ids = self._ids
+            # Drop evicted IDs left at the end of the sorted index
+            while ids and ids[-1] not in self._records:
+                ids.pop()
+            return ids[-1] if ids else 0
+    
+    def changes(self, after: int = 0, limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Get the tasks stored after a position in write order
+        
+        Records are kept in write order, so the scan walks back from the
+        newest and stops at the first one at or before ``after``.
+        """
+        with self._lock:
+            self._merge()
+            if after > self._seq:
+                # Position handed out by an earlier instance of the store
+                after = 0
+            found: List[TaskRecord] = []
+            for record in reversed(self._records.values()):
+                if record.seq <= after:
+                    break
+                found.append(record)
+        
+        found.reverse()
+        if limit is not None:
+            found = found[:limit]
+        position = found[-1].seq if found else after
+        return [record.to_dict() for record in found], position
+    
+    def iter_records(self, status: Optional[str] = None, since: Optional[float] = None,
+                     until: Optional[float] = None, tool: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over stored tasks, newest first
+        
+        Filtering by status walks only that status's index. The scan stops
+        at the first record that finished before ``since``, since everything
+        after it in the scan finished earlier still.
+        """
+        with self._lock:
+            self._merge()
+            if status is not None:
+                ids = list(self._by_status.get(status, {}))
+            else:
+                ids = list(self._records)
+        
+        for task_id in reversed(ids):
+            record = self._records.get(task_id)
+            if record is None:
+                continue
+            if since is not None and record.end_ts < since:
+                break
+            if since is not None and record.start_ts < since:
+                continue
+            if until is not None and record.start_ts >= until:
+                continue
+            if tool is not None and record.tool_used != tool:
+                continue
+            yield record.to_dict()
+    
+    def page(self, limit: int, before: Optional[int] = None, status: Optional[str] = None,
+             since: Optional[float] = None, until: Optional[float] = None,
+             tool: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Get one page of tasks in descending task ID order
+        
+        The page starts with a binary search on the sorted ID list, so its
+        cost depends on the page size and filter selectivity, not on how
+        much history is stored.
+        """
+        page: List[Dict[str, Any]] = []
+        
+        with self._lock:
+            self._merge()
+            ids = self._ids
+            position = len(ids) if before is None else bisect.bisect_left(ids, before)
+            
+            while position > 0 and len(page) < limit:
+                position -= 1
+                record = self._records.get(ids[position])
+                if record is None:
+                    continue
+                if status is not None and record.status != status:
+                    continue
+                if tool is not None and record.tool_used != tool:
+                    continue
+                if since is not None and record.start_ts < since:
+                    continue
+                if until is not None and record.start_ts >= until:
+                    continue
+                page.append(record)
+        
+        return [record.to_dict() for record in page]
+    
+    def clear(self):
+        """Remove every stored task"""
+        with self._lock:
+            self._pending.clear()
+            self._records.clear()
+            self._ids = []
+            self._by_status.clear()
+            self._bytes = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get store size statistics
+        
+        Returns:
+            Record count, approximate bytes and counts per status
+        """
+        with self._lock:
+            self._merge()
+            return {
+                "entries": len(self._records),
+                "bytes": self._bytes,
+                "by_status": {status: len(ids) for status, ids in self._by_status.items()}
+            }
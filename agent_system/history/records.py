@@ -0,0 +1,134 @@
+"""
+Task Records
+Compact representation of one task execution
+"""
+
+import sys
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+# Keys stored in dedicated slots; anything else goes to ``extra``
+_FIELDS = ("task_id", "task", "status", "result", "error", "tool_used", "start_time", "duration", "end_time")
+
+
+def _parse_time(value: Optional[str]) -> float:
+    """Convert an ISO timestamp to seconds since the epoch"""
+    return datetime.fromisoformat(value).timestamp() if value else 0.0
+
+
+def _format_time(value: float) -> Optional[str]:
+    """Convert seconds since the epoch to an ISO timestamp"""
+    return datetime.fromtimestamp(value).isoformat() if value else None
+
+
+def approx_size(value: Any) -> int:
+    """
+    Estimate the memory used by a value and its contents
+    
+    Args:
+        value: Value to measure
+    
+    Returns:
+        Approximate size in bytes
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(approx_size(k) + approx_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(approx_size(v) for v in value)
+    return size
+
+
+class TaskRecord:
+    """Slotted task history record"""
+    
+    __slots__ = ("task_id", "task", "status", "result", "error", "tool_used",
+                 "start_ts", "end_ts", "duration", "extra", "size", "seq")
+    
+    def __init__(self, task_id: int, task: str, status: str, result: Any = None,
+                 error: Optional[str] = None, tool_used: Optional[str] = None,
+                 start_ts: float = 0.0, end_ts: float = 0.0, duration: float = 0.0,
+                 extra: Optional[Dict[str, Any]] = None):
+        """
+        Initialize a record
+        
+        Args:
+            task_id: Task ID
+            task: Task description
+            status: Task status
+            result: Tool result
+            error: Error message for failed tasks
+            tool_used: Name of the tool that ran the task
+            start_ts: Start time in seconds since the epoch
+            end_ts: End time in seconds since the epoch
+            duration: Execution time in seconds
+            extra: Additional result fields
+        """
+        self.task_id = task_id
+        self.task = task
+        self.status = status
+        self.result = result
+        self.error = error
+        self.tool_used = tool_used
+        self.start_ts = start_ts
+        self.end_ts = end_ts
+        self.duration = duration
+        self.extra = extra
+        # Approximate memory use, if measured (see from_dict)
+        self.size = 0
+        # Position in the store's write order, set by the store
+        self.seq = 0
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], measure: bool = False) -> "TaskRecord":
+        """
+        Build a record from a task result dictionary
+        
+        Args:
+            data: Task result as returned by Agent.execute_task
+            measure: Whether to estimate the record's memory use into
+                ``size``; this walks the whole result, so it is only worth
+                doing for stores with a memory budget
+        
+        Returns:
+            Task record
+        """
+        extra = {k: v for k, v in data.items() if k not in _FIELDS} or None
+        record = cls(
+            task_id=data["task_id"],
+            task=data["task"],
+            status=data["status"],
+            result=data.get("result"),
+            error=data.get("error"),
+            tool_used=data.get("tool_used"),
+            start_ts=_parse_time(data.get("start_time")),
+            end_ts=_parse_time(data.get("end_time")),
+            duration=data.get("duration", 0.0),
+            extra=extra
+        )
+        if measure:
+            record.size = approx_size(data)
+        return record
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the record back to a task result dictionary
+        
+        Returns:
+            Task result dictionary
+        """
+        data = {
+            "task_id": self.task_id,
+            "task": self.task,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "tool_used": self.tool_used,
+            "start_time": _format_time(self.start_ts),
+            "duration": self.duration,
+            "end_time": _format_time(self.end_ts),
+        }
+        if self.extra:
+            data.update(self.extra)
+        return data
@@ -0,0 +1,367 @@
+"""
+SQLite History Store
+Durable task history written in batches to a SQLite database in WAL mode
+"""
+
+import heapq
+import json
+import logging
+import queue
+import sqlite3
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from .base_store import HistoryStore
+from .records import TaskRecord
+
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS task_history (
+    task_id INTEGER PRIMARY KEY,
+    task TEXT NOT NULL,
+    status TEXT NOT NULL,
+    tool_used TEXT,
+    start_time REAL NOT NULL,
+    end_time REAL NOT NULL,
+    duration REAL NOT NULL,
+    data TEXT NOT NULL,
+    seq INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_task_history_status ON task_history (status);
+CREATE INDEX IF NOT EXISTS idx_task_history_tool_used ON task_history (tool_used);
+CREATE INDEX IF NOT EXISTS idx_task_history_start_time ON task_history (start_time);
+CREATE TABLE IF NOT EXISTS task_id_sequence (
+    next_id INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS task_write_sequence (
+    last_seq INTEGER NOT NULL
+);
+"""
+
+_INSERT = """
+INSERT OR REPLACE INTO task_history
+    (task_id, task, status, tool_used, start_time, end_time, duration, data, seq)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+class _TaskIdBlocks:
+    """Thread-safe iterator over task IDs reserved from the database in blocks"""
+    
+    def __init__(self, store: "SQLiteTaskHistory"):
+        self._store = store
+        self._lock = threading.Lock()
+        self._next = 0
+        self._end = 0
+    
+    def __iter__(self) -> "_TaskIdBlocks":
+        return self
+    
+    def __next__(self) -> int:
+        with self._lock:
+            if self._next >= self._end:
+                self._next, self._end = self._store._reserve_task_ids()
+            task_id = self._next
+            self._next += 1
+        return task_id
+
+
+class SQLiteTaskHistory(HistoryStore):
+    """Task history persisted to SQLite by a background writer thread"""
+    
+    def __init__(self, path: str, batch_size: int = 256, flush_interval: float = 0.5,
+                 id_block_size: int = 32):
+        """
+        Open or create the history database
+        
+        Appends only enqueue the record; a writer thread commits queued
+        records in batches. Records waiting to be written are still visible
+        to readers.
+        
+        Args:
+            path: Database file path
+            batch_size: Maximum number of records per write transaction
+            flush_interval: Seconds the writer waits for more records before committing
+            id_block_size: Task IDs reserved per database transaction. Each
+                process sharing the file reserves its own blocks, so IDs stay
+                unique; between processes they interleave by block
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.id_block_size = id_block_size
+        self._local = threading.local()
+        self._queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        # Records queued but not yet committed, by task ID
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        self._pending_lock = threading.Lock()
+        # Held by the writer while a batch is committed and leaves _pending,
+        # so readers counting both never see a record in each
+        self._commit_lock = threading.Lock()
+        
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        self._migrate(conn)
+        
+        self._writer = threading.Thread(target=self._write_loop, name="history-writer", daemon=True)
+        self._writer.start()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, timeout=30)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def _migrate(self, conn: sqlite3.Connection):
+        """Add the write sequence column to databases created without it"""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(task_history)")}
+            if "seq" not in columns:
+                # The write order of existing records is unknown; ID order is closest
+                conn.execute("ALTER TABLE task_history ADD COLUMN seq INTEGER")
+                conn.execute("UPDATE task_history SET seq = task_id")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_task_history_seq ON task_history (seq)")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    
+    def append(self, result: Dict[str, Any]):
+        """Queue a finished task for writing"""
+        record = dict(result)
+        with self._pending_lock:
+            self._pending[record["task_id"]] = record
+        self._queue.put(record)
+    
+    def _write_loop(self):
+        """Commit queued records in batches until closed"""
+        conn = self._connect()
+        running = True
+        
+        while running:
+            batch: List[Dict[str, Any]] = []
+            item = self._queue.get()
+            while item is not None:
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    break
+            running = item is not None
+            
+            if batch:
+                self._write_batch(conn, batch)
+            for _ in range(len(batch) + (0 if running else 1)):
+                self._queue.task_done()
+        
+        conn.close()
+    
+    def _write_batch(self, conn: sqlite3.Connection, batch: List[Dict[str, Any]]):
+        """Write one batch in a single transaction"""
+        rows = []
+        for result in batch:
+            record = TaskRecord.from_dict(result)
+            rows.append((
+                record.task_id, record.task, record.status, record.tool_used,
+                record.start_ts, record.end_ts, record.duration,
+                json.dumps(result, default=str)
+            ))
+        
+        with self._commit_lock:
+            try:
+                # IMMEDIATE takes the write lock before the sequence is read,
+                # so positions follow commit order across processes
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute("SELECT last_seq FROM task_write_sequence").fetchone()
+                if row is None:
+                    (last,) = conn.execute("SELECT MAX(seq) FROM task_history").fetchone()
+                    last = last or 0
+                    conn.execute("INSERT INTO task_write_sequence (last_seq) VALUES (?)",
+                                 (last + len(rows),))
+                else:
+                    last = row[0]
+                    conn.execute("UPDATE task_write_sequence SET last_seq = ?", (last + len(rows),))
+                conn.executemany(_INSERT, [values + (last + i,) for i, values in enumerate(rows, 1)])
+                conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                logger.error(f"Failed to write {len(rows)} history records: {e}")
+            
+            with self._pending_lock:
+                for result in batch:
+                    # A newer version of the record may have been queued meanwhile
+                    if self._pending.get(result["task_id"]) is result:
+                        del self._pending[result["task_id"]]
+    
+    def flush(self):
+        """Block until every queued record has been written"""
+        self._queue.join()
+    
+    def get(self, task_id: int) -> Optional[Dict[str, Any]]:
+        """Look up a task by ID"""
+        with self._pending_lock:
+            record = self._pending.get(task_id)
+        if record is not None:
+            return dict(record)
+        
+        row = self._connect().execute(
+            "SELECT data FROM task_history WHERE task_id = ?", (task_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def __len__(self) -> int:
+        conn = self._connect()
+        with self._commit_lock:
+            with self._pending_lock:
+                pending = list(self._pending)
+            # Pending updates of records already stored count once
+            (count,) = conn.execute(
+                "SELECT (SELECT COUNT(*) FROM task_history) - (SELECT COUNT(*) FROM task_history "
+                "WHERE task_id IN (SELECT value FROM json_each(?)))",
+                (json.dumps(pending),)
+            ).fetchone()
+        return count + len(pending)
+    
+    def last_task_id(self) -> int:
+        """Highest stored task ID, so IDs keep increasing across restarts"""
+        (last,) = self._connect().execute("SELECT MAX(task_id) FROM task_history").fetchone()
+        with self._pending_lock:
+            return max([last or 0] + list(self._pending))
+    
+    def task_ids(self) -> Iterator[int]:
+        """IDs reserved from the database, unique across every process using it"""
+        return _TaskIdBlocks(self)
+    
+    def _reserve_task_ids(self) -> Tuple[int, int]:
+        """Reserve the next block of task IDs, returning (first, end)"""
+        conn = self._connect()
+        # IMMEDIATE takes the write lock up front, so no other process can
+        # read the same sequence value before this one updates it
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT next_id FROM task_id_sequence").fetchone()
+            if row is None:
+                # New database, or one written before IDs were reserved
+                (last,) = conn.execute("SELECT MAX(task_id) FROM task_history").fetchone()
+                first = (last or 0) + 1
+                conn.execute("INSERT INTO task_id_sequence (next_id) VALUES (?)",
+                             (first + self.id_block_size,))
+            else:
+                first = row[0]
+                conn.execute("UPDATE task_id_sequence SET next_id = ?", (first + self.id_block_size,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return first, first + self.id_block_size
+    
+    def changes(self, after: int = 0, limit: Optional[int] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Get the tasks committed after a position in write order
+        
+        Positions are assigned when the writer commits a batch, so records
+        still queued are left out until then. They come from the database,
+        so every process sharing it sees the same order.
+        """
+        conn = self._connect()
+        row = conn.execute("SELECT last_seq FROM task_write_sequence").fetchone()
+        if after > (row[0] if row else 0):
+            after = 0
+        rows = conn.execute(
+            "SELECT seq, data FROM task_history WHERE seq > ? ORDER BY seq LIMIT ?",
+            (after, -1 if limit is None else limit)
+        ).fetchall()
+        position = rows[-1][0] if rows else after
+        return [json.loads(data) for _, data in rows], position
+    
+    def iter_records(self, status: Optional[str] = None, since: Optional[float] = None,
+                     until: Optional[float] = None, tool: Optional[str] = None,
+                     before: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over stored tasks, newest first
+        
+        Args:
+            status: Only tasks with this status
+            since: Only tasks started at or after this time (seconds since the epoch)
+            until: Only tasks started before this time (seconds since the epoch)
+            tool: Only tasks run by this tool
+            before: Only tasks with a lower task ID
+        
+        Returns:
+            Iterator of task results
+        """
+        with self._pending_lock:
+            pending = sorted(self._pending.values(), key=lambda r: r["task_id"], reverse=True)
+        # A pending record replaces any older copy already in the database
+        seen = {result["task_id"] for result in pending}
+        
+        def pending_records() -> Iterator[Dict[str, Any]]:
+            for result in pending:
+                record = TaskRecord.from_dict(result)
+                if before is not None and record.task_id >= before:
+                    continue
+                if status is not None and record.status != status:
+                    continue
+                if tool is not None and record.tool_used != tool:
+                    continue
+                if since is not None and record.start_ts < since:
+                    continue
+                if until is not None and record.start_ts >= until:
+                    continue
+                yield dict(result)
+        
+        clauses, params = [], []
+        for column, op, value in (("status", "=", status), ("tool_used", "=", tool),
+                                  ("start_time", ">=", since), ("start_time", "<", until),
+                                  ("task_id", "<", before)):
+            if value is not None:
+                clauses.append(f"{column} {op} ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        
+        def stored_records() -> Iterator[Dict[str, Any]]:
+            cursor = self._connect().execute(
+                f"SELECT task_id, data FROM task_history {where} ORDER BY task_id DESC", params
+            )
+            for task_id, data in cursor:
+                if task_id not in seen:
+                    yield json.loads(data)
+        
+        # Both streams are in descending ID order; merging keeps it, so a
+        # page cut short by its limit doesn't skip tasks
+        yield from heapq.merge(pending_records(), stored_records(), key=lambda r: -r["task_id"])
+    
+    def page(self, limit: int, before: Optional[int] = None, status: Optional[str] = None,
+             since: Optional[float] = None, until: Optional[float] = None,
+             tool: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get one page of tasks in descending task ID order"""
+        page: List[Dict[str, Any]] = []
+        for record in self.iter_records(status, since, until, tool, before=before):
+            page.append(record)
+            if len(page) >= limit:
+                break
+        return page
+    
+    def clear(self):
+        """Remove every stored task"""
+        self.flush()
+        self._connect().execute("DELETE FROM task_history")
+    
+    def close(self):
+        """Write outstanding records and stop the writer thread"""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -0,0 +1,9 @@
+"""
+Jobs package
+Background execution of queued tasks
+"""
+
+from .job_queue import Job, JobQueue, QueueFull
+from .sqlite_store import SQLiteJobStore
+
+__all__ = ["Job", "JobQueue", "QueueFull", "SQLiteJobStore"]
@@ -0,0 +1,324 @@
+"""
+Job Queue
+Priority queue of tasks run in the background by a bounded worker pool
+"""
+
+import heapq
+import itertools
+import math
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from .sqlite_store import SQLiteJobStore
+
+
+class QueueFull(Exception):
+    """Raised when a job is submitted to a full queue"""
+    
+    def __init__(self, retry_after: int):
+        """
+        Create the exception
+        
+        Args:
+            retry_after: Suggested number of seconds to wait before retrying
+        """
+        super().__init__(f"Job queue is full; retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class Job:
+    """A task waiting for, or run by, a job queue worker"""
+    
+    __slots__ = ("job_id", "task", "tool", "priority", "timeout", "status",
+                 "submitted_at", "started_at", "finished_at", "result")
+    
+    def __init__(self, task: str, tool: Optional[str] = None, priority: int = 0,
+                 timeout: Optional[float] = None):
+        """
+        Create a queued job
+        
+        Args:
+            task: Task description
+            tool: Specific tool to use (optional)
+            priority: Jobs with higher priorities run first
+            timeout: Time budget in seconds, counted from when the job starts
+        """
+        self.job_id = uuid.uuid4().hex
+        self.task = task
+        self.tool = tool
+        self.priority = priority
+        self.timeout = timeout
+        # "queued", "running", then the status of the finished task
+        self.status = "queued"
+        self.submitted_at = datetime.now().isoformat()
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        # Task record returned by the agent
+        self.result: Optional[Dict[str, Any]] = None
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Job":
+        """Rebuild a job from a dictionary made by ``to_dict``"""
+        job = cls.__new__(cls)
+        job.timeout = None
+        for field in ("job_id", "task", "tool", "priority", "status",
+                      "submitted_at", "started_at", "finished_at", "result"):
+            setattr(job, field, data.get(field))
+        return job
+    
+    @property
+    def done(self) -> bool:
+        """Whether the job has finished"""
+        return self.status not in ("queued", "running")
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the job to a dictionary"""
+        return {
+            "job_id": self.job_id,
+            "task": self.task,
+            "tool": self.tool,
+            "priority": self.priority,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result
+        }
+
+
+class JobQueue:
+    """
+    Bounded priority queue of agent tasks with a fixed pool of workers
+    
+    Jobs with a higher priority run first; jobs of equal priority run in
+    submission order. When ``max_queued`` jobs are waiting, ``submit``
+    refuses new jobs with QueueFull instead of letting latency pile up.
+    Finished jobs are kept for lookup until ``max_finished`` newer jobs
+    have finished.
+    
+    Workers are started on the first submission, so creating a queue in
+    a module imported before a server forks does not start threads in
+    the parent process.
+    
+    If the agent has an event broker, every change of job status is
+    published to it as a "job" event.
+    
+    Jobs run in the process that queued them. With a store, their status
+    is also written to a database, so other processes sharing it (such
+    as the other workers of a prefork server) can look them up and
+    cancel them.
+    """
+    
+    def __init__(self, agent: Any, workers: int = 4, max_queued: int = 1000,
+                 max_finished: int = 10000, store: Optional[SQLiteJobStore] = None):
+        """
+        Initialize the queue
+        
+        Args:
+            agent: Agent running the jobs
+            workers: Number of jobs run concurrently
+            max_queued: Maximum number of jobs waiting to run
+            max_finished: Number of finished jobs kept for lookup
+            store: Job status shared with other processes (optional)
+        """
+        self.agent = agent
+        self.workers = workers
+        self.max_queued = max_queued
+        self.max_finished = max_finished
+        self.store = store
+        # Heap of (-priority, sequence, job)
+        self._heap: List[Tuple[int, int, Job]] = []
+        self._sequence = itertools.count()
+        self._jobs: Dict[str, Job] = {}
+        self._finished: "OrderedDict[str, None]" = OrderedDict()
+        self._condition = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._closed = False
+        self._running = 0
+        # Moving average of job run time, for Retry-After estimates
+        self._average_duration = 1.0
+    
+    def submit(self, task: str, tool: Optional[str] = None, priority: int = 0,
+               timeout: Optional[float] = None) -> Job:
+        """
+        Queue a task
+        
+        Args:
+            task: Task description
+            tool: Specific tool to use (optional)
+            priority: Jobs with higher priorities run first
+            timeout: Time budget in seconds, counted from when the job starts
+        
+        Returns:
+            The queued job
+        
+        Raises:
+            QueueFull: If ``max_queued`` jobs are already waiting
+            RuntimeError: If the queue has been closed
+        """
+        job = Job(task, tool, priority, timeout)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Job queue is closed")
+            if len(self._heap) >= self.max_queued:
+                raise QueueFull(self._retry_after())
+            if not self._threads:
+                self._start_workers()
+            
+            self._jobs[job.job_id] = job
+            if self.store is not None:
+                # Stored before a worker can claim it
+                self.store.save(job.to_dict())
+            heapq.heappush(self._heap, (-priority, next(self._sequence), job))
+            self._condition.notify()
+        self._publish(job)
+        return job
+    
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Look up a job
+        
+        Args:
+            job_id: Job ID
+        
+        Returns:
+            Job, or None if it is unknown or no longer kept
+        """
+        job = self._jobs.get(job_id)
+        if job is None and self.store is not None:
+            data = self.store.load(job_id)
+            if data is not None:
+                job = Job.from_dict(data)
+        return job
+    
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a job that has not started yet
+        
+        Args:
+            job_id: Job ID
+        
+        Returns:
+            True if the job was waiting and is now cancelled
+        """
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != "queued":
+                if job is None and self.store is not None:
+                    # Queued by another process, which skips it when it
+                    # finds it cancelled in the store
+                    return self.store.cancel(job_id) is not None
+                return False
+            if self.store is not None and self.store.cancel(job_id) is None:
+                return False
+            self._heap = [entry for entry in self._heap if entry[2] is not job]
+            heapq.heapify(self._heap)
+            job.status = "cancelled"
+            job.finished_at = datetime.now().isoformat()
+            self._retire(job)
+        self._publish(job)
+        return True
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get queue length, running jobs and capacity"""
+        with self._condition:
+            return {
+                "queued": len(self._heap),
+                "running": self._running,
+                "workers": self.workers,
+                "max_queued": self.max_queued
+            }
+    
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """
+        Stop accepting jobs and wait for queued and running jobs to finish
+        
+        Args:
+            timeout: Maximum number of seconds to wait (None = no limit)
+        
+        Returns:
+            True if every job finished in time
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        for thread in self._threads:
+            thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        return not any(thread.is_alive() for thread in self._threads)
+    
+    def _start_workers(self):
+        """Start the worker threads; the condition must be held"""
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+    
+    def _retry_after(self) -> int:
+        """Estimate the seconds until the queue has room; the condition must be held"""
+        return max(1, math.ceil(len(self._heap) * self._average_duration / self.workers))
+    
+    def _publish(self, job: Job):
+        """Publish a job's status to the agent's event broker, if any"""
+        events = getattr(self.agent, "events", None)
+        if events is not None:
+            events.publish(
+                "job", job_id=job.job_id, task=job.task, status=job.status,
+                task_id=(job.result or {}).get("task_id")
+            )
+    
+    def _retire(self, job: Job):
+        """Keep a finished job for lookup, forgetting the oldest; the condition must be held"""
+        self._finished[job.job_id] = None
+        while len(self._finished) > self.max_finished:
+            old_id, _ = self._finished.popitem(last=False)
+            self._jobs.pop(old_id, None)
+    
+    def _work(self):
+        """Worker loop: run the highest priority job until the queue is closed and empty"""
+        while True:
+            with self._condition:
+                while not self._heap and not self._closed:
+                    self._condition.wait()
+                if not self._heap:
+                    return
+                _, _, job = heapq.heappop(self._heap)
+                job.status = "running"
+                job.started_at = datetime.now().isoformat()
+                self._running += 1
+            
+            if self.store is not None and not self.store.claim(job.job_id, job.started_at):
+                # Cancelled by another process
+                with self._condition:
+                    job.status = "cancelled"
+                    job.started_at = None
+                    job.finished_at = datetime.now().isoformat()
+                    self._running -= 1
+                    self._retire(job)
+                self._publish(job)
+                continue
+            self._publish(job)
+            
+            start_time = time.perf_counter()
+            try:
+                result = self.agent.execute_task(job.task, job.tool, timeout=job.timeout)
+                status = result["status"]
+            except Exception as e:
+                result = {"status": "failed", "error": str(e)}
+                status = "failed"
+            duration = time.perf_counter() - start_time
+            
+            with self._condition:
+                job.result = result
+                job.finished_at = datetime.now().isoformat()
+                job.status = status
+                self._running -= 1
+                self._average_duration = 0.9 * self._average_duration + 0.1 * duration
+                self._retire(job)
+            if self.store is not None:
+                self.store.save(job.to_dict())
+            self._publish(job)
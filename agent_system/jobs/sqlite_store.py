@@ -0,0 +1,157 @@
+"""
+SQLite Job Store
+Job status shared by every process using the same SQLite database
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    finished_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_finished_at ON jobs (finished_at);
+"""
+
+
+class SQLiteJobStore:
+    """
+    Job status kept in a SQLite database shared between processes
+    
+    Each job still runs in the process that queued it, but its status is
+    written here, so any process using the database can look it up or
+    cancel it. A job's move from "queued" to "running" or "cancelled"
+    happens in one transaction, so a job cancelled by another process is
+    never started.
+    """
+    
+    def __init__(self, path: str, max_finished: int = 10000, prune_every: int = 100):
+        """
+        Open or create the job database
+        
+        Args:
+            path: Database file path; may be the history database
+            max_finished: Number of finished jobs kept for lookup
+            prune_every: Number of finished jobs between removals of old ones
+        """
+        self.path = path
+        self.max_finished = max_finished
+        self.prune_every = prune_every
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._finished = 0
+        
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None, timeout=30)
+            self._local.conn = conn
+        return conn
+    
+    def save(self, job: Dict[str, Any]):
+        """
+        Store a job's current state
+        
+        Args:
+            job: Job as a dictionary (see ``Job.to_dict``)
+        """
+        self._connect().execute(
+            "INSERT OR REPLACE INTO jobs (job_id, status, finished_at, data) VALUES (?, ?, ?, ?)",
+            (job["job_id"], job["status"], job["finished_at"], json.dumps(job, default=str))
+        )
+        if job["finished_at"] is not None:
+            with self._lock:
+                self._finished += 1
+                prune = self._finished % self.prune_every == 0
+            if prune:
+                self._prune()
+    
+    def load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a job
+        
+        Args:
+            job_id: Job ID
+        
+        Returns:
+            Job as a dictionary, or None if it is unknown or no longer kept
+        """
+        row = self._connect().execute("SELECT data FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def claim(self, job_id: str, started_at: str) -> bool:
+        """
+        Mark a queued job as running
+        
+        Args:
+            job_id: Job ID
+            started_at: Start time
+        
+        Returns:
+            False if the job is no longer queued (it was cancelled)
+        """
+        return self._transition(job_id, "running", started_at=started_at) is not None
+    
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Cancel a job that has not started yet
+        
+        Args:
+            job_id: Job ID
+        
+        Returns:
+            The cancelled job as a dictionary, or None if it isn't queued
+        """
+        return self._transition(job_id, "cancelled", finished_at=datetime.now().isoformat())
+    
+    def _transition(self, job_id: str, status: str, **fields: str) -> Optional[Dict[str, Any]]:
+        """Move a queued job to another status, returning it or None if it isn't queued"""
+        conn = self._connect()
+        # IMMEDIATE takes the write lock before reading, so two processes
+        # can't both move the same job out of the queue
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT data FROM jobs WHERE job_id = ? AND status = 'queued'", (job_id,)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            job = json.loads(row[0])
+            job.update(fields, status=status)
+            conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, data = ? WHERE job_id = ?",
+                (status, job["finished_at"], json.dumps(job, default=str), job_id)
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return job
+    
+    def _prune(self):
+        """Forget the oldest finished jobs beyond ``max_finished``"""
+        self._connect().execute(
+            "DELETE FROM jobs WHERE job_id IN (SELECT job_id FROM jobs WHERE finished_at IS NOT NULL "
+            "ORDER BY finished_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_finished,)
+        )
+    
+    def close(self):
+        """Close this thread's connection"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
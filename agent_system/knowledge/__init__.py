@@ -0,0 +1,40 @@
+"""
+Knowledge package
+Storage backends for the documentation tool's knowledge base
+"""
+
+import os
+from .base_store import KnowledgeStore, CachedStore
+from .memory_store import InMemoryStore
+from .sqlite_store import SQLiteStore
+from .sharded_store import ShardedFileStore
+
+
+def open_store(path: str) -> KnowledgeStore:
+    """
+    Open a knowledge base store, picking the backend from the path
+    
+    Directories are sharded-file stores, ``.db``/``.sqlite`` files are
+    SQLite stores and anything else is read as a JSON topic mapping.
+    
+    Args:
+        path: Knowledge base location
+    
+    Returns:
+        Store instance
+    """
+    if os.path.isdir(path):
+        return ShardedFileStore(path)
+    if path.endswith((".db", ".sqlite", ".sqlite3")):
+        return SQLiteStore(path)
+    return InMemoryStore.from_json(path)
+
+
+__all__ = [
+    "KnowledgeStore",
+    "CachedStore",
+    "InMemoryStore",
+    "SQLiteStore",
+    "ShardedFileStore",
+    "open_store",
+]
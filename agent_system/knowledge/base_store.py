@@ -0,0 +1,110 @@
+"""
+Base Knowledge Store
+Abstract store interface and a bounded LRU cache in front of it
+"""
+
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+
+class KnowledgeStore(ABC):
+    """Abstract base class for knowledge base storage backends"""
+    
+    @abstractmethod
+    def topics(self) -> Iterable[str]:
+        """
+        List every topic in the store
+        
+        Returns:
+            Lowercase topic names
+        """
+        pass
+    
+    @abstractmethod
+    def get(self, topic: str) -> Optional[str]:
+        """
+        Fetch the content of a topic
+        
+        Args:
+            topic: Lowercase topic name
+        
+        Returns:
+            Topic content, or None if the topic is unknown
+        """
+        pass
+    
+    def put(self, topic: str, content: str):
+        """
+        Add or replace a topic
+        
+        Args:
+            topic: Lowercase topic name
+            content: Topic content
+        
+        Raises:
+            ValueError: If the backend is read-only
+        """
+        raise ValueError(f"Cannot add topics to a read-only {type(self).__name__}")
+    
+    def close(self):
+        """Release any resources held by the store"""
+        pass
+
+
+class CachedStore(KnowledgeStore):
+    """Keeps the most recently used topics of another store in memory"""
+    
+    def __init__(self, store: KnowledgeStore, max_entries: int = 1024):
+        """
+        Wrap a store with an LRU cache
+        
+        Args:
+            store: Backing store
+            max_entries: Maximum number of cached topics
+        """
+        self.store = store
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[str, Optional[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def topics(self) -> Iterable[str]:
+        """List every topic in the backing store"""
+        return self.store.topics()
+    
+    def get(self, topic: str) -> Optional[str]:
+        """Fetch a topic, loading it from the backing store on a miss"""
+        with self._lock:
+            if topic in self._cache:
+                self._cache.move_to_end(topic)
+                self.hits += 1
+                return self._cache[topic]
+            self.misses += 1
+        
+        content = self.store.get(topic)
+        
+        with self._lock:
+            self._cache[topic] = content
+            self._cache.move_to_end(topic)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        
+        return content
+    
+    def put(self, topic: str, content: str):
+        """Write a topic through to the backing store"""
+        self.store.put(topic, content)
+        with self._lock:
+            self._cache.pop(topic, None)
+    
+    def close(self):
+        """Close the backing store"""
+        self.store.close()
+    
+    def stats(self) -> Dict[str, int]:
+        """Get cache hit/miss counters"""
+        with self._lock:
+            return {"entries": len(self._cache), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,49 @@
+"""
+In-Memory Knowledge Store
+Dictionary-backed store for small knowledge bases
+"""
+
+import json
+from typing import Dict, Iterable, Optional
+from .base_store import KnowledgeStore
+
+
+class InMemoryStore(KnowledgeStore):
+    """Knowledge store holding every topic in a dictionary"""
+    
+    def __init__(self, topics: Optional[Dict[str, str]] = None):
+        """
+        Initialize the store
+        
+        Args:
+            topics: Mapping of topic names to content
+        """
+        self._topics: Dict[str, str] = {
+            topic.lower(): content for topic, content in (topics or {}).items()
+        }
+    
+    @classmethod
+    def from_json(cls, path: str) -> "InMemoryStore":
+        """
+        Load a store from a JSON file mapping topics to content
+        
+        Args:
+            path: JSON file path
+        
+        Returns:
+            Store instance
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+    
+    def topics(self) -> Iterable[str]:
+        """List every topic in the store"""
+        return list(self._topics.keys())
+    
+    def get(self, topic: str) -> Optional[str]:
+        """Fetch the content of a topic"""
+        return self._topics.get(topic)
+    
+    def put(self, topic: str, content: str):
+        """Add or replace a topic"""
+        self._topics[topic.lower()] = content
@@ -0,0 +1,112 @@
+"""
+Sharded File Knowledge Store
+Knowledge base split across JSON Lines shard files with an offset index
+"""
+
+import json
+import os
+import threading
+import zlib
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple
+from .base_store import KnowledgeStore
+
+
+INDEX_FILE = "index.json"
+FORMAT_VERSION = 1
+
+
+class ShardedFileStore(KnowledgeStore):
+    """Read-only knowledge store reading topics straight from shard files"""
+    
+    def __init__(self, directory: str):
+        """
+        Open a store written by ShardedFileStore.build
+        
+        Only the offset index is loaded; topic content stays on disk until
+        it is looked up.
+        
+        Args:
+            directory: Store directory
+        
+        Raises:
+            ValueError: If the store has an unsupported format version
+        """
+        self.directory = directory
+        
+        with open(os.path.join(directory, INDEX_FILE), "r", encoding="utf-8") as f:
+            index = json.load(f)
+        
+        if index.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported knowledge store version in '{directory}'")
+        
+        self._shards: List[str] = index["shards"]
+        # topic -> (shard number, byte offset, byte length)
+        self._offsets: Dict[str, Tuple[int, int, int]] = {
+            topic: tuple(location) for topic, location in index["topics"].items()
+        }
+        self._files: Dict[int, BinaryIO] = {}
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def build(cls, directory: str, topics: Iterable[Tuple[str, str]],
+              num_shards: int = 16) -> "ShardedFileStore":
+        """
+        Write a sharded store
+        
+        Topics are assigned to shards by a stable hash of their name.
+        
+        Args:
+            directory: Output directory (created if missing)
+            topics: (topic, content) pairs
+            num_shards: Number of shard files
+        
+        Returns:
+            Store opened on the new directory
+        """
+        os.makedirs(directory, exist_ok=True)
+        shards = [f"shard-{i:03d}.jsonl" for i in range(num_shards)]
+        files = [open(os.path.join(directory, name), "wb") for name in shards]
+        offsets: Dict[str, List[int]] = {}
+        
+        try:
+            for topic, content in topics:
+                topic = topic.lower()
+                shard = zlib.crc32(topic.encode("utf-8")) % num_shards
+                line = json.dumps({"topic": topic, "content": content}).encode("utf-8") + b"\n"
+                offsets[topic] = [shard, files[shard].tell(), len(line)]
+                files[shard].write(line)
+        finally:
+            for f in files:
+                f.close()
+        
+        with open(os.path.join(directory, INDEX_FILE), "w", encoding="utf-8") as f:
+            json.dump({"version": FORMAT_VERSION, "shards": shards, "topics": offsets}, f)
+        
+        return cls(directory)
+    
+    def _read(self, shard: int, offset: int, length: int) -> bytes:
+        """Read a byte range from a shard file"""
+        with self._lock:
+            f = self._files.get(shard)
+            if f is None:
+                f = self._files[shard] = open(os.path.join(self.directory, self._shards[shard]), "rb")
+            f.seek(offset)
+            return f.read(length)
+    
+    def topics(self) -> Iterable[str]:
+        """List every topic in the store"""
+        return list(self._offsets.keys())
+    
+    def get(self, topic: str) -> Optional[str]:
+        """Fetch the content of a topic"""
+        location = self._offsets.get(topic)
+        if location is None:
+            return None
+        return json.loads(self._read(*location))["content"]
+    
+    def close(self):
+        """Close open shard files"""
+        with self._lock:
+            for f in self._files.values():
+                f.close()
+            self._files = {}
@@ -0,0 +1,75 @@
+"""
+SQLite Knowledge Store
+Knowledge base kept in a SQLite database and read on demand
+"""
+
+import sqlite3
+import threading
+from typing import Dict, Iterable, Optional
+from .base_store import KnowledgeStore
+
+
+class SQLiteStore(KnowledgeStore):
+    """Knowledge store backed by a SQLite database file"""
+    
+    def __init__(self, path: str):
+        """
+        Open or create the database
+        
+        Args:
+            path: Database file path
+        """
+        self.path = path
+        # sqlite3 connections cannot be shared across threads
+        self._local = threading.local()
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS topics (topic TEXT PRIMARY KEY, content TEXT NOT NULL)"
+        )
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None)
+            self._local.conn = conn
+        return conn
+    
+    def topics(self) -> Iterable[str]:
+        """List every topic in the store"""
+        return [row[0] for row in self._connect().execute("SELECT topic FROM topics")]
+    
+    def get(self, topic: str) -> Optional[str]:
+        """Fetch the content of a topic"""
+        row = self._connect().execute(
+            "SELECT content FROM topics WHERE topic = ?", (topic,)
+        ).fetchone()
+        return row[0] if row else None
+    
+    def put(self, topic: str, content: str):
+        """Add or replace a topic"""
+        self._connect().execute(
+            "INSERT OR REPLACE INTO topics (topic, content) VALUES (?, ?)",
+            (topic.lower(), content)
+        )
+    
+    def put_many(self, topics: Dict[str, str]):
+        """
+        Add or replace many topics in one transaction
+        
+        Args:
+            topics: Mapping of topic names to content
+        """
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN")
+            conn.executemany(
+                "INSERT OR REPLACE INTO topics (topic, content) VALUES (?, ?)",
+                ((topic.lower(), content) for topic, content in topics.items())
+            )
+    
+    def close(self):
+        """Close this thread's connection"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -0,0 +1,17 @@
+"""
+Metrics package
+Low-overhead instrumentation and Prometheus export
+"""
+
+from .instruments import Counter, Histogram
+from .registry import PROMETHEUS_CONTENT_TYPE, MetricFamily, MetricsRegistry
+from .agent_metrics import AgentMetrics
+
+__all__ = [
+    "Counter",
+    "Histogram",
+    "PROMETHEUS_CONTENT_TYPE",
+    "MetricFamily",
+    "MetricsRegistry",
+    "AgentMetrics"
+]
@@ -0,0 +1,224 @@
+"""
+Agent Metrics
+The metrics an Agent records while running tasks
+"""
+
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional
+from .instruments import _UPPER_BOUNDS, _bisect
+from .registry import MetricsRegistry
+
+
+class AgentMetrics:
+    """
+    Task, routing, tool and history metrics of an agent
+    
+    Recording a metric is a thread-local list update with no locking;
+    each task records at most five values. Each thread keeps the slot
+    lists of every tool it records for, so a record call finds all of
+    them with one lookup and updates them in place.
+    """
+    
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        """
+        Create the agent's metric families
+        
+        Args:
+            registry: Registry to add the metrics to (defaults to a new one)
+        """
+        self.registry = registry if registry is not None else MetricsRegistry()
+        self.tasks = self.registry.counter(
+            "codev_tasks_total", "Tasks finished, by tool and final status", ("tool", "status")
+        )
+        self.route_decisions = self.registry.counter(
+            "codev_route_decisions_total", "Tasks the router sent to each tool", ("tool",)
+        )
+        self.route_duration = self.registry.histogram(
+            "codev_route_duration_seconds", "Time taken to route a single task", ("tool",)
+        )
+        self.tool_duration = self.registry.histogram(
+            "codev_tool_duration_seconds", "Time spent running tools", ("tool",)
+        )
+        self.history_write_duration = self.registry.histogram(
+            "codev_history_write_duration_seconds", "Time taken to store a task record"
+        )
+        # Instruments of each tool, so recording a task costs one dictionary
+        # lookup instead of a family lookup per metric
+        self._history_writes = self.history_write_duration.labels()
+        self._tools: Dict[str, _ToolInstruments] = {}
+        # Per thread: tool name -> that thread's slot lists (_ToolShards)
+        self._local = threading.local()
+    
+    def _instruments(self, tool_name: str) -> "_ToolInstruments":
+        """Get the instruments of a tool, creating them on first use"""
+        instruments = self._tools.get(tool_name)
+        if instruments is None:
+            instruments = self._tools[tool_name] = _ToolInstruments()
+        return instruments
+    
+    def _new_shards(self, tool_name: str) -> "_ToolShards":
+        """Create the calling thread's slot list holder for a tool"""
+        try:
+            tools = self._local.tools
+        except AttributeError:
+            tools = self._local.tools = {}
+        shards = tools[tool_name] = _ToolShards(self._history_writes.shard())
+        return shards
+    
+    def record_route(self, tool_name: str, seconds: float):
+        """
+        Record that a task was routed
+        
+        Args:
+            tool_name: Tool the router chose
+            seconds: Time taken to route the task
+        """
+        try:
+            shards = self._local.tools[tool_name]
+        except (AttributeError, KeyError):
+            shards = self._new_shards(tool_name)
+        routes = shards.routes
+        if routes is None:
+            instruments = self._instruments(tool_name)
+            if instruments.route_duration is None:
+                instruments.route_duration = self.route_duration.labels(tool_name)
+                instruments.routes = self.route_decisions.labels(tool_name)
+            routes = shards.routes = instruments.routes.shard()
+            shards.route_duration = instruments.route_duration.shard()
+        routes[0] += 1
+        # Histogram.observe, inlined
+        duration = shards.route_duration
+        duration[_bisect(_UPPER_BOUNDS, seconds)] += 1
+        duration[-1] += seconds
+    
+    def record_routes(self, tool_names: List[str]):
+        """
+        Record the routing decisions of a batch, routed in one pass
+        
+        Args:
+            tool_names: Tool chosen for each task
+        """
+        for tool_name, count in Counter(tool_names).items():
+            instruments = self._instruments(tool_name)
+            if instruments.routes is None:
+                instruments.routes = self.route_decisions.labels(tool_name)
+            instruments.routes.inc(count)
+    
+    def record_tool(self, tool_name: str, seconds: float):
+        """
+        Record a tool run
+        
+        Args:
+            tool_name: Tool name
+            seconds: Time the tool ran for
+        """
+        try:
+            shards = self._local.tools[tool_name]
+        except (AttributeError, KeyError):
+            shards = self._new_shards(tool_name)
+        duration = shards.duration
+        if duration is None:
+            instruments = self._instruments(tool_name)
+            if instruments.duration is None:
+                instruments.duration = self.tool_duration.labels(tool_name)
+            duration = shards.duration = instruments.duration.shard()
+        duration[_bisect(_UPPER_BOUNDS, seconds)] += 1
+        duration[-1] += seconds
+    
+    def record_task(self, tool_name: Optional[str], status: str, history_seconds: float):
+        """
+        Record a finished task
+        
+        Args:
+            tool_name: Tool that ran the task (None if none was selected)
+            status: Final task status
+            history_seconds: Time taken to store the task record
+        """
+        tool_name = tool_name or ""
+        try:
+            shards = self._local.tools[tool_name]
+        except (AttributeError, KeyError):
+            shards = self._new_shards(tool_name)
+        counter = shards.tasks.get(status)
+        if counter is None:
+            instruments = self._instruments(tool_name)
+            if status not in instruments.tasks:
+                instruments.tasks[status] = self.tasks.labels(tool_name, status)
+            counter = shards.tasks[status] = instruments.tasks[status].shard()
+        counter[0] += 1
+        history = shards.history
+        history[_bisect(_UPPER_BOUNDS, history_seconds)] += 1
+        history[-1] += history_seconds
+    
+    def to_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format"""
+        return self.registry.to_prometheus()
+    
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summarize the metrics for display
+        
+        Returns:
+            Dictionary with per-tool task counts, error rates, routing
+            decisions and duration percentiles, and history write
+            percentiles
+        """
+        tools: Dict[str, Dict[str, Any]] = {}
+        
+        def entry(tool_name: str) -> Dict[str, Any]:
+            return tools.setdefault(tool_name, {"tasks": 0, "failed": 0, "routed": 0})
+        
+        for (tool_name, status), counter in self.tasks.children():
+            stats = entry(tool_name)
+            stats["tasks"] += counter.value
+            if status != "completed":
+                stats["failed"] += counter.value
+        for (tool_name,), counter in self.route_decisions.children():
+            entry(tool_name)["routed"] = counter.value
+        for (tool_name,), histogram in self.tool_duration.children():
+            stats = entry(tool_name)
+            for name, q in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99)):
+                stats[name] = histogram.quantile(q)
+        
+        for stats in tools.values():
+            stats["error_rate"] = stats["failed"] / stats["tasks"] if stats["tasks"] else 0.0
+        
+        return {
+            "tools": tools,
+            "history_writes": self._history_writes.count,
+            "history_write_p99": self._history_writes.quantile(0.99)
+        }
+
+
+class _ToolInstruments:
+    """
+    The instruments labelled with one tool's name
+    
+    Each is created when first recorded to, so tools that are never
+    routed to or run don't export empty series.
+    """
+    
+    __slots__ = ("routes", "route_duration", "duration", "tasks")
+    
+    def __init__(self):
+        self.routes: Any = None
+        self.route_duration: Any = None
+        self.duration: Any = None
+        # Task counters by final status
+        self.tasks: Dict[str, Any] = {}
+
+
+class _ToolShards:
+    """One thread's slot lists of a tool's instruments, bound on first use"""
+    
+    __slots__ = ("routes", "route_duration", "duration", "tasks", "history")
+    
+    def __init__(self, history: list):
+        self.routes: Optional[list] = None
+        self.route_duration: Optional[list] = None
+        self.duration: Optional[list] = None
+        # Task counter slots by final status
+        self.tasks: Dict[str, list] = {}
+        # The history write histogram isn't per tool; every tool shares it
+        self.history = history
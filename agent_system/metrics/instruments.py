@@ -0,0 +1,209 @@
+"""
+Instruments
+Lock-free counters and log-bucketed latency histograms
+"""
+
+import math
+import threading
+from bisect import bisect_right as _bisect
+from typing import List, Optional, Tuple
+
+
+# Histogram buckets cover 2**-20 s (about 1 microsecond) to 2**8 s (256 s).
+# Each power of two is split into SUB_BUCKETS linear buckets, so a recorded
+# value is off by at most 1 / SUB_BUCKETS (12.5%) of itself.
+SUB_BUCKETS = 8
+MIN_EXPONENT = -19
+MAX_EXPONENT = 8
+# Bucket 0 holds values below the range, the last bucket values above it
+NUM_BUCKETS = (MAX_EXPONENT - MIN_EXPONENT + 1) * SUB_BUCKETS + 2
+
+
+def bucket_upper_bound(index: int) -> float:
+    """
+    Get the upper bound of a histogram bucket
+    
+    Args:
+        index: Bucket index
+    
+    Returns:
+        Smallest value above the bucket (infinity for the overflow bucket)
+    """
+    if index == 0:
+        return math.ldexp(1.0, MIN_EXPONENT - 1)
+    if index >= NUM_BUCKETS - 1:
+        return math.inf
+    octave, sub = divmod(index - 1, SUB_BUCKETS)
+    return math.ldexp(1.0 + (sub + 1) / SUB_BUCKETS, MIN_EXPONENT + octave - 1)
+
+
+# Finite bucket bounds; a value belongs to the first bucket whose bound is
+# above it, which a binary search finds in a handful of C-level comparisons
+_UPPER_BOUNDS = [bucket_upper_bound(index) for index in range(NUM_BUCKETS - 1)]
+
+
+class _Sharded:
+    """
+    Base class for instruments that keep one slot list per thread
+    
+    Recording only touches the calling thread's list, so it needs no lock
+    and never contends with other threads. Reads add the lists up. Lists
+    of threads that have exited are folded into a running total the next
+    time a thread registers or the instrument is read.
+    """
+    
+    def __init__(self, size: int):
+        self._size = size
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards: List[Tuple[threading.Thread, list]] = []
+        self._retired = [0] * size
+    
+    def shard(self) -> list:
+        """
+        Get the calling thread's slot list
+        
+        Hot paths that record to several instruments can keep these lists
+        and update them directly, the way ``inc`` and ``observe`` do, to
+        save a method call and a thread-local lookup per value.
+        
+        Returns:
+            Slot list of the calling thread
+        """
+        try:
+            return self._local.shard
+        except AttributeError:
+            return self._new_shard()
+    
+    def _new_shard(self) -> list:
+        """Create and register the slot list of the calling thread"""
+        shard = [0] * self._size
+        with self._lock:
+            self._fold_dead()
+            self._shards.append((threading.current_thread(), shard))
+        self._local.shard = shard
+        return shard
+    
+    def _fold_dead(self):
+        """Merge the lists of exited threads into the total; lock must be held"""
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+            else:
+                self._retired = [a + b for a, b in zip(self._retired, shard)]
+        self._shards = live
+    
+    def _totals(self) -> list:
+        """Add up the slots of every thread"""
+        with self._lock:
+            self._fold_dead()
+            totals = list(self._retired)
+            for _, shard in self._shards:
+                totals = [a + b for a, b in zip(totals, shard)]
+        return totals
+
+
+class Counter(_Sharded):
+    """Monotonically increasing count"""
+    
+    def __init__(self):
+        super().__init__(1)
+    
+    def inc(self, amount: float = 1):
+        """
+        Increase the count
+        
+        Args:
+            amount: Amount to add (must not be negative)
+        """
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        shard[0] += amount
+    
+    @property
+    def value(self) -> float:
+        """Current count"""
+        return self._totals()[0]
+
+
+class Histogram(_Sharded):
+    """
+    Distribution of durations in seconds
+    
+    Values are counted in logarithmic buckets with linear sub-buckets, in
+    the style of HdrHistogram, so the relative error of quantiles is
+    bounded over the whole range.
+    """
+    
+    def __init__(self):
+        # One slot per bucket, then the sum of all values
+        super().__init__(NUM_BUCKETS + 1)
+    
+    def observe(self, value: float):
+        """
+        Record a value
+        
+        Args:
+            value: Duration in seconds
+        """
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+        shard[_bisect(_UPPER_BOUNDS, value)] += 1
+        shard[-1] += value
+    
+    def snapshot(self) -> Tuple[List[int], float]:
+        """
+        Get the current bucket counts
+        
+        Returns:
+            Tuple of (count per bucket, sum of all values)
+        """
+        totals = self._totals()
+        return totals[:NUM_BUCKETS], totals[NUM_BUCKETS]
+    
+    @property
+    def count(self) -> int:
+        """Number of recorded values"""
+        return sum(self.snapshot()[0])
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile
+        
+        Args:
+            q: Quantile between 0 and 1 (0.99 for the 99th percentile)
+        
+        Returns:
+            Upper bound of the bucket holding the quantile, or None if
+            nothing was recorded
+        """
+        return quantile(self.snapshot()[0], q)
+
+
+def quantile(buckets: List[int], q: float) -> Optional[float]:
+    """
+    Estimate a quantile from histogram bucket counts
+    
+    Args:
+        buckets: Count per bucket, as returned by ``Histogram.snapshot``
+        q: Quantile between 0 and 1
+    
+    Returns:
+        Upper bound of the bucket holding the quantile, or None if the
+        histogram is empty
+    """
+    total = sum(buckets)
+    if not total:
+        return None
+    rank = max(1, math.ceil(q * total))
+    seen = 0
+    for index, count in enumerate(buckets):
+        seen += count
+        if seen >= rank:
+            return bucket_upper_bound(index)
+    return math.inf
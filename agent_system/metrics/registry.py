@@ -0,0 +1,174 @@
+"""
+Metrics Registry
+Named metric families and their export in the Prometheus text format
+"""
+
+import math
+import threading
+from typing import Callable, Dict, List, Tuple
+from .instruments import NUM_BUCKETS, SUB_BUCKETS, Counter, Histogram, bucket_upper_bound
+
+
+# Content type of the Prometheus text exposition format
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricFamily:
+    """Metric with a fixed set of label names and one instrument per label set"""
+    
+    def __init__(self, kind: str, name: str, documentation: str,
+                 labelnames: Tuple[str, ...], factory: Callable):
+        """
+        Initialize an empty family
+        
+        Args:
+            kind: "counter" or "histogram"
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the labels
+            factory: Creates the instrument for a new label set
+        """
+        self.kind = kind
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._factory = factory
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+    
+    def labels(self, *values: str):
+        """
+        Get the instrument for a set of label values
+        
+        Args:
+            values: One value per label name, in order
+        
+        Returns:
+            Counter or Histogram
+        """
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"Metric '{self.name}' takes labels {self.labelnames}, got {values}")
+            with self._lock:
+                child = self._children.setdefault(values, self._factory())
+        return child
+    
+    def children(self) -> List[Tuple[Tuple[str, ...], object]]:
+        """Get (label values, instrument) pairs, sorted by label values"""
+        with self._lock:
+            return sorted(self._children.items(), key=lambda item: item[0])
+
+
+class MetricsRegistry:
+    """Collection of metric families exported together"""
+    
+    def __init__(self):
+        """Initialize an empty registry"""
+        self._families: Dict[str, MetricFamily] = {}
+        self._lock = threading.Lock()
+    
+    def _register(self, kind: str, name: str, documentation: str,
+                  labelnames: Tuple[str, ...], factory: Callable) -> MetricFamily:
+        """Get a family by name, creating it on first use"""
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = MetricFamily(kind, name, documentation, tuple(labelnames), factory)
+                self._families[name] = family
+            elif family.kind != kind or family.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric '{name}' is already registered with a different type or labels")
+        return family
+    
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> MetricFamily:
+        """
+        Get or create a counter family
+        
+        Args:
+            name: Metric name, conventionally ending in "_total"
+            documentation: Help text
+            labelnames: Names of the labels
+        
+        Returns:
+            Family of Counter instruments
+        """
+        return self._register("counter", name, documentation, labelnames, Counter)
+    
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> MetricFamily:
+        """
+        Get or create a histogram family
+        
+        Args:
+            name: Metric name, conventionally ending in "_seconds"
+            documentation: Help text
+            labelnames: Names of the labels
+        
+        Returns:
+            Family of Histogram instruments
+        """
+        return self._register("histogram", name, documentation, labelnames, Histogram)
+    
+    def families(self) -> List[MetricFamily]:
+        """Get every registered family, in registration order"""
+        with self._lock:
+            return list(self._families.values())
+    
+    def to_prometheus(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format
+        
+        Histograms are exported with one bucket per power of two; finer
+        buckets are only used for quantiles computed in-process.
+        
+        Returns:
+            Exposition text
+        """
+        lines: List[str] = []
+        for family in self.families():
+            lines.append(f"# HELP {family.name} {_escape_help(family.documentation)}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            for values, child in family.children():
+                labels = list(zip(family.labelnames, values))
+                if family.kind == "counter":
+                    lines.append(f"{family.name}{_format_labels(labels)} {_format_value(child.value)}")
+                    continue
+                
+                buckets, total = child.snapshot()
+                cumulative = 0
+                for index, count in enumerate(buckets):
+                    cumulative += count
+                    # Export bucket 0 and the last sub-bucket of each power of two
+                    if index == NUM_BUCKETS - 1 or (index and index % SUB_BUCKETS):
+                        continue
+                    le = _format_value(bucket_upper_bound(index))
+                    lines.append(f"{family.name}_bucket{_format_labels(labels + [('le', le)])} {cumulative}")
+                lines.append(f"{family.name}_bucket{_format_labels(labels + [('le', '+Inf')])} {cumulative}")
+                lines.append(f"{family.name}_sum{_format_labels(labels)} {_format_value(total)}")
+                lines.append(f"{family.name}_count{_format_labels(labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_help(text: str) -> str:
+    """Escape help text for the exposition format"""
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label(value: str) -> str:
+    """Escape a label value for the exposition format"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: List[Tuple[str, str]]) -> str:
+    """Format (name, value) pairs as a label set, or nothing if there are none"""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value, writing whole numbers without a decimal point"""
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
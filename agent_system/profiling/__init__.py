@@ -0,0 +1,8 @@
+"""
+Profiling package
+Per-task profiles for flamegraphs
+"""
+
+from .profiler import MODES, Profile, TaskProfiler
+
+__all__ = ["MODES", "Profile", "TaskProfiler"]
@@ -0,0 +1,335 @@
+"""
+Task Profiler
+Per-task sampling and tracing profiles, exported as collapsed stacks
+"""
+
+import contextlib
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+
+# Profile modes: "trace" times every call of the task exactly but slows it
+# down several times; "sample" looks at the stack every interval and costs
+# little, but a task shorter than the interval gets only the one sample
+# taken where it finished. Threads holding the GIL are only sampled every
+# sys.getswitchinterval() (5 ms by default).
+MODES = ("trace", "sample")
+
+# Stacks deeper than this are cut at the root end
+MAX_DEPTH = 128
+
+_labels: Dict[object, str] = {}
+
+
+def _label(code) -> str:
+    """Get the flamegraph frame name of a code object, such as "module:Class.method" """
+    label = _labels.get(code)
+    if label is None:
+        name = getattr(code, "co_qualname", code.co_name)
+        parts = code.co_filename.replace("\\", "/").split("/")
+        module = parts[-1][:-3] if parts[-1].endswith(".py") else parts[-1]
+        # Name packages after their directory rather than "__init__"
+        if module == "__init__" and len(parts) > 1:
+            module = parts[-2]
+        label = _labels.setdefault(code, f"{module}:{name}")
+    return label
+
+
+def _caller_frame():
+    """Get the innermost frame of the calling thread outside the profiler and contextlib"""
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_code.co_filename in (__file__, contextlib.__file__):
+        frame = frame.f_back
+    return frame
+
+
+def _stack_of(frame) -> Tuple[str, ...]:
+    """Get the frame names of a stack, root first"""
+    labels = []
+    while frame is not None and len(labels) < MAX_DEPTH:
+        labels.append(_label(frame.f_code))
+        frame = frame.f_back
+    labels.reverse()
+    return tuple(labels)
+
+
+class Profile:
+    """
+    Stacks captured while profiling one or more tasks
+    
+    Weights are sample counts for sampling profiles and microseconds of
+    self time for tracing profiles.
+    """
+    
+    def __init__(self, mode: str = "trace", profiler: Optional["TaskProfiler"] = None):
+        """
+        Create an empty profile
+        
+        Args:
+            mode: "trace" or "sample"
+            profiler: Profiler that samples the threads this profile is
+                attached to (required for sampling profiles)
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown profile mode '{mode}', expected one of {MODES}")
+        if mode == "sample" and profiler is None:
+            raise ValueError("Sampling profiles need a TaskProfiler to take the samples")
+        self.mode = mode
+        self.stacks: Dict[Tuple[str, ...], float] = {}
+        self._profiler = profiler
+        self._lock = threading.Lock()
+    
+    def add(self, stack: Tuple[str, ...], weight: float = 1):
+        """
+        Add weight to a stack
+        
+        Args:
+            stack: Frame names, root first
+            weight: Samples or microseconds
+        """
+        with self._lock:
+            self.stacks[stack] = self.stacks.get(stack, 0) + weight
+    
+    def merge(self, other: "Profile", max_stacks: Optional[int] = None):
+        """
+        Add the stacks of another profile to this one
+        
+        Args:
+            other: Profile to merge
+            max_stacks: Stop adding new distinct stacks past this many
+                (weights of known stacks are still added)
+        """
+        with other._lock:
+            stacks = list(other.stacks.items())
+        with self._lock:
+            for stack, weight in stacks:
+                if stack in self.stacks:
+                    self.stacks[stack] += weight
+                elif max_stacks is None or len(self.stacks) < max_stacks:
+                    self.stacks[stack] = weight
+    
+    @property
+    def total(self) -> float:
+        """Total weight of every stack"""
+        with self._lock:
+            return sum(self.stacks.values())
+    
+    def collapsed(self) -> str:
+        """
+        Render the profile as collapsed stacks
+        
+        Each line is a semicolon-separated stack followed by its weight,
+        the input format of flamegraph.pl, speedscope and similar tools.
+        
+        Returns:
+            Collapsed stack text, heaviest stacks first
+        """
+        with self._lock:
+            stacks = sorted(self.stacks.items(), key=lambda item: -item[1])
+        return "".join(f"{';'.join(stack)} {round(weight)}\n" for stack, weight in stacks if round(weight) > 0)
+    
+    @contextmanager
+    def attach(self) -> Iterator["Profile"]:
+        """
+        Profile the calling thread while the block runs
+        
+        Can be entered on several threads, such as a helper thread that
+        runs a tool on the caller's behalf.
+        """
+        if self.mode == "trace":
+            tracer = _Tracer(self)
+            previous = sys.getprofile()
+            sys.setprofile(tracer)
+            try:
+                yield self
+            finally:
+                sys.setprofile(previous)
+                tracer.flush()
+            return
+        
+        ident = threading.get_ident()
+        self._profiler._attach(ident, self)
+        try:
+            yield self
+        finally:
+            self._profiler._detach(ident, self)
+            # A task shorter than the interval may not have been sampled;
+            # record where it finished rather than an empty profile
+            if not self.stacks:
+                self.add(_stack_of(_caller_frame()))
+    
+    def wrap(self, function: Callable) -> Callable:
+        """
+        Wrap a function so it is profiled on whichever thread calls it
+        
+        Args:
+            function: Function to wrap
+        
+        Returns:
+            Function running ``function`` under ``attach``
+        """
+        def profiled(*args, **kwargs):
+            with self.attach():
+                return function(*args, **kwargs)
+        return profiled
+
+
+class _Tracer:
+    """sys.setprofile hook attributing exact self time to each stack"""
+    
+    def __init__(self, profile: Profile):
+        self.profile = profile
+        # (frame name, start time, time spent in callees) for each open call
+        self.calls: List[Tuple[str, float, float]] = []
+        self.stack: List[str] = []
+        self.stacks: Dict[Tuple[str, ...], float] = {}
+    
+    def __call__(self, frame, event, arg):
+        now = time.perf_counter()
+        if event == "call" or event == "c_call":
+            if event == "call":
+                label = _label(frame.f_code)
+            else:
+                label = f"{getattr(arg, '__module__', None) or 'builtins'}:{getattr(arg, '__qualname__', arg)}"
+            self.stack.append(label)
+            self.calls.append((label, now, 0.0))
+        elif self.calls:
+            # "return", "c_return" or "c_exception"
+            _, start, callees = self.calls.pop()
+            elapsed = now - start
+            key = tuple(self.stack[-MAX_DEPTH:])
+            self.stacks[key] = self.stacks.get(key, 0.0) + (elapsed - callees) * 1e6
+            self.stack.pop()
+            if self.calls:
+                label, parent_start, parent_callees = self.calls[-1]
+                self.calls[-1] = (label, parent_start, parent_callees + elapsed)
+    
+    def flush(self):
+        """Add the recorded stacks to the profile"""
+        for stack, weight in self.stacks.items():
+            self.profile.add(stack, weight)
+        self.stacks = {}
+
+
+class TaskProfiler:
+    """
+    Profiles tasks on request, and a random fraction of all tasks
+    
+    Sampling profiles are taken by one background thread that wakes every
+    ``interval`` seconds while any profile is attached, and records the
+    stack of each attached thread. Every finished profile is also merged
+    into an aggregate profile, so with a small ``sample_rate`` profiling
+    can stay on in production: only the chosen tasks pay for tracing, and
+    the aggregate shows where time goes across all of them.
+    """
+    
+    def __init__(self, mode: str = "trace", interval: float = 0.001,
+                 sample_rate: float = 0.0, max_stacks: int = 10000):
+        """
+        Initialize the profiler
+        
+        Args:
+            mode: Default mode, also used for tasks chosen by ``sample_rate``
+            interval: Seconds between stack samples
+            sample_rate: Fraction of tasks profiled without being asked
+                (0 = only on request)
+            max_stacks: Maximum number of distinct stacks in the aggregate
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown profile mode '{mode}', expected one of {MODES}")
+        self.mode = mode
+        self.interval = interval
+        self.sample_rate = sample_rate
+        self.max_stacks = max_stacks
+        self.aggregate = {name: Profile(name, self) for name in MODES}
+        self.profiled_tasks = 0
+        self._attached: Dict[int, List[Profile]] = {}
+        self._lock = threading.Lock()
+        self._sampler: Optional[threading.Thread] = None
+    
+    def sampled(self) -> bool:
+        """Decide whether to profile a task that did not ask for it"""
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+    
+    def start(self, mode: Optional[str] = None) -> Profile:
+        """
+        Create a profile for one task
+        
+        Args:
+            mode: "trace" or "sample" (defaults to the profiler's mode)
+        
+        Returns:
+            Empty profile; attach it to the threads running the task
+        """
+        return Profile(mode or self.mode, self)
+    
+    def finish(self, profile: Profile):
+        """
+        Add a finished task profile to the aggregate
+        
+        Args:
+            profile: Profile returned by ``start``
+        """
+        self.aggregate[profile.mode].merge(profile, self.max_stacks)
+        with self._lock:
+            self.profiled_tasks += 1
+    
+    def collapsed(self, mode: Optional[str] = None) -> str:
+        """
+        Render the aggregate profile as collapsed stacks
+        
+        Args:
+            mode: "trace" or "sample" (defaults to the profiler's mode)
+        
+        Returns:
+            Collapsed stack text
+        """
+        return self.aggregate[mode or self.mode].collapsed()
+    
+    def reset(self):
+        """Discard the aggregate profiles"""
+        with self._lock:
+            self.aggregate = {name: Profile(name, self) for name in MODES}
+            self.profiled_tasks = 0
+    
+    def _attach(self, ident: int, profile: Profile):
+        """Start sampling a thread into a profile"""
+        with self._lock:
+            self._attached.setdefault(ident, []).append(profile)
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._sample, name="profiler", daemon=True)
+                self._sampler.start()
+    
+    def _detach(self, ident: int, profile: Profile):
+        """Stop sampling a thread into a profile"""
+        with self._lock:
+            profiles = self._attached.get(ident)
+            if profiles is not None:
+                profiles.remove(profile)
+                if not profiles:
+                    del self._attached[ident]
+    
+    def _sample(self):
+        """Sampler thread: record attached stacks until nothing is attached"""
+        sampler = threading.get_ident()
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._attached:
+                    self._sampler = None
+                    return
+                attached = [(ident, list(profiles)) for ident, profiles in self._attached.items()]
+            
+            frames = sys._current_frames()
+            for ident, profiles in attached:
+                frame = frames.get(ident)
+                if frame is None or ident == sampler:
+                    continue
+                stack = _stack_of(frame)
+                for profile in profiles:
+                    profile.add(stack)
+            del frames
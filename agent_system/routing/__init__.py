@@ -0,0 +1,10 @@
+"""
+Routing package
+Selection of the tool that should handle a task
+"""
+
+from .base_router import BaseRouter
+from .keyword_router import KeywordRouter
+from .semantic_router import SemanticRouter
+
+__all__ = ["BaseRouter", "KeywordRouter", "SemanticRouter"]
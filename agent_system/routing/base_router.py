@@ -0,0 +1,69 @@
+"""
+Base Router
+Abstract interface shared by tool routers
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+
+class BaseRouter(ABC):
+    """Abstract base class for tool routers"""
+    
+    @abstractmethod
+    def add_tool(self, tool: Any):
+        """
+        Add the routing information a tool declares
+        
+        Args:
+            tool: Tool instance
+        """
+        pass
+    
+    @abstractmethod
+    def remove_tool(self, tool_name: str):
+        """
+        Forget a tool
+        
+        Args:
+            tool_name: Tool name
+        """
+        pass
+    
+    @abstractmethod
+    def explain(self, task: str) -> Dict[str, Any]:
+        """
+        Score every tool against a task
+        
+        Args:
+            task: Task description
+        
+        Returns:
+            Dictionary with the chosen tool under "tool" and per-tool
+            scores under "scores"
+        """
+        pass
+    
+    def route(self, task: str) -> Optional[str]:
+        """
+        Pick the highest-scoring tool for a task
+        
+        Args:
+            task: Task description
+        
+        Returns:
+            Tool name, or None if the router has no tools
+        """
+        return self.explain(task)["tool"]
+    
+    def route_batch(self, tasks: List[str]) -> List[Optional[str]]:
+        """
+        Pick a tool for each of many tasks
+        
+        Args:
+            tasks: Task descriptions
+        
+        Returns:
+            Tool names in the order of ``tasks``
+        """
+        return [self.route(task) for task in tasks]
@@ -0,0 +1,128 @@
+"""
+Keyword Router
+Scores every tool against a task with one compiled regular expression
+"""
+
+import re
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+from .base_router import BaseRouter
+
+
+class KeywordRouter(BaseRouter):
+    """Weighted keyword and regex router"""
+    
+    def __init__(self, default_tool: Optional[str] = None):
+        """
+        Initialize an empty router
+        
+        Args:
+            default_tool: Tool chosen when no rule matches (defaults to the
+                first tool added)
+        """
+        self.default_tool = default_tool
+        # (tool, rule, weight, is_regex) in registration order
+        self._rules: List[Tuple[str, str, float, bool]] = []
+        self._tools: List[str] = []
+        self._compiled: Optional[Tuple[Pattern, List[Tuple[str, str, float]]]] = None
+    
+    def add_tool(self, tool: Any):
+        """
+        Add the routing rules a tool declares
+        
+        Tools declare ``routing_keywords`` (whole words) and
+        ``routing_patterns`` (regular expressions) as mappings of rule to
+        weight. Earlier tools win ties.
+        
+        Args:
+            tool: Tool instance
+        """
+        self.add_rules(
+            tool.name,
+            getattr(tool, "routing_keywords", {}),
+            getattr(tool, "routing_patterns", {})
+        )
+    
+    def add_rules(self, tool_name: str, keywords: Optional[Dict[str, float]] = None,
+                  patterns: Optional[Dict[str, float]] = None):
+        """
+        Add routing rules for a tool
+        
+        Args:
+            tool_name: Tool name
+            keywords: Case-insensitive words mapped to their weights; a
+                keyword matches as a whole word or its plural, so "doc"
+                matches "docs" but not "docker"
+            patterns: Case-insensitive regular expressions mapped to their weights
+        """
+        self.remove_tool(tool_name)
+        self._tools.append(tool_name)
+        for keyword, weight in (keywords or {}).items():
+            self._rules.append((tool_name, keyword, weight, False))
+        for pattern, weight in (patterns or {}).items():
+            re.compile(pattern)
+            self._rules.append((tool_name, pattern, weight, True))
+        self._compiled = None
+    
+    def remove_tool(self, tool_name: str):
+        """
+        Drop every rule of a tool
+        
+        Args:
+            tool_name: Tool name
+        """
+        if tool_name in self._tools:
+            self._tools.remove(tool_name)
+            self._rules = [rule for rule in self._rules if rule[0] != tool_name]
+            self._compiled = None
+    
+    def _compile(self) -> Tuple[Pattern, List[Tuple[str, str, float]]]:
+        """Combine every rule into one alternation of named groups"""
+        # Longer keywords first so "document" is preferred over "doc"
+        rules = sorted(
+            enumerate(self._rules),
+            key=lambda item: (item[1][3], -len(item[1][1]) if not item[1][3] else 0, item[0])
+        )
+        
+        alternatives = []
+        groups = []
+        for i, (_, (tool_name, rule, weight, is_regex)) in enumerate(rules):
+            # Keywords match whole words only, so short ones don't fire
+            # inside longer words ("doc" in "dockerfile", "code" in "unicode")
+            regex = rule if is_regex else rf"(?<!\w){re.escape(rule)}(?:e?s)?(?!\w)"
+            alternatives.append(f"(?P<r{i}>{regex})")
+            groups.append((tool_name, rule, weight))
+        
+        pattern = re.compile("|".join(alternatives) or r"(?!)", re.IGNORECASE)
+        return pattern, groups
+    
+    def explain(self, task: str) -> Dict[str, Any]:
+        """
+        Score every tool against a task
+        
+        Args:
+            task: Task description
+        
+        Returns:
+            Dictionary with the chosen tool, per-tool scores and the
+            matches that produced them
+        """
+        compiled = self._compiled
+        if compiled is None:
+            compiled = self._compiled = self._compile()
+        pattern, groups = compiled
+        
+        scores = {tool_name: 0.0 for tool_name in self._tools}
+        matches = []
+        for match in pattern.finditer(task):
+            tool_name, rule, weight = groups[int(match.lastgroup[1:])]
+            scores[tool_name] += weight
+            matches.append({"tool": tool_name, "rule": rule, "text": match.group(), "weight": weight})
+        
+        best = None
+        for tool_name in self._tools:
+            if scores[tool_name] > 0 and (best is None or scores[tool_name] > scores[best]):
+                best = tool_name
+        if best is None:
+            best = self.default_tool or (self._tools[0] if self._tools else None)
+        
+        return {"tool": best, "scores": scores, "matches": matches}
@@ -0,0 +1,205 @@
+"""
+Semantic Router
+Routes tasks by similarity of hashed character n-gram embeddings
+"""
+
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from .base_router import BaseRouter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class SemanticRouter(BaseRouter):
+    """
+    Router comparing task embeddings with per-tool prototype vectors
+    
+    Text is embedded by hashing its character n-grams and words into a
+    fixed number of signed buckets, so no model or vocabulary is needed.
+    Each tool's prototype is the normalized sum of the embeddings of its
+    ``routing_examples`` and weighted ``routing_keywords``; a task is
+    routed to the tool with the highest cosine similarity.
+    """
+    
+    def __init__(self, default_tool: Optional[str] = None, dim: int = 1024,
+                 ngram_range: Tuple[int, int] = (3, 5), min_score: float = 0.1,
+                 cache_size: int = 16384):
+        """
+        Initialize an empty router
+        
+        Args:
+            default_tool: Tool chosen when no tool scores at least ``min_score``
+                (defaults to the first tool added)
+            dim: Number of hash buckets per embedding
+            ngram_range: Smallest and largest character n-gram length
+            min_score: Minimum cosine similarity for a tool to be chosen
+            cache_size: Maximum number of task embeddings kept in memory
+                (each takes ``dim`` * 4 bytes)
+        
+        Raises:
+            ImportError: If numpy is not installed
+        """
+        if np is None:
+            raise ImportError("Semantic routing requires numpy (pip install numpy)")
+        
+        self.default_tool = default_tool
+        self.dim = dim
+        self.ngram_range = ngram_range
+        self.min_score = min_score
+        self.cache_size = cache_size
+        # (text, weight) pairs describing each tool, in registration order
+        self._examples: Dict[str, List[Tuple[str, float]]] = {}
+        self._prototypes: Optional["np.ndarray"] = None
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def add_tool(self, tool: Any):
+        """
+        Add the examples and keywords a tool declares
+        
+        Args:
+            tool: Tool instance
+        """
+        examples = [(example, 1.0) for example in getattr(tool, "routing_examples", [])]
+        examples += list(getattr(tool, "routing_keywords", {}).items())
+        self.add_examples(tool.name, examples)
+    
+    def add_examples(self, tool_name: str, examples: List[Tuple[str, float]]):
+        """
+        Set the texts describing a tool
+        
+        Args:
+            tool_name: Tool name
+            examples: (example task or keyword, weight) pairs
+        """
+        self.remove_tool(tool_name)
+        self._examples[tool_name] = list(examples)
+        self._prototypes = None
+    
+    def remove_tool(self, tool_name: str):
+        """
+        Forget a tool
+        
+        Args:
+            tool_name: Tool name
+        """
+        if self._examples.pop(tool_name, None) is not None:
+            self._prototypes = None
+    
+    def _embed_text(self, text: str) -> "np.ndarray":
+        """Hash the n-grams and words of a text into a unit vector"""
+        words = text.lower().split()
+        padded = f" {' '.join(words)} "
+        low, high = self.ngram_range
+        features = [padded[i:i + n] for n in range(low, high + 1) for i in range(len(padded) - n + 1)]
+        features += words
+        
+        hashes = np.fromiter(
+            (zlib.crc32(feature.encode("utf-8")) for feature in features),
+            dtype=np.uint32, count=len(features)
+        )
+        # The top bit picks the sign so colliding features tend to cancel out
+        signs = 1.0 - 2.0 * (hashes >> 31)
+        vector = np.bincount(hashes % self.dim, weights=signs, minlength=self.dim).astype(np.float32)
+        
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+    
+    def embed(self, text: str) -> "np.ndarray":
+        """
+        Get the embedding of a text, using the cache for repeated texts
+        
+        Args:
+            text: Text to embed
+        
+        Returns:
+            Unit vector of length ``dim``
+        """
+        with self._lock:
+            vector = self._cache.get(text)
+            if vector is not None:
+                self._cache.move_to_end(text)
+                return vector
+        
+        vector = self._embed_text(text)
+        with self._lock:
+            self._cache[text] = vector
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return vector
+    
+    def _get_prototypes(self) -> Tuple[List[str], "np.ndarray"]:
+        """Get tool names and the matching (tools x dim) prototype matrix"""
+        tools = list(self._examples)
+        prototypes = self._prototypes
+        if prototypes is None:
+            prototypes = np.zeros((len(tools), self.dim), dtype=np.float32)
+            for row, tool_name in enumerate(tools):
+                for text, weight in self._examples[tool_name]:
+                    prototypes[row] += weight * self._embed_text(text)
+                norm = np.linalg.norm(prototypes[row])
+                if norm:
+                    prototypes[row] /= norm
+            self._prototypes = prototypes
+        return tools, prototypes
+    
+    def _fallback(self, tools: List[str]) -> Optional[str]:
+        """Tool chosen when nothing scores high enough"""
+        return self.default_tool or (tools[0] if tools else None)
+    
+    def explain(self, task: str) -> Dict[str, Any]:
+        """
+        Score every tool against a task
+        
+        Args:
+            task: Task description
+        
+        Returns:
+            Dictionary with the chosen tool and the cosine similarity of
+            the task to each tool
+        """
+        tools, prototypes = self._get_prototypes()
+        similarities = prototypes @ self.embed(task)
+        scores = {tool_name: float(score) for tool_name, score in zip(tools, similarities)}
+        
+        best = None
+        if tools:
+            index = int(np.argmax(similarities))
+            if similarities[index] >= self.min_score:
+                best = tools[index]
+        
+        return {"tool": best or self._fallback(tools), "scores": scores}
+    
+    def route_batch(self, tasks: List[str]) -> List[Optional[str]]:
+        """
+        Pick a tool for each of many tasks with one matrix multiply
+        
+        Repeated tasks are embedded and scored once.
+        
+        Args:
+            tasks: Task descriptions
+        
+        Returns:
+            Tool names in the order of ``tasks``
+        """
+        tools, prototypes = self._get_prototypes()
+        if not tools or not tasks:
+            return [self._fallback(tools)] * len(tasks)
+        
+        rows: Dict[str, int] = {}
+        for task in tasks:
+            rows.setdefault(task, len(rows))
+        
+        embeddings = np.stack([self.embed(task) for task in rows])
+        similarities = embeddings @ prototypes.T
+        best = similarities.argmax(axis=1)
+        confident = similarities[np.arange(len(rows)), best] >= self.min_score
+        
+        fallback = self._fallback(tools)
+        choices = [tools[i] if ok else fallback for i, ok in zip(best.tolist(), confident.tolist())]
+        return [choices[rows[task]] for task in tasks]
@@ -0,0 +1,10 @@
+"""
+Search package
+Local full-text search engine used by the search tool
+"""
+
+from .tokenizer import Tokenizer
+from .index import BaseIndex, InvertedIndex
+from .disk_index import DiskIndex, write_index
+
+__all__ = ["Tokenizer", "BaseIndex", "InvertedIndex", "DiskIndex", "write_index"]
@@ -0,0 +1,105 @@
+"""
+Aho-Corasick Matcher
+Finds every occurrence of many patterns in a single pass over the text
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Tuple
+
+
+class AhoCorasick:
+    """Compiled multi-pattern substring matcher"""
+    
+    def __init__(self, patterns: Iterable[str]):
+        """
+        Compile the automaton
+        
+        Args:
+            patterns: Patterns to match; empty and duplicate patterns are ignored
+        """
+        self.patterns: List[str] = []
+        # Per state: character transitions, failure link, indexes of patterns ending here
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        
+        seen = set()
+        for pattern in patterns:
+            if pattern and pattern not in seen:
+                seen.add(pattern)
+                self._add(pattern)
+        self._build_failure_links()
+    
+    def _add(self, pattern: str):
+        """Insert a pattern into the trie"""
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+                self._goto[state][char] = next_state
+            state = next_state
+        self._out[state] += (len(self.patterns),)
+        self.patterns.append(pattern)
+    
+    def _build_failure_links(self):
+        """Link every state to its longest proper suffix state (breadth-first)"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._out[next_state] += self._out[self._fail[next_state]]
+    
+    def __len__(self) -> int:
+        return len(self.patterns)
+    
+    def find_all(self, text: str) -> List[Tuple[int, str]]:
+        """
+        Find every pattern occurrence, including overlapping ones
+        
+        Args:
+            text: Text to scan
+        
+        Returns:
+            List of (start position, pattern) pairs in order of match end
+        """
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self.patterns
+        matches = []
+        state = 0
+        
+        for pos, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in out[state]:
+                pattern = patterns[index]
+                matches.append((pos - len(pattern) + 1, pattern))
+        
+        return matches
+    
+    def match(self, text: str) -> List[str]:
+        """
+        Find the distinct patterns occurring in a text, most specific first
+        
+        Longer patterns rank first; patterns of equal length rank by their
+        first position in the text.
+        
+        Args:
+            text: Text to scan
+        
+        Returns:
+            Matching patterns
+        """
+        first_seen: Dict[str, int] = {}
+        for start, pattern in self.find_all(text):
+            if pattern not in first_seen or start < first_seen[pattern]:
+                first_seen[pattern] = start
+        return sorted(first_seen, key=lambda p: (-len(p), first_seen[p]))
@@ -0,0 +1,284 @@
+"""
+Disk Index
+Versioned on-disk index format read through mmap
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Optional, Sequence, Tuple
+from .index import BaseIndex, InvertedIndex
+from .tokenizer import Tokenizer
+
+
+MAGIC = b"CDVINDEX"
+FORMAT_VERSION = 1
+
+# magic, version, num_docs, num_terms, avg_doc_length, then the byte offset
+# of each section. All integers, in the header and in the sections, are
+# little-endian; big-endian hosts swap bytes when writing and copy the
+# sections into swapped arrays when reading, instead of mapping them
+_HEADER = struct.Struct("<8sIIQd9Q")
+_NATIVE_LITTLE_ENDIAN = sys.byteorder == "little"
+
+_SECTIONS = (
+    "metadata",
+    "term_offsets",
+    "terms",
+    "posting_offsets",
+    "posting_ids",
+    "posting_freqs",
+    "doc_lengths",
+    "doc_offsets",
+    "docs",
+)
+
+
+def _pad(f) -> int:
+    """Pad a file to an 8-byte boundary and return the new position"""
+    pos = f.tell()
+    if pos % 8:
+        f.write(b"\0" * (8 - pos % 8))
+    return f.tell()
+
+
+def _le_bytes(values: array) -> bytes:
+    """Serialize an integer array in little-endian byte order"""
+    if not _NATIVE_LITTLE_ENDIAN:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def write_index(index: InvertedIndex, path: str):
+    """
+    Write an in-memory index to disk
+    
+    The layout is a fixed header followed by sections holding the sorted
+    term dictionary, posting lists and document texts as flat arrays, so a
+    reader can map the file and use it without parsing. The file is
+    written to a temporary path and renamed into place.
+    
+    Args:
+        index: Index to write
+        path: Output file path
+    """
+    terms = sorted(index.terms)
+    term_offsets = array("Q", [0])
+    posting_offsets = array("Q", [0])
+    doc_offsets = array("Q", [0])
+    metadata = json.dumps({
+        "stopwords": sorted(index.tokenizer.stopwords),
+        "query_stopwords": sorted(index.tokenizer.query_stopwords - index.tokenizer.stopwords),
+    }).encode("utf-8")
+    
+    tmp_path = path + ".tmp"
+    offsets = {}
+    
+    with open(tmp_path, "wb") as f:
+        f.write(b"\0" * _HEADER.size)
+        
+        offsets["metadata"] = _pad(f)
+        f.write(struct.pack("<Q", len(metadata)))
+        f.write(metadata)
+        
+        encoded_terms = [term.encode("utf-8") for term in terms]
+        for term in encoded_terms:
+            term_offsets.append(term_offsets[-1] + len(term))
+        offsets["term_offsets"] = _pad(f)
+        f.write(_le_bytes(term_offsets))
+        offsets["terms"] = _pad(f)
+        f.write(b"".join(encoded_terms))
+        
+        for term in terms:
+            posting_offsets.append(posting_offsets[-1] + len(index.postings(term)[0]))
+        offsets["posting_offsets"] = _pad(f)
+        f.write(_le_bytes(posting_offsets))
+        offsets["posting_ids"] = _pad(f)
+        for term in terms:
+            f.write(_le_bytes(index.postings(term)[0]))
+        offsets["posting_freqs"] = _pad(f)
+        for term in terms:
+            f.write(_le_bytes(index.postings(term)[1]))
+        
+        offsets["doc_lengths"] = _pad(f)
+        f.write(_le_bytes(array("I", index.doc_lengths())))
+        
+        encoded_docs = [doc.encode("utf-8") for doc in index.documents]
+        for doc in encoded_docs:
+            doc_offsets.append(doc_offsets[-1] + len(doc))
+        offsets["doc_offsets"] = _pad(f)
+        f.write(_le_bytes(doc_offsets))
+        offsets["docs"] = _pad(f)
+        for doc in encoded_docs:
+            f.write(doc)
+        
+        f.seek(0)
+        f.write(_HEADER.pack(
+            MAGIC, FORMAT_VERSION, index.num_docs, len(terms), index.avg_doc_length,
+            *(offsets[name] for name in _SECTIONS)
+        ))
+    
+    os.replace(tmp_path, path)
+
+
+class DiskIndex(BaseIndex):
+    """Read-only index backed by a memory-mapped file"""
+    
+    def __init__(self, path: str):
+        """
+        Open an index file written by write_index
+        
+        Opening reads the header and document lengths; term lookups and
+        document reads go straight to the mapped pages, which the OS shares
+        between every process that maps the same file. Posting lists are
+        returned as copies, so the index can be closed while they are in use.
+        
+        Args:
+            path: Index file path
+        
+        Raises:
+            ValueError: If the file is not an index, is truncated or has an
+                unsupported version
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._open()
+        except BaseException:
+            self.close()
+            raise
+    
+    def _open(self):
+        """Check the header and map the file"""
+        path = self.path
+        size = os.fstat(self._file.fileno()).st_size
+        if size < _HEADER.size:
+            raise ValueError(f"'{path}' is not a search index")
+        
+        magic, version, num_docs, num_terms, avg_doc_length, *section_offsets = \
+            _HEADER.unpack(self._file.read(_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"'{path}' is not a search index")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported search index version {version} in '{path}'")
+        if max(section_offsets) > size:
+            raise ValueError(f"Search index '{path}' is truncated")
+        
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        
+        self._num_docs = num_docs
+        self._num_terms = num_terms
+        self._avg_doc_length = avg_doc_length
+        sections = dict(zip(_SECTIONS, section_offsets))
+        
+        (metadata_length,) = struct.unpack_from("<Q", self._section(sections["metadata"], 8))
+        start = sections["metadata"] + 8
+        metadata = json.loads(bytes(self._section(start, metadata_length)).decode("utf-8"))
+        super().__init__(Tokenizer(metadata["stopwords"], metadata["query_stopwords"]))
+        
+        self._term_offsets = self._array(sections["term_offsets"], num_terms + 1, "Q")
+        self._terms = self._section(sections["terms"], self._term_offsets[num_terms])
+        self._posting_offsets = self._array(sections["posting_offsets"], num_terms + 1, "Q")
+        total_postings = self._posting_offsets[num_terms]
+        self._posting_ids = self._array(sections["posting_ids"], total_postings, "I")
+        self._posting_freqs = self._array(sections["posting_freqs"], total_postings, "I")
+        # Read by every search, so kept in memory rather than handed out as a view
+        with self._array(sections["doc_lengths"], num_docs, "I") as lengths:
+            self._doc_lengths = self._copy(lengths, 0, num_docs)
+        self._doc_offsets = self._array(sections["doc_offsets"], num_docs + 1, "Q")
+        self._docs = self._section(sections["docs"], self._doc_offsets[num_docs])
+    
+    def _section(self, offset: int, length: int) -> memoryview:
+        """View a byte range of the mapped file"""
+        if offset + length > len(self._mmap):
+            raise ValueError(f"Search index '{self.path}' is truncated")
+        return self._view[offset:offset + length]
+    
+    def _array(self, offset: int, count: int, typecode: str) -> memoryview:
+        """View a section of the mapped file as an array of integers"""
+        section = self._section(offset, count * struct.calcsize(typecode))
+        if _NATIVE_LITTLE_ENDIAN:
+            return section.cast(typecode)
+        # The file is little-endian, so this host needs swapped copies
+        values = array(typecode)
+        values.frombytes(section)
+        section.release()
+        values.byteswap()
+        return memoryview(values)
+    
+    @staticmethod
+    def _copy(view: memoryview, start: int, end: int) -> array:
+        """Copy part of an array view, so callers don't hold on to the map"""
+        values = array(view.format)
+        with view[start:end] as part, part.cast("B") as raw:
+            values.frombytes(raw)
+        return values
+    
+    @property
+    def num_docs(self) -> int:
+        """Number of indexed documents"""
+        return self._num_docs
+    
+    @property
+    def avg_doc_length(self) -> float:
+        """Average document length in terms"""
+        return self._avg_doc_length
+    
+    def _term(self, i: int) -> bytes:
+        """Get the i-th term of the sorted term dictionary"""
+        return bytes(self._terms[self._term_offsets[i]:self._term_offsets[i + 1]])
+    
+    def _find_term(self, term: str) -> Optional[int]:
+        """Binary search the term dictionary"""
+        key = term.encode("utf-8")
+        lo, hi = 0, self._num_terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._num_terms and self._term(lo) == key:
+            return lo
+        return None
+    
+    def postings(self, term: str) -> Tuple[Sequence[int], Sequence[int]]:
+        """Get the posting list of a term"""
+        i = self._find_term(term)
+        if i is None:
+            return (), ()
+        start, end = self._posting_offsets[i], self._posting_offsets[i + 1]
+        return self._copy(self._posting_ids, start, end), self._copy(self._posting_freqs, start, end)
+    
+    def doc_lengths(self) -> Sequence[int]:
+        """Document lengths in terms, indexed by document ID"""
+        return self._doc_lengths
+    
+    def document(self, doc_id: int) -> str:
+        """Get the text of a document"""
+        start, end = self._doc_offsets[doc_id], self._doc_offsets[doc_id + 1]
+        return bytes(self._docs[start:end]).decode("utf-8")
+    
+    def close(self):
+        """Unmap the index file"""
+        # Views into the map must be released before it can be closed
+        for name in ("_term_offsets", "_terms", "_posting_offsets", "_posting_ids",
+                     "_posting_freqs", "_doc_offsets", "_docs", "_view"):
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+        mapped = self.__dict__.pop("_mmap", None)
+        if mapped is not None:
+            mapped.close()
+        self._file.close()
+    
+    def __enter__(self) -> "DiskIndex":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,235 @@
+"""
+Inverted Index
+BM25-ranked full-text index with incremental updates
+"""
+
+import heapq
+import json
+import math
+import os
+from abc import ABC, abstractmethod
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from .tokenizer import Tokenizer
+
+
+class BaseIndex(ABC):
+    """Abstract base class for searchable indexes"""
+    
+    # BM25 parameters
+    k1 = 1.5
+    b = 0.75
+    
+    def __init__(self, tokenizer: Optional[Tokenizer] = None):
+        """
+        Initialize base index
+        
+        Args:
+            tokenizer: Tokenizer used for documents and queries
+        """
+        self.tokenizer = tokenizer or Tokenizer()
+    
+    @property
+    @abstractmethod
+    def num_docs(self) -> int:
+        """Number of indexed documents"""
+        pass
+    
+    @property
+    @abstractmethod
+    def avg_doc_length(self) -> float:
+        """Average document length in terms"""
+        pass
+    
+    @abstractmethod
+    def postings(self, term: str) -> Tuple[Sequence[int], Sequence[int]]:
+        """
+        Get the posting list of a term
+        
+        Args:
+            term: Index term
+        
+        Returns:
+            Tuple of (document IDs, term frequencies), empty if unknown
+        """
+        pass
+    
+    @abstractmethod
+    def doc_lengths(self) -> Sequence[int]:
+        """Document lengths in terms, indexed by document ID"""
+        pass
+    
+    @abstractmethod
+    def document(self, doc_id: int) -> str:
+        """
+        Get the text of a document
+        
+        Args:
+            doc_id: Document ID
+        
+        Returns:
+            Document text
+        """
+        pass
+    
+    def search(self, query: str, top_k: int = 5) -> List[Tuple[int, float]]:
+        """
+        Rank documents against a query with BM25
+        
+        Args:
+            query: Search query
+            top_k: Maximum number of results
+        
+        Returns:
+            List of (document ID, score) pairs, best first
+        """
+        num_docs = self.num_docs
+        if num_docs == 0 or top_k <= 0:
+            return []
+        
+        k1 = self.k1
+        lengths = self.doc_lengths()
+        norm = k1 * self.b / (self.avg_doc_length or 1.0)
+        base = k1 * (1 - self.b)
+        scores: Dict[int, float] = {}
+        
+        for term in self.tokenizer.tokenize_query(query):
+            doc_ids, freqs = self.postings(term)
+            if not doc_ids:
+                continue
+            
+            df = len(doc_ids)
+            idf = math.log(1 + (num_docs - df + 0.5) / (df + 0.5))
+            weight = idf * (k1 + 1)
+            get = scores.get
+            
+            for doc_id, tf in zip(doc_ids, freqs):
+                scores[doc_id] = get(doc_id, 0.0) + weight * tf / (tf + base + norm * lengths[doc_id])
+        
+        # Ties are broken by document ID so results are reproducible
+        return heapq.nlargest(top_k, scores.items(), key=lambda item: (item[1], -item[0]))
+
+
+class InvertedIndex(BaseIndex):
+    """In-memory inverted index that grows as documents are added"""
+    
+    def __init__(self, tokenizer: Optional[Tokenizer] = None):
+        """
+        Initialize an empty index
+        
+        Args:
+            tokenizer: Tokenizer used for documents and queries
+        """
+        super().__init__(tokenizer)
+        self.documents: List[str] = []
+        self._lengths = array("I")
+        self._total_length = 0
+        # term -> (document IDs, term frequencies), both in ascending ID order
+        self._postings: Dict[str, Tuple[array, array]] = {}
+    
+    @property
+    def num_docs(self) -> int:
+        """Number of indexed documents"""
+        return len(self.documents)
+    
+    @property
+    def avg_doc_length(self) -> float:
+        """Average document length in terms"""
+        return self._total_length / len(self.documents) if self.documents else 0.0
+    
+    @property
+    def terms(self) -> List[str]:
+        """All indexed terms"""
+        return list(self._postings.keys())
+    
+    def postings(self, term: str) -> Tuple[Sequence[int], Sequence[int]]:
+        """Get the posting list of a term"""
+        return self._postings.get(term, ((), ()))
+    
+    def doc_lengths(self) -> Sequence[int]:
+        """Document lengths in terms, indexed by document ID"""
+        return self._lengths
+    
+    def document(self, doc_id: int) -> str:
+        """Get the text of a document"""
+        return self.documents[doc_id]
+    
+    def add_document(self, text: str) -> int:
+        """
+        Add a document to the index
+        
+        Args:
+            text: Document text
+        
+        Returns:
+            ID of the new document
+        """
+        doc_id = len(self.documents)
+        terms = self.tokenizer.tokenize(text)
+        
+        self.documents.append(text)
+        self._lengths.append(len(terms))
+        self._total_length += len(terms)
+        
+        for term, tf in Counter(terms).items():
+            entry = self._postings.get(term)
+            if entry is None:
+                entry = self._postings[term] = (array("I"), array("I"))
+            entry[0].append(doc_id)
+            entry[1].append(tf)
+        
+        return doc_id
+    
+    def add_documents(self, texts: Iterable[str]) -> int:
+        """
+        Add several documents to the index
+        
+        Args:
+            texts: Document texts
+        
+        Returns:
+            Number of documents added
+        """
+        count = 0
+        for text in texts:
+            self.add_document(text)
+            count += 1
+        return count
+    
+    def load_file(self, path: str) -> int:
+        """
+        Add the documents stored in a corpus file
+        
+        ``.jsonl`` files hold one JSON object per line with a "text" field;
+        any other file is read as plain text with one document per line.
+        
+        Args:
+            path: Corpus file path
+        
+        Returns:
+            Number of documents added
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            if path.endswith(".jsonl"):
+                texts = (json.loads(line)["text"] for line in f if line.strip())
+            else:
+                texts = (line.strip() for line in f if line.strip())
+            return self.add_documents(texts)
+    
+    def load_directory(self, path: str, extensions: Tuple[str, ...] = (".txt", ".jsonl")) -> int:
+        """
+        Add the documents of every corpus file in a directory
+        
+        Args:
+            path: Directory path
+            extensions: File extensions to load
+        
+        Returns:
+            Number of documents added
+        """
+        count = 0
+        for name in sorted(os.listdir(path)):
+            if name.endswith(extensions):
+                count += self.load_file(os.path.join(path, name))
+        return count
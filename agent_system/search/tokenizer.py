@@ -0,0 +1,66 @@
+"""
+Tokenizer
+Splits text into normalized index terms
+"""
+
+import re
+from typing import FrozenSet, Iterable, List, Optional
+
+
+# Common English words that carry no ranking signal
+STOPWORDS = frozenset([
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how",
+    "i", "in", "is", "it", "of", "on", "or", "that", "the", "this", "to",
+    "was", "what", "when", "where", "which", "who", "why", "with", "about",
+    "me", "my", "do", "does", "can",
+])
+
+# Words that describe the request rather than what is being searched for
+QUERY_STOPWORDS = frozenset(["search", "find", "lookup", "query", "look", "up", "information"])
+
+
+class Tokenizer:
+    """Lowercasing word tokenizer with stopword removal"""
+    
+    _word_re = re.compile(r"[a-z0-9]+")
+    
+    def __init__(self, stopwords: Optional[Iterable[str]] = None,
+                 query_stopwords: Optional[Iterable[str]] = None):
+        """
+        Initialize tokenizer
+        
+        Args:
+            stopwords: Words dropped from documents and queries
+            query_stopwords: Extra words dropped from queries only
+        """
+        self.stopwords: FrozenSet[str] = frozenset(STOPWORDS if stopwords is None else stopwords)
+        self.query_stopwords: FrozenSet[str] = self.stopwords | frozenset(
+            QUERY_STOPWORDS if query_stopwords is None else query_stopwords
+        )
+    
+    def tokenize(self, text: str) -> List[str]:
+        """
+        Tokenize document text
+        
+        Args:
+            text: Document text
+        
+        Returns:
+            List of terms in document order
+        """
+        stopwords = self.stopwords
+        return [t for t in self._word_re.findall(text.lower()) if t not in stopwords]
+    
+    def tokenize_query(self, query: str) -> List[str]:
+        """
+        Tokenize a search query, dropping duplicate terms
+        
+        Args:
+            query: Search query
+        
+        Returns:
+            Unique query terms in query order
+        """
+        stopwords = self.query_stopwords
+        terms = [t for t in self._word_re.findall(query.lower()) if t not in stopwords]
+        return list(dict.fromkeys(terms))
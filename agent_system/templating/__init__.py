@@ -0,0 +1,9 @@
+"""
+Templating package
+Precompiled code templates used by the code generator tool
+"""
+
+from .engine import Template
+from .library import TemplateLibrary, TemplatePack, BUILTIN_PACKS_DIR
+
+__all__ = ["Template", "TemplateLibrary", "TemplatePack", "BUILTIN_PACKS_DIR"]
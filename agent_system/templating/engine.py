@@ -0,0 +1,65 @@
+"""
+Template Engine
+Compiles str.format-style templates into render functions
+"""
+
+from string import Formatter
+from typing import Any, Callable, Dict, List, Tuple
+
+
+class Template:
+    """Template parsed once and compiled into a Python render function"""
+    
+    def __init__(self, source: str, name: str = "<template>"):
+        """
+        Parse and compile a template
+        
+        Templates use str.format syntax limited to plain ``{field}``
+        placeholders; ``{{`` and ``}}`` produce literal braces.
+        
+        Args:
+            source: Template source
+            name: Template name used in error messages
+        
+        Raises:
+            ValueError: If the template uses unsupported format syntax
+        """
+        self.name = name
+        self.source = source
+        self.fields: Tuple[str, ...] = ()
+        self._render = self._compile(source)
+    
+    def _compile(self, source: str) -> Callable[[Dict[str, Any]], str]:
+        """Build a render function that concatenates literals and fields"""
+        parts: List[str] = []
+        fields: List[str] = []
+        
+        for literal, field, spec, conversion in Formatter().parse(source):
+            if literal:
+                parts.append(repr(literal))
+            if field is None:
+                continue
+            if not field.isidentifier() or spec or conversion:
+                raise ValueError(f"Unsupported placeholder '{{{field}}}' in template {self.name}")
+            parts.append(f"str(p[{field!r}])")
+            if field not in fields:
+                fields.append(field)
+        
+        self.fields = tuple(fields)
+        code = f"lambda p: ''.join(({', '.join(parts)},))" if parts else "lambda p: ''"
+        return eval(compile(code, self.name, "eval"), {"__builtins__": {"str": str}})
+    
+    def render(self, params: Dict[str, Any]) -> str:
+        """
+        Render the template
+        
+        Args:
+            params: Placeholder values
+        
+        Returns:
+            Rendered text
+        
+        Raises:
+            KeyError: If a placeholder has no value
+        """
+        return self._render(params)
@@ -0,0 +1,186 @@
+"""
+Template Library
+Loads template packs from disk and renders them through a bounded cache
+"""
+
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .engine import Template
+
+
+BUILTIN_PACKS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "packs")
+
+
+class TemplatePack:
+    """Templates and selection rules for one language"""
+    
+    def __init__(self, directory: str):
+        """
+        Load a pack directory
+        
+        A pack holds a ``pack.json`` manifest and one ``<kind>.tmpl`` file
+        per kind listed in the manifest.
+        
+        Args:
+            directory: Pack directory
+        """
+        with open(os.path.join(directory, "pack.json"), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        
+        self.language: str = manifest["language"]
+        # Words or phrases naming the language, such as "golang" or "in go"
+        self.aliases: List[str] = manifest.get("aliases", [self.language])
+        # (kind, keywords, default params) in matching order
+        self.kinds: List[Tuple[str, List[str], Dict[str, str]]] = []
+        # Kind -> pattern matching its keywords as whole words (or plurals)
+        self._keyword_res: Dict[str, "re.Pattern[str]"] = {}
+        self.templates: Dict[str, Template] = {}
+        self.fallback: Tuple[str, Dict[str, str]] = (
+            manifest["fallback"]["kind"], manifest["fallback"].get("params", {})
+        )
+        
+        for entry in manifest["kinds"]:
+            kind = entry["kind"]
+            keywords = entry.get("keywords", [kind])
+            self.kinds.append((kind, keywords, entry.get("params", {})))
+            self._keyword_res[kind] = re.compile(
+                r"\b(?:%s)(?:e?s)?\b" % "|".join(re.escape(keyword) for keyword in keywords)
+            )
+            path = os.path.join(directory, f"{kind}.tmpl")
+            with open(path, "r", encoding="utf-8") as f:
+                self.templates[kind] = Template(f.read(), name=path)
+    
+    def select(self, task_lower: str) -> Tuple[str, Dict[str, str]]:
+        """
+        Pick the template kind for a task
+        
+        Keywords match whole words, so "type" selects a kind for "a Go
+        type" but not for "a prototype".
+        
+        Args:
+            task_lower: Lowercased task description
+        
+        Returns:
+            Tuple of (kind, default params)
+        """
+        for kind, keywords, params in self.kinds:
+            if self._keyword_res[kind].search(task_lower):
+                return kind, params
+        return self.fallback
+
+
+class TemplateLibrary:
+    """Collection of template packs keyed by language"""
+    
+    _word_re = re.compile(r"[a-z0-9+#]+")
+    
+    def __init__(self, directories: Optional[Iterable[str]] = None,
+                 default_language: str = "python", cache_size: int = 4096):
+        """
+        Load every pack found in the given directories
+        
+        Packs in later directories replace packs of the same language.
+        
+        Args:
+            directories: Directories containing pack subdirectories
+                (defaults to the built-in packs)
+            default_language: Language used when a task names none
+            cache_size: Maximum number of rendered outputs kept
+        """
+        self.packs: Dict[str, TemplatePack] = {}
+        self.default_language = default_language
+        self.cache_size = cache_size
+        # Alias (words joined by single spaces) -> language
+        self._aliases: Dict[str, str] = {}
+        # Most words in any alias
+        self._alias_words = 1
+        self._cache: "OrderedDict[Tuple[str, str, Tuple[Tuple[str, str], ...]], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        
+        for directory in directories or [BUILTIN_PACKS_DIR]:
+            self.load_directory(directory)
+    
+    def load_directory(self, directory: str):
+        """
+        Load the packs stored in a directory
+        
+        Args:
+            directory: Directory containing pack subdirectories
+        """
+        for name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, name)
+            if os.path.isfile(os.path.join(path, "pack.json")):
+                self.add_pack(TemplatePack(path))
+    
+    def add_pack(self, pack: TemplatePack):
+        """
+        Register a template pack
+        
+        Args:
+            pack: Template pack
+        """
+        self.packs[pack.language] = pack
+        for alias in pack.aliases:
+            words = self._word_re.findall(alias.lower())
+            self._aliases[" ".join(words)] = pack.language
+            self._alias_words = max(self._alias_words, len(words))
+        with self._lock:
+            self._cache.clear()
+    
+    def detect_language(self, task_lower: str) -> str:
+        """
+        Find the first language named in a task
+        
+        Aliases of several words, such as "in go", match consecutive
+        words of the task, so languages named by common words aren't
+        picked up from ordinary text.
+        
+        Args:
+            task_lower: Lowercased task description
+        
+        Returns:
+            Language name
+        """
+        words = self._word_re.findall(task_lower)
+        for i in range(len(words)):
+            for n in range(1, min(self._alias_words, len(words) - i) + 1):
+                language = self._aliases.get(" ".join(words[i:i + n]))
+                if language is not None:
+                    return language
+        return self.default_language
+    
+    def render(self, language: str, kind: str, params: Dict[str, Any]) -> str:
+        """
+        Render a template, reusing the output of identical earlier calls
+        
+        Args:
+            language: Pack language
+            kind: Template kind
+            params: Placeholder values
+        
+        Returns:
+            Rendered code
+        
+        Raises:
+            KeyError: If the language or kind is unknown
+        """
+        key = (language, kind, tuple(sorted((k, str(v)) for k, v in params.items())))
+        
+        with self._lock:
+            code = self._cache.get(key)
+            if code is not None:
+                self._cache.move_to_end(key)
+                return code
+        
+        code = self.packs[language].templates[kind].render(params)
+        
+        with self._lock:
+            self._cache[key] = code
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        
+        return code
@@ -3,23 +3,71 @@ Tool Registry
 Manages and provides access to all available tools
 """
 
-from typing import Dict, List
-from .tools import BaseTool, SearchTool, CodeGeneratorTool, DocsTool
+import functools
+import glob
+import logging
+import os
+from importlib import metadata
+from typing import Dict, List, Optional, Tuple
+from .tools import BaseTool, ToolSpec, BUILTIN_TOOLS
+from .routing import BaseRouter, KeywordRouter
+
+
+logger = logging.getLogger(__name__)
+
+# Entry point group under which installed packages register tools
+ENTRY_POINT_GROUP = "codev.tools"
+
+
+@functools.lru_cache(maxsize=None)
+def _tool_entry_points() -> Tuple[metadata.EntryPoint, ...]:
+    """Installed tool entry points; scanning packages is slow, so once per process"""
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, "select"):
+        return tuple(entry_points.select(group=ENTRY_POINT_GROUP))
+    # Python < 3.10
+    return tuple(entry_points.get(ENTRY_POINT_GROUP, ()))
 
 
 class ToolRegistry:
-    """Registry for managing agent tools"""
+    """
+    Registry for managing agent tools
     
-    def __init__(self):
-        """Initialize tool registry with default tools"""
-        self.tools: Dict[str, BaseTool] = {}
+    Tools are registered as specs: their names, descriptions and routing
+    rules are known up front, but each tool is imported and built only
+    when ``get_tool`` first asks for it. Besides the built-in tools,
+    specs come from installed packages' "codev.tools" entry points and
+    from JSON manifests in plugin directories; later registrations
+    replace earlier ones of the same name.
+    """
+    
+    def __init__(self, router: Optional[BaseRouter] = None, plugin_dirs: Optional[List[str]] = None,
+                 entry_points: bool = True):
+        """
+        Initialize tool registry with default tools
+        
+        Args:
+            router: Router choosing tools for tasks (defaults to keyword routing)
+            plugin_dirs: Directories of tool manifests (defaults to the
+                CODEV_PLUGIN_DIRS environment variable, separated like PATH)
+            entry_points: Whether to register tools of installed packages
+        """
+        self.specs: Dict[str, ToolSpec] = {}
+        self.router = router if router is not None else KeywordRouter(default_tool="search")
         self._register_default_tools()
+        
+        if entry_points:
+            self.load_entry_points()
+        if plugin_dirs is None:
+            plugin_dirs = [path for path in os.environ.get("CODEV_PLUGIN_DIRS", "").split(os.pathsep) if path]
+        for plugin_dir in plugin_dirs:
+            self.load_plugin_dir(plugin_dir)
     
     def _register_default_tools(self):
         """Register default tools"""
-        self.register_tool(SearchTool())
-        self.register_tool(CodeGeneratorTool())
-        self.register_tool(DocsTool())
+        for spec in BUILTIN_TOOLS.values():
+            # Each registry builds its own instances
+            self.register_spec(spec.copy())
     
     def register_tool(self, tool: BaseTool):
         """
@@ -28,11 +76,71 @@ class ToolRegistry:
         Args:
             tool: Tool instance to register
         """
-        self.tools[tool.name] = tool
+        self.register_spec(ToolSpec.from_tool(tool))
+    
+    def register_spec(self, spec: ToolSpec):
+        """
+        Register a tool without loading it
+        
+        Args:
+            spec: Tool spec
+        """
+        self.specs[spec.name] = spec
+        self.router.add_tool(spec)
+    
+    def load_entry_points(self):
+        """
+        Register the tools of installed packages
+        
+        Packages declare tools in the "codev.tools" entry point group.
+        An entry point should name a manifest (a ToolSpec or a manifest
+        dictionary) kept in a module that doesn't import the tool. An entry
+        point naming the tool class itself also works, but the tool is then
+        built right away, since its metadata is only known once it exists.
+        Broken entry points are logged and skipped.
+        """
+        for entry_point in _tool_entry_points():
+            try:
+                target = entry_point.load()
+                if isinstance(target, ToolSpec):
+                    spec = target.copy()
+                elif isinstance(target, dict):
+                    spec = ToolSpec.from_manifest(target)
+                else:
+                    spec = ToolSpec.from_tool(target())
+                self.register_spec(spec)
+            except Exception as e:
+                logger.warning(f"Skipping tool entry point '{entry_point.name}': {e}")
+    
+    def load_plugin_dir(self, path: str):
+        """
+        Register the tools described by the manifests in a directory
+        
+        Every ``*.json`` file in the directory holds one tool manifest, a
+        list of them, or an object with a "tools" list (see
+        ``ToolSpec.from_manifest``). Tool modules may sit next to the
+        manifests; the directory is put on the module search path when one
+        of its tools is loaded. Broken manifests are logged and skipped.
+        
+        Args:
+            path: Plugin directory
+        """
+        for manifest in sorted(glob.glob(os.path.join(path, "*.json"))):
+            try:
+                specs = ToolSpec.load_manifest(manifest, path=os.path.abspath(path))
+            except (OSError, ValueError, TypeError) as e:
+                logger.warning(f"Skipping tool manifest {manifest}: {e}")
+                continue
+            for spec in specs:
+                try:
+                    self.register_spec(spec)
+                except Exception as e:
+                    # The router rejected the tool's rules
+                    logger.warning(f"Skipping tool '{spec.name}' from {manifest}: {e}")
     
     def get_tool(self, name: str) -> BaseTool:
         """
-        Get tool by name
+        Get tool by name, loading it on first use
         
         Args:
             name: Tool name
@@ -43,9 +151,24 @@ class ToolRegistry:
         Raises:
             KeyError: If tool not found
         """
-        if name not in self.tools:
+        return self.get_spec(name).load()
+    
+    def get_spec(self, name: str) -> ToolSpec:
+        """
+        Get the spec of a tool without loading it
+        
+        Args:
+            name: Tool name
+        
+        Returns:
+            Tool spec
+        
+        Raises:
+            KeyError: If tool not found
+        """
+        if name not in self.specs:
             raise KeyError(f"Tool '{name}' not found")
-        return self.tools[name]
+        return self.specs[name]
     
     def has_tool(self, name: str) -> bool:
         """
@@ -57,7 +180,7 @@ class ToolRegistry:
         Returns:
             True if tool exists, False otherwise
         """
-        return name in self.tools
+        return name in self.specs
     
     def list_tools(self) -> List[str]:
         """
@@ -66,13 +189,20 @@ class ToolRegistry:
         Returns:
             List of tool names
         """
-        return list(self.tools.keys())
+        return list(self.specs.keys())
+    
+    @property
+    def tools(self) -> Dict[str, BaseTool]:
+        """Every registered tool, loading those not loaded yet"""
+        return self.get_all_tools()
     
     def get_all_tools(self) -> Dict[str, BaseTool]:
         """
         Get all registered tools
         
+        Loads every tool that hasn't been loaded yet.
+        
         Returns:
             Dictionary of all tools
         """
-        return self.tools.copy()
+        return {name: spec.load() for name, spec in self.specs.items()}
@@ -3,9 +3,35 @@ Tools package
 Contains all available tools for the agent
 """
 
+import importlib
 from .base_tool import BaseTool
-from .search_tool import SearchTool
-from .code_generator import CodeGeneratorTool
-from .docs_tool import DocsTool
+from .cancellation import CancellationToken, TaskCancelled, TaskTimeout
+from .spec import ToolSpec
+from .builtin import BUILTIN_TOOLS
 
-__all__ = ["BaseTool", "SearchTool", "CodeGeneratorTool", "DocsTool"]
+# Tool classes are imported on first access, so loading the package (and
+# with it the registry) doesn't import every tool's dependencies
+_LAZY_TOOLS = {
+    "SearchTool": ".search_tool",
+    "CodeGeneratorTool": ".code_generator",
+    "DocsTool": ".docs_tool"
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_TOOLS:
+        return getattr(importlib.import_module(_LAZY_TOOLS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    "BaseTool",
+    "CancellationToken",
+    "TaskCancelled",
+    "TaskTimeout",
+    "ToolSpec",
+    "BUILTIN_TOOLS",
+    "SearchTool",
+    "CodeGeneratorTool",
+    "DocsTool"
+]
@@ -3,8 +3,10 @@ Base Tool Class
 Abstract base class for all tools
 """
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Dict, Generator, List, Optional
+from .cancellation import CancellationToken
 
 
 class BaseTool(ABC):
@@ -21,6 +23,24 @@ class BaseTool(ABC):
         self.name = name
         self.description = description
         self.version = "1.0.0"
+        # Maximum number of concurrent executions per agent (None = unbounded);
+        # threads and async tasks are limited separately
+        self.max_concurrency: Optional[int] = None
+        # Whether results may be served from the agent's result cache
+        self.cacheable = True
+        # Whether concurrent identical tasks may share one execution; turn
+        # off for tools with side effects that must happen per call
+        self.coalesce = True
+        # Seconds one execution may take before it is abandoned (None = unlimited)
+        self.timeout: Optional[float] = None
+        # Whether execute() takes a ``token`` keyword argument (a
+        # CancellationToken) and stops early when it is cancelled
+        self.supports_cancellation = False
+        # Routing rules: case-insensitive words / regexes mapped to weights
+        self.routing_keywords: Dict[str, float] = {}
+        self.routing_patterns: Dict[str, float] = {}
+        # Example tasks describing the tool, used by the semantic router
+        self.routing_examples: List[str] = []
     
     @abstractmethod
     def execute(self, task: str) -> Any:
@@ -35,6 +55,56 @@ class BaseTool(ABC):
         """
         pass
     
+    def invoke(self, task: str, token: Optional[CancellationToken] = None) -> Any:
+        """
+        Execute the tool, passing the cancellation token if it accepts one
+        
+        Args:
+            task: Task description
+            token: Cancellation token (optional)
+        
+        Returns:
+            Tool execution result
+        """
+        if token is not None and self.supports_cancellation:
+            return self.execute(task, token=token)
+        return self.execute(task)
+    
+    async def aexecute(self, task: str, token: Optional[CancellationToken] = None) -> Any:
+        """
+        Execute the tool asynchronously
+        
+        The default implementation runs ``execute`` in the event loop's
+        default executor. Tools backed by async I/O should override this.
+        
+        Args:
+            task: Task description
+            token: Cancellation token (optional)
+        
+        Returns:
+            Tool execution result
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.invoke, task, token)
+    
+    def stream(self, task: str) -> Generator[Any, None, Any]:
+        """
+        Execute the tool, yielding output chunks as they are produced
+        
+        The generator's return value is the complete result, the same value
+        ``execute`` returns. The default implementation yields nothing;
+        tools that build long outputs should override this.
+        
+        Args:
+            task: Task description
+        
+        Returns:
+            Generator of output chunks
+        """
+        result = self.execute(task)
+        yield from ()
+        return result
+    
     def validate_input(self, task: str) -> bool:
         """
         Validate input task
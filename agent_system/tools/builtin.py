@@ -0,0 +1,65 @@
+"""
+Built-in Tools
+Manifest of the tools every agent starts with
+"""
+
+from typing import Dict
+from .spec import ToolSpec
+
+
+BUILTIN_TOOLS: Dict[str, ToolSpec] = {spec.name: spec for spec in (
+    ToolSpec(
+        "search", f"{__package__}.search_tool:SearchTool",
+        description="Search for information across various sources",
+        routing_keywords={
+            "search": 1.0,
+            "find": 1.0,
+            "lookup": 1.0,
+            "query": 1.0
+        },
+        routing_examples=[
+            "Search for Python tutorials",
+            "Find articles about machine learning",
+            "Look up information on web frameworks",
+            "Query results for async programming",
+            "Search the web for REST API best practices"
+        ]
+    ),
+    ToolSpec(
+        "code_generator", f"{__package__}.code_generator:CodeGeneratorTool",
+        description="Generate code snippets based on requirements",
+        routing_keywords={
+            "code": 1.0,
+            "generate": 1.0,
+            "create": 1.0,
+            "implement": 1.0,
+            "write": 1.0
+        },
+        routing_examples=[
+            "Generate a Python function",
+            "Create a class for a user model",
+            "Write code for a REST API endpoint",
+            "Implement a sorting function in JavaScript",
+            "Create an API handler in Go"
+        ]
+    ),
+    ToolSpec(
+        "docs", f"{__package__}.docs_tool:DocsTool",
+        description="Generate documentation and explanations",
+        routing_keywords={
+            "document": 1.0,
+            "documentation": 1.0,
+            "doc": 1.0,
+            "explain": 1.0,
+            "describe": 1.0,
+            "define": 1.0
+        },
+        routing_examples=[
+            "Explain Python decorators",
+            "Show the documentation for Flask",
+            "How do I use the docs for Docker?",
+            "Describe what JavaScript promises are",
+            "Define the Git rebase command"
+        ]
+    )
+)}
@@ -0,0 +1,122 @@
+"""
+Cancellation
+Tokens that let tools stop early when a task is cancelled or runs out of time
+"""
+
+import threading
+import time
+from typing import Optional
+
+
+class TaskCancelled(Exception):
+    """Raised when a task is cancelled before it finishes"""
+    pass
+
+
+class TaskTimeout(TaskCancelled):
+    """Raised when a task exceeds its time budget"""
+    pass
+
+
+class CancellationToken:
+    """
+    Cooperative cancellation signal with an optional deadline
+    
+    Tools that set ``supports_cancellation`` receive a token and should
+    call ``raise_if_cancelled`` (or check ``cancelled``) between units of
+    work, and use ``wait`` instead of ``time.sleep``.
+    """
+    
+    def __init__(self, timeout: Optional[float] = None):
+        """
+        Create a token
+        
+        Args:
+            timeout: Seconds from now until the token expires (None = no deadline)
+        """
+        self.timeout = timeout
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        self._event = threading.Event()
+        self._reason = "Task cancelled"
+        self._expired = False
+    
+    def cancel(self, reason: str = "Task cancelled"):
+        """
+        Signal cancellation
+        
+        Args:
+            reason: Message for the exception raised by ``raise_if_cancelled``
+        """
+        if not self._event.is_set():
+            self._reason = reason
+        self._event.set()
+    
+    def expire(self):
+        """Signal that the time budget ran out, even if the deadline clock disagrees"""
+        self._expired = True
+        self._event.set()
+    
+    @property
+    def expired(self) -> bool:
+        """Whether the deadline has passed"""
+        return self._expired or (self.deadline is not None and time.monotonic() >= self.deadline)
+    
+    @property
+    def cancelled(self) -> bool:
+        """Whether the task should stop, by cancellation or expiry"""
+        return self._event.is_set() or self.expired
+    
+    def remaining(self) -> Optional[float]:
+        """
+        Get the time left before the deadline
+        
+        Returns:
+            Seconds left (never negative), or None without a deadline
+        """
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+    
+    def exception(self) -> Optional[TaskCancelled]:
+        """
+        Get the exception describing why the task should stop
+        
+        Returns:
+            TaskTimeout if the deadline has passed, TaskCancelled if the
+            token was cancelled, otherwise None
+        """
+        if self.expired:
+            if self.timeout is None:
+                return TaskTimeout("Task timed out")
+            return TaskTimeout(f"Task exceeded its {self.timeout:g}s time budget")
+        if self._event.is_set():
+            return TaskCancelled(self._reason)
+        return None
+    
+    def raise_if_cancelled(self):
+        """
+        Raise if the task should stop
+        
+        Raises:
+            TaskTimeout: If the deadline has passed
+            TaskCancelled: If the token was cancelled
+        """
+        error = self.exception()
+        if error is not None:
+            raise error
+    
+    def wait(self, seconds: float) -> bool:
+        """
+        Sleep, waking early on cancellation or expiry
+        
+        Args:
+            seconds: Maximum time to sleep
+        
+        Returns:
+            True if the token was cancelled or expired
+        """
+        remaining = self.remaining()
+        if remaining is not None:
+            seconds = min(seconds, remaining)
+        self._event.wait(seconds)
+        return self.cancelled
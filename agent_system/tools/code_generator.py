@@ -3,51 +3,33 @@ Code Generator Tool
 Generates code snippets based on task description
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 from .base_tool import BaseTool
+from .builtin import BUILTIN_TOOLS
+from ..templating import BUILTIN_PACKS_DIR, TemplateLibrary
 
 
 class CodeGeneratorTool(BaseTool):
     """Tool for generating code snippets"""
     
-    def __init__(self):
-        super().__init__(
-            name="code_generator",
-            description="Generate code snippets based on requirements"
+    def __init__(self, template_dirs: Optional[List[str]] = None, cache_size: int = 4096):
+        """
+        Initialize code generator tool
+        
+        Args:
+            template_dirs: Extra template pack directories, loaded after the
+                built-in packs so they can override them
+            cache_size: Maximum number of rendered snippets kept in memory
+        """
+        spec = BUILTIN_TOOLS["code_generator"]
+        super().__init__(name=spec.name, description=spec.description)
+        # Routing rules live in the manifest, so they are known before the tool is loaded
+        self.routing_keywords = dict(spec.routing_keywords)
+        self.routing_examples = list(spec.routing_examples)
+        self.templates = TemplateLibrary(
+            [BUILTIN_PACKS_DIR] + list(template_dirs or []),
+            cache_size=cache_size
         )
-        self.templates = {
-            "python": {
-                "function": '''def {name}({params}):
-    """
-    {description}
-    """
-    # TODO: Implement function logic
-    pass
-''',
-                "class": '''class {name}:
-    """
-    {description}
-    """
-    
-    def __init__(self):
-        pass
-''',
-                "api": '''from flask import Flask, jsonify, request
-
-app = Flask(__name__)
-
-@app.route('/api/{endpoint}', methods=['GET'])
-def {endpoint}():
-    """
-    {description}
-    """
-    return jsonify({{"status": "success", "data": {{}}}})
-
-if __name__ == '__main__':
-    app.run(debug=True)
-'''
-            }
-        }
     
     def execute(self, task: str) -> Dict[str, Any]:
         """
@@ -64,42 +46,14 @@ if __name__ == '__main__':
         
         task_lower = task.lower()
         
-        # Determine code type
-        if "function" in task_lower:
-            code_type = "function"
-            template = self.templates["python"]["function"]
-            code = template.format(
-                name="example_function",
-                params="param1, param2",
-                description=task
-            )
-        elif "class" in task_lower:
-            code_type = "class"
-            template = self.templates["python"]["class"]
-            code = template.format(
-                name="ExampleClass",
-                description=task
-            )
-        elif "api" in task_lower or "endpoint" in task_lower:
-            code_type = "api"
-            template = self.templates["python"]["api"]
-            code = template.format(
-                endpoint="example",
-                description=task
-            )
-        else:
-            # Default to function
-            code_type = "function"
-            template = self.templates["python"]["function"]
-            code = template.format(
-                name="generated_function",
-                params="*args, **kwargs",
-                description=task
-            )
+        # Determine language and code type
+        language = self.templates.detect_language(task_lower)
+        code_type, params = self.templates.packs[language].select(task_lower)
+        code = self.templates.render(language, code_type, dict(params, description=task))
         
         return {
             "task": task,
-            "language": "python",
+            "language": language,
             "code_type": code_type,
             "code": code,
             "status": "generated"
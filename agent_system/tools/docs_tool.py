@@ -3,90 +3,176 @@ Documentation Tool
 Provides documentation and explanations
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, Generator, List, Optional, Tuple
 from .base_tool import BaseTool
+from .builtin import BUILTIN_TOOLS
+from ..knowledge import CachedStore, InMemoryStore, KnowledgeStore, open_store
+from ..search.aho_corasick import AhoCorasick
+
+
+# Knowledge base used when no store is configured
+DEFAULT_KNOWLEDGE_BASE = {
+    "python": "Python is a high-level, interpreted programming language with dynamic semantics. It supports multiple programming paradigms including procedural, object-oriented, and functional programming.",
+    "flask": "Flask is a micro web framework written in Python. It is classified as a microframework because it does not require particular tools or libraries. It has no database abstraction layer, form validation, or other components.",
+    "api": "API (Application Programming Interface) is a set of protocols, routines, and tools for building software applications. It specifies how software components should interact.",
+    "rest": "REST (Representational State Transfer) is an architectural style for designing networked applications. It relies on stateless, client-server communication protocol, almost always HTTP.",
+    "docker": "Docker is a platform for developers to develop, deploy, and run applications with containers. Containers package code and all dependencies so the application runs quickly and reliably.",
+    "machine learning": "Machine Learning is a method of data analysis that automates analytical model building. It is a branch of artificial intelligence based on the idea that systems can learn from data.",
+}
 
 
 class DocsTool(BaseTool):
     """Tool for generating documentation and explanations"""
     
-    def __init__(self):
-        super().__init__(
-            name="docs",
-            description="Generate documentation and explanations"
-        )
-        self.knowledge_base = {
-            "python": "Python is a high-level, interpreted programming language with dynamic semantics. It supports multiple programming paradigms including procedural, object-oriented, and functional programming.",
-            "flask": "Flask is a micro web framework written in Python. It is classified as a microframework because it does not require particular tools or libraries. It has no database abstraction layer, form validation, or other components.",
-            "api": "API (Application Programming Interface) is a set of protocols, routines, and tools for building software applications. It specifies how software components should interact.",
-            "rest": "REST (Representational State Transfer) is an architectural style for designing networked applications. It relies on stateless, client-server communication protocol, almost always HTTP.",
-            "docker": "Docker is a platform for developers to develop, deploy, and run applications with containers. Containers package code and all dependencies so the application runs quickly and reliably.",
-            "machine learning": "Machine Learning is a method of data analysis that automates analytical model building. It is a branch of artificial intelligence based on the idea that systems can learn from data.",
-        }
+    def __init__(self, knowledge_base_path: Optional[str] = None,
+                 store: Optional[KnowledgeStore] = None, cache_size: int = 1024):
+        """
+        Initialize docs tool
+        
+        Args:
+            knowledge_base_path: Knowledge base to open instead of the built-in
+                one: a JSON file, a SQLite database or a sharded-file directory
+            store: Knowledge store to use directly
+            cache_size: Number of topics kept in memory for on-disk stores
+        """
+        spec = BUILTIN_TOOLS["docs"]
+        super().__init__(name=spec.name, description=spec.description)
+        # Routing rules live in the manifest, so they are known before the tool is loaded
+        self.routing_keywords = dict(spec.routing_keywords)
+        self.routing_examples = list(spec.routing_examples)
+        
+        if store is None:
+            store = open_store(knowledge_base_path) if knowledge_base_path \
+                else InMemoryStore(DEFAULT_KNOWLEDGE_BASE)
+        
+        # Content of on-disk stores is fetched on lookup; keep hot topics cached
+        if not isinstance(store, (InMemoryStore, CachedStore)):
+            store = CachedStore(store, max_entries=cache_size)
+        
+        self.store = store
+        self._matcher: Optional[AhoCorasick] = None
     
-    def execute(self, task: str) -> Dict[str, Any]:
+    def add_topic(self, topic: str, content: str):
         """
-        Generate documentation based on task
+        Add or replace a knowledge base topic
+        
+        Args:
+            topic: Topic name
+            content: Topic content
+        
+        Raises:
+            ValueError: If the knowledge store is read-only
+        """
+        self.store.put(topic.lower(), content)
+        self._matcher = None
+    
+    def match_topics(self, task: str) -> List[str]:
+        """
+        Find the knowledge base topics mentioned in a task
+        
+        All topics are matched in one pass over the task; longer, more
+        specific topics rank before shorter ones.
         
         Args:
             task: Documentation request
         
         Returns:
-            Documentation content
+            Matching topics, best match first
+        """
+        if self._matcher is None:
+            self._matcher = AhoCorasick(self.store.topics())
+        return self._matcher.match(task.lower())
+    
+    def _sections(self, task: str) -> Tuple[str, List[str], List[str]]:
+        """
+        Look up the topic of a task and lay out its documentation
+        
+        Args:
+            task: Documentation request
+        
+        Returns:
+            Tuple of (topic, related topics, markdown sections)
         """
         if not self.validate_input(task):
             raise ValueError("Invalid documentation request")
         
-        task_lower = task.lower()
-        
         # Find matching topic
-        matching_topic = None
-        matching_content = None
-        
-        for topic, content in self.knowledge_base.items():
-            if topic in task_lower:
-                matching_topic = topic
-                matching_content = content
-                break
+        topics = self.match_topics(task)
+        matching_topic = topics[0] if topics else None
+        matching_content = self.store.get(matching_topic) if matching_topic else None
         
         if not matching_content:
             matching_content = f"Documentation for: {task}\n\nThis is a general explanation about the requested topic. For detailed documentation, please refer to official sources."
             matching_topic = "general"
         
         # Generate structured documentation
-        documentation = f"""
-# Documentation: {matching_topic.title()}
-
-## Overview
-{matching_content}
-
-## Key Features
+        sections = [
+            f"# Documentation: {matching_topic.title()}",
+            f"## Overview\n{matching_content}",
+            """## Key Features
 - Feature 1: Core functionality
 - Feature 2: Advanced capabilities
-- Feature 3: Integration support
-
-## Usage Example
+- Feature 3: Integration support""",
+            """## Usage Example
 ```python
 # Example code snippet
 # TODO: Add specific implementation
 pass
-```
-
-## Best Practices
+```""",
+            """## Best Practices
 1. Follow coding standards
 2. Write comprehensive tests
 3. Document your code
-4. Use version control
-
-## Additional Resources
+4. Use version control""",
+            """## Additional Resources
 - Official documentation
 - Community forums
-- Tutorial guides
-"""
+- Tutorial guides""",
+        ]
+        
+        return matching_topic, topics[1:], sections
+    
+    def execute(self, task: str) -> Dict[str, Any]:
+        """
+        Generate documentation based on task
+        
+        Args:
+            task: Documentation request
+        
+        Returns:
+            Documentation content
+        """
+        topic, related_topics, sections = self._sections(task)
+        
+        return {
+            "task": task,
+            "topic": topic,
+            "related_topics": related_topics,
+            "documentation": "\n\n".join(sections),
+            "format": "markdown"
+        }
+    
+    def stream(self, task: str) -> Generator[str, None, Dict[str, Any]]:
+        """
+        Generate documentation section by section
+        
+        The chunks concatenate to the ``documentation`` field of the result.
+        
+        Args:
+            task: Documentation request
+        
+        Returns:
+            Generator of markdown chunks
+        """
+        topic, related_topics, sections = self._sections(task)
+        
+        for i, section in enumerate(sections):
+            yield section if i == 0 else "\n\n" + section
         
         return {
             "task": task,
-            "topic": matching_topic,
-            "documentation": documentation.strip(),
+            "topic": topic,
+            "related_topics": related_topics,
+            "documentation": "\n\n".join(sections),
             "format": "markdown"
         }
@@ -1,33 +1,84 @@
 """
 Search Tool
-Simulates search functionality with mock data
+Searches a local BM25-ranked inverted index
 """
 
-import random
-from typing import Dict, List, Any
+import os
+from typing import Dict, Iterable, List, Any, Optional
 from .base_tool import BaseTool
+from .builtin import BUILTIN_TOOLS
+from ..search import DiskIndex, InvertedIndex
+
+
+# Documents indexed when no corpus is configured
+DEFAULT_CORPUS = [
+    "Python is a high-level programming language known for its simplicity and readability.",
+    "Machine Learning is a subset of AI that enables systems to learn from data.",
+    "Flask is a lightweight WSGI web application framework in Python.",
+    "Docker is a platform for developing, shipping, and running applications in containers.",
+    "Git is a distributed version control system for tracking changes in source code.",
+    "REST API is an architectural style for designing networked applications.",
+    "Neural Networks are computing systems inspired by biological neural networks.",
+    "Cloud Computing provides on-demand computing resources over the internet.",
+    "Kubernetes is an open-source container orchestration platform.",
+    "DevOps combines software development and IT operations for faster delivery."
+]
 
 
 class SearchTool(BaseTool):
     """Tool for searching information"""
     
-    def __init__(self):
-        super().__init__(
-            name="search",
-            description="Search for information across various sources"
-        )
-        self.mock_results = [
-            "Python is a high-level programming language known for its simplicity and readability.",
-            "Machine Learning is a subset of AI that enables systems to learn from data.",
-            "Flask is a lightweight WSGI web application framework in Python.",
-            "Docker is a platform for developing, shipping, and running applications in containers.",
-            "Git is a distributed version control system for tracking changes in source code.",
-            "REST API is an architectural style for designing networked applications.",
-            "Neural Networks are computing systems inspired by biological neural networks.",
-            "Cloud Computing provides on-demand computing resources over the internet.",
-            "Kubernetes is an open-source container orchestration platform.",
-            "DevOps combines software development and IT operations for faster delivery."
-        ]
+    def __init__(self, corpus_paths: Optional[List[str]] = None, top_k: int = 5,
+                 index_path: Optional[str] = None):
+        """
+        Initialize search tool
+        
+        Args:
+            corpus_paths: Corpus files or directories to index (defaults to a built-in corpus)
+            top_k: Maximum number of results per query
+            index_path: Prebuilt index file to open instead of indexing a corpus
+                (defaults to the CODEV_SEARCH_INDEX environment variable)
+        """
+        spec = BUILTIN_TOOLS["search"]
+        super().__init__(name=spec.name, description=spec.description)
+        # Routing rules live in the manifest, so they are known before the tool is loaded
+        self.routing_keywords = dict(spec.routing_keywords)
+        self.routing_examples = list(spec.routing_examples)
+        self.top_k = top_k
+        index_path = index_path or os.environ.get("CODEV_SEARCH_INDEX")
+        
+        if index_path and not corpus_paths:
+            # Prebuilt indexes are mapped, not loaded, so opening is O(1)
+            self.index = DiskIndex(index_path)
+            return
+        
+        self.index = InvertedIndex()
+        
+        if corpus_paths:
+            for path in corpus_paths:
+                if os.path.isdir(path):
+                    self.index.load_directory(path)
+                else:
+                    self.index.load_file(path)
+        else:
+            self.index.add_documents(DEFAULT_CORPUS)
+    
+    def add_documents(self, texts: Iterable[str]) -> int:
+        """
+        Add documents to the search index
+        
+        Args:
+            texts: Document texts
+        
+        Returns:
+            Number of documents added
+        
+        Raises:
+            ValueError: If the tool is serving a read-only prebuilt index
+        """
+        if not isinstance(self.index, InvertedIndex):
+            raise ValueError("Cannot add documents to a prebuilt index")
+        return self.index.add_documents(texts)
     
     def execute(self, task: str) -> Dict[str, Any]:
         """
@@ -42,13 +93,12 @@ class SearchTool(BaseTool):
         if not self.validate_input(task):
             raise ValueError("Invalid search query")
         
-        # Simulate search by returning relevant mock results
-        num_results = random.randint(2, 5)
-        results = random.sample(self.mock_results, min(num_results, len(self.mock_results)))
+        hits = self.index.search(task, self.top_k)
         
         return {
             "query": task,
-            "num_results": len(results),
-            "results": results,
-            "source": "Mock Search Engine"
+            "num_results": len(hits),
+            "results": [self.index.document(doc_id) for doc_id, _ in hits],
+            "scores": [round(score, 4) for _, score in hits],
+            "source": "Local Search Index"
         }
@@ -0,0 +1,211 @@
+"""
+Tool Specs
+Lazy descriptors of tools: metadata up front, import on first use
+"""
+
+import importlib
+import json
+import re
+import sys
+import threading
+from typing import Any, Callable, Dict, List, Mapping, Optional, Union
+from .base_tool import BaseTool
+
+
+class ToolSpec:
+    """
+    Describes a tool without loading it
+    
+    A spec carries what listing and routing need (name, description,
+    version and routing rules), plus a factory that builds the tool. The
+    factory is only imported and called the first time the tool is
+    loaded, so tools with large indexes or models cost nothing until a
+    task is routed to them.
+    """
+    
+    # Manifest fields besides "name" and "factory"
+    FIELDS = ("description", "version", "routing_keywords", "routing_patterns",
+              "routing_examples", "options")
+    
+    def __init__(self, name: str, factory: Union[str, Callable[..., BaseTool]],
+                 description: str = "", version: str = "1.0.0",
+                 routing_keywords: Optional[Mapping[str, float]] = None,
+                 routing_patterns: Optional[Mapping[str, float]] = None,
+                 routing_examples: Optional[List[str]] = None,
+                 options: Optional[Mapping[str, Any]] = None, path: Optional[str] = None):
+        """
+        Define a tool
+        
+        Args:
+            name: Tool name; the loaded tool must have the same name
+            factory: Tool class or factory, or its import path as
+                "module:attribute"
+            description: Tool description
+            version: Tool version
+            routing_keywords: Case-insensitive whole words mapped to weights
+            routing_patterns: Case-insensitive regexes mapped to weights
+            routing_examples: Example tasks for the semantic router
+            options: Keyword arguments passed to the factory
+            path: Directory added to the module search path before the
+                factory is imported (for tools in plugin directories)
+        """
+        self.name = name
+        self.factory = factory
+        self.description = description
+        self.version = version
+        self.routing_keywords: Dict[str, float] = dict(routing_keywords or {})
+        self.routing_patterns: Dict[str, float] = dict(routing_patterns or {})
+        self.routing_examples: List[str] = list(routing_examples or [])
+        self.options: Dict[str, Any] = dict(options or {})
+        self.path = path
+        self._tool: Optional[BaseTool] = None
+        # Whether the spec wraps a tool built elsewhere (see from_tool)
+        self._prebuilt = False
+        self._lock = threading.Lock()
+    
+    @property
+    def loaded(self) -> bool:
+        """Whether the tool has been built"""
+        return self._tool is not None
+    
+    def load(self) -> BaseTool:
+        """
+        Build the tool on first use
+        
+        Returns:
+            Tool instance, the same one on every call
+        
+        Raises:
+            ImportError: If the factory can't be imported
+            ValueError: If the factory builds a tool with another name
+        """
+        tool = self._tool
+        if tool is not None:
+            return tool
+        
+        with self._lock:
+            if self._tool is None:
+                tool = self._resolve_factory()(**self.options)
+                if tool.name != self.name:
+                    raise ValueError(f"Tool spec '{self.name}' built a tool named '{tool.name}'")
+                self._tool = tool
+        return self._tool
+    
+    def _resolve_factory(self) -> Callable[..., BaseTool]:
+        """Import the factory if it is given as an import path"""
+        if not isinstance(self.factory, str):
+            return self.factory
+        
+        module_name, _, attribute = self.factory.partition(":")
+        if not attribute:
+            raise ImportError(f"Invalid factory '{self.factory}' for tool '{self.name}', expected module:attribute")
+        if self.path and self.path not in sys.path:
+            sys.path.append(self.path)
+        factory: Any = importlib.import_module(module_name)
+        for part in attribute.split("."):
+            factory = getattr(factory, part)
+        return factory
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        # A spec sent to another process builds its own tool there, unless
+        # it wraps a tool instance, which is then sent along
+        state = self.__dict__.copy()
+        del state["_lock"]
+        if not self._prebuilt:
+            state["_tool"] = None
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+    
+    def copy(self) -> "ToolSpec":
+        """Get an unloaded copy of the spec, which builds its own tool"""
+        return ToolSpec(
+            self.name, self.factory, path=self.path,
+            **{field: getattr(self, field) for field in self.FIELDS}
+        )
+    
+    def info(self) -> Dict[str, Any]:
+        """Get the tool's name, description and version"""
+        return {
+            "name": self.name,
+            "description": self.description,
+            "version": self.version
+        }
+    
+    @classmethod
+    def from_tool(cls, tool: BaseTool) -> "ToolSpec":
+        """
+        Describe an already built tool
+        
+        Args:
+            tool: Tool instance
+        
+        Returns:
+            Loaded spec holding the tool
+        """
+        spec = cls(
+            tool.name, type(tool), description=tool.description,
+            version=getattr(tool, "version", "1.0.0"),
+            routing_keywords=getattr(tool, "routing_keywords", {}),
+            routing_patterns=getattr(tool, "routing_patterns", {}),
+            routing_examples=getattr(tool, "routing_examples", [])
+        )
+        spec._tool = tool
+        spec._prebuilt = True
+        return spec
+    
+    @classmethod
+    def from_manifest(cls, manifest: Mapping[str, Any], path: Optional[str] = None) -> "ToolSpec":
+        """
+        Build a spec from a manifest, such as an object in a JSON file
+        
+        The manifest needs "name" and "factory", and may have any of
+        "description", "version", "routing_keywords", "routing_patterns",
+        "routing_examples" and "options".
+        
+        Args:
+            manifest: Tool manifest
+            path: Directory holding the tool's module, if not installed
+        
+        Returns:
+            Tool spec
+        
+        Raises:
+            ValueError: If the manifest is incomplete, has unknown fields or
+                has an invalid routing pattern
+        """
+        if not isinstance(manifest, Mapping) or "name" not in manifest or "factory" not in manifest:
+            raise ValueError("Tool manifests need a 'name' and a 'factory'")
+        unknown = set(manifest) - {"name", "factory"} - set(cls.FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields in manifest of tool '{manifest['name']}': {', '.join(sorted(unknown))}")
+        for pattern in manifest.get("routing_patterns") or {}:
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                raise ValueError(f"Invalid routing pattern {pattern!r} of tool '{manifest['name']}': {e}") from None
+        return cls(path=path, **manifest)
+    
+    @classmethod
+    def load_manifest(cls, file_path: str, path: Optional[str] = None) -> List["ToolSpec"]:
+        """
+        Read the tool manifests in a JSON file
+        
+        The file holds one manifest, a list of them, or an object with a
+        "tools" list.
+        
+        Args:
+            file_path: Manifest file path
+            path: Directory holding the tools' modules
+        
+        Returns:
+            Tool specs
+        """
+        with open(file_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, Mapping) and "tools" in data:
+            data = data["tools"]
+        manifests = data if isinstance(data, list) else [data]
+        return [cls.from_manifest(manifest, path) for manifest in manifests]
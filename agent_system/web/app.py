@@ -3,8 +3,11 @@ Web Application
 Flask web interface for the AI Agent
 """
 
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
 from datetime import datetime
+import base64
+import hashlib
+import json
 import sys
 import os
 
@@ -12,10 +15,73 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
 from agent_system.agent import Agent
+from agent_system.cache import ResultCache, SQLiteCacheBackend
+from agent_system.events import EventBroker
+from agent_system.history import SQLiteTaskHistory
+from agent_system.jobs import JobQueue, QueueFull, SQLiteJobStore
+from agent_system.metrics import PROMETHEUS_CONTENT_TYPE, AgentMetrics
+from agent_system.profiling import MODES as PROFILE_MODES, TaskProfiler
+from agent_system.routing import SemanticRouter
+from agent_system.workflow import Workflow, WorkflowError, WorkflowRunner
 
 
 app = Flask(__name__)
-agent = Agent("WebAgent")
+
+# Persist history across restarts when a database path is configured
+_history_db = os.environ.get("CODEV_HISTORY_DB")
+# Cache tool results for this many seconds when configured, optionally in a
+# database file shared by every worker process on the host
+_cache_ttl = os.environ.get("CODEV_CACHE_TTL")
+_cache_db = os.environ.get("CODEV_CACHE_DB")
+_cache = None
+if _cache_ttl or _cache_db:
+    _cache = ResultCache(
+        default_ttl=float(_cache_ttl or 300),
+        backend=SQLiteCacheBackend(_cache_db) if _cache_db else None
+    )
+# "semantic" routes by embedding similarity (requires numpy) instead of keywords
+_router = os.environ.get("CODEV_ROUTER", "keyword")
+# Default time budget in seconds for each task
+_task_timeout = os.environ.get("CODEV_TASK_TIMEOUT")
+# Fraction of tasks profiled into the aggregate served by /api/profile
+_profiler = TaskProfiler(
+    mode=os.environ.get("CODEV_PROFILE_MODE", "trace"),
+    sample_rate=float(os.environ.get("CODEV_PROFILE_RATE") or 0)
+)
+agent = Agent(
+    "WebAgent",
+    history=SQLiteTaskHistory(_history_db) if _history_db else None,
+    cache=_cache,
+    router=SemanticRouter(default_tool="search") if _router == "semantic" else None,
+    default_timeout=float(_task_timeout) if _task_timeout else None,
+    metrics=AgentMetrics(),
+    profiler=_profiler,
+    events=EventBroker()
+)
+# Background jobs: concurrently running jobs and the most that may wait.
+# Each server worker runs the jobs it accepted, so with several workers job
+# status must be kept in a database they share (by default the history
+# database); without one, background jobs are disabled
+_job_db = os.environ.get("CODEV_JOB_DB") or _history_db
+_server_workers = int(os.environ.get("CODEV_SERVER_WORKERS") or 1)
+jobs = None
+if _job_db or _server_workers == 1:
+    jobs = JobQueue(
+        agent,
+        workers=int(os.environ.get("CODEV_JOB_WORKERS") or 4),
+        max_queued=int(os.environ.get("CODEV_JOB_QUEUE_SIZE") or 1000),
+        store=SQLiteJobStore(_job_db) if _job_db else None
+    )
+_JOBS_DISABLED = "Background jobs need CODEV_JOB_DB (or CODEV_HISTORY_DB) when running several server workers"
+# Memoized workflow step results, optionally in a database file shared by
+# every worker process on the host
+_workflow_memo_db = os.environ.get("CODEV_WORKFLOW_MEMO_DB")
+workflows = WorkflowRunner(
+    agent,
+    # Steps run at once by each workflow request
+    max_workers=int(os.environ.get("CODEV_WORKFLOW_WORKERS") or 8),
+    memo_backend=SQLiteCacheBackend(_workflow_memo_db) if _workflow_memo_db else None
+)
 
 
 @app.route('/')
@@ -24,9 +90,26 @@ def index():
     return render_template('index.html')
 
 
+def _parse_profile(value):
+    """Parse a profile request into a profile mode, or None for no profile"""
+    if value in (None, False, "", "0", "false"):
+        return None
+    if value in (True, "1", "true"):
+        return agent.profiler.mode
+    if value not in PROFILE_MODES:
+        raise ValueError(f"Invalid profile mode, expected 1 or one of {', '.join(PROFILE_MODES)}")
+    return value
+
+
 @app.route('/api/execute', methods=['POST'])
 def execute_task():
-    """Execute a task via API"""
+    """
+    Execute a task via API
+    
+    With ``?profile=1`` (or "trace" or "sample", also accepted as a
+    "profile" field in the body) the response has a "profile" field
+    holding the task's profile as collapsed stacks for a flamegraph.
+    """
     data = request.get_json()
     
     if not data or 'task' not in data:
@@ -34,14 +117,214 @@ def execute_task():
     
     task = data['task']
     tool = data.get('tool')
+    try:
+        timeout = float(data['timeout']) if data.get('timeout') is not None else None
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid timeout"}), 400
+    try:
+        profile = _parse_profile(request.args.get('profile', data.get('profile')))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     
     try:
-        result = agent.execute_task(task, tool)
+        result = agent.execute_task(task, tool, timeout=timeout, profile=profile)
         return jsonify(result)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+@app.route('/api/execute/stream', methods=['GET', 'POST'])
+def stream_task():
+    """
+    Execute a task and stream its output as Server-Sent Events
+    
+    The task, optional tool and optional timeout (seconds) come from the
+    JSON body, or from the query string so browsers can connect with
+    EventSource. Each event is named
+    after the agent event ("start", "chunk" or "end") and carries it as JSON.
+    """
+    data = request.get_json(silent=True) or request.args
+    
+    if not data or 'task' not in data:
+        return jsonify({"error": "Task is required"}), 400
+    
+    task = data['task']
+    tool = data.get('tool')
+    try:
+        timeout = float(data['timeout']) if data.get('timeout') is not None else None
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid timeout"}), 400
+    
+    def generate():
+        for event in agent.stream_task(task, tool, timeout=timeout):
+            yield f"event: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        # Keep proxies from buffering the stream
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+@app.route('/api/workflows', methods=['POST'])
+def run_workflow():
+    """
+    Run a workflow of tool steps
+    
+    Takes a "workflow" definition (a "steps" list, see
+    ``Workflow.from_dict``), its "params" and an optional per-step
+    "timeout". Independent steps run concurrently, and steps whose tool
+    and inputs are unchanged since an earlier run are served from memo.
+    """
+    data = request.get_json()
+    
+    if not data or 'workflow' not in data:
+        return jsonify({"error": "Workflow is required"}), 400
+    
+    try:
+        timeout = float(data['timeout']) if data.get('timeout') is not None else None
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid timeout"}), 400
+    
+    try:
+        workflow = Workflow.from_dict(data['workflow'])
+        return jsonify(workflows.run(workflow, data.get('params'), timeout=timeout))
+    except WorkflowError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+# Seconds between keep-alive comments on idle event streams
+_EVENT_HEARTBEAT = 15
+
+
+@app.route('/api/events', methods=['GET'])
+def stream_events():
+    """
+    Stream task and job status changes as Server-Sent Events
+    
+    Instead of polling ``/api/task/<id>`` or ``/api/jobs/<id>``, clients
+    keep one connection open and are sent a "task" event when a task
+    starts or finishes and a "job" event when a job changes status.
+    ``?task_id=`` or ``?job_id=`` limits the stream to one task or job.
+    Reconnecting clients (EventSource does this by itself) resume after
+    the ``Last-Event-ID`` header or ``?last_event_id=`` parameter. Event
+    IDs are "<epoch>-<number>"; an ID from another server process, or from
+    before a restart, gets every event still buffered instead.
+    
+    Events are published by the server process that runs the task, so
+    with several server workers a stream only sees that worker's tasks.
+    """
+    try:
+        task_id = request.args.get('task_id')
+        task_id = int(task_id) if task_id else None
+        last_event = request.headers.get('Last-Event-ID', request.args.get('last_event_id'))
+        last_id = None
+        if last_event:
+            epoch, _, number = last_event.rpartition('-')
+            last_id = agent.events.resume_point(epoch or None, int(number))
+    except ValueError:
+        return jsonify({"error": "Invalid task_id or last_event_id"}), 400
+    job_id = request.args.get('job_id')
+    
+    # Streams stay open indefinitely; keep them from tying up request threads
+    detach = request.environ.get('codev.detach')
+    if detach is not None:
+        detach()
+    
+    epoch = agent.events.epoch
+    
+    def generate():
+        # Reconnect quickly after the server restarts
+        yield "retry: 3000\n\n"
+        for event in agent.events.listen(last_id, heartbeat=_EVENT_HEARTBEAT):
+            if event is None:
+                yield ": keep-alive\n\n"
+            elif (task_id is None or event.get('task_id') == task_id) and \
+                    (job_id is None or event.get('job_id') == job_id):
+                yield f"id: {epoch}-{event['id']}\nevent: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        # Keep proxies from buffering the stream
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """
+    Queue a task to run in the background
+    
+    Takes the task, optional tool, optional timeout and an optional
+    integer priority (higher runs first, default 0). Returns 202 with the
+    job, or 429 with a Retry-After header when the queue is full.
+    """
+    if jobs is None:
+        return jsonify({"error": _JOBS_DISABLED}), 503
+    
+    data = request.get_json()
+    
+    if not data or 'task' not in data:
+        return jsonify({"error": "Task is required"}), 400
+    
+    try:
+        priority = int(data.get('priority', 0))
+        timeout = float(data['timeout']) if data.get('timeout') is not None else None
+    except (TypeError, ValueError):
+        return jsonify({"error": "Invalid priority or timeout"}), 400
+    
+    try:
+        job = jobs.submit(data['task'], data.get('tool'), priority=priority, timeout=timeout)
+    except QueueFull as e:
+        response = jsonify({"error": str(e), "retry_after": e.retry_after})
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response, 429
+    except RuntimeError as e:
+        return jsonify({"error": str(e)}), 503
+    
+    response = jsonify(job.to_dict())
+    response.headers['Location'] = f"/api/jobs/{job.job_id}"
+    return response, 202
+
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """
+    Get the status of a job, and its task record once it has finished
+    
+    With several server workers, job status comes from the shared job
+    database, so any worker can answer.
+    """
+    if jobs is None:
+        return jsonify({"error": _JOBS_DISABLED}), 503
+    
+    job = jobs.get(job_id)
+    
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job.to_dict())
+
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """Cancel a job that has not started yet"""
+    if jobs is None:
+        return jsonify({"error": _JOBS_DISABLED}), 503
+    
+    job = jobs.get(job_id)
+    
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    if not jobs.cancel(job_id):
+        job = jobs.get(job_id) or job
+        return jsonify({"error": f"Job is {job.status} and can no longer be cancelled"}), 409
+    return jsonify(jobs.get(job_id).to_dict())
+
+
 @app.route('/api/tools', methods=['GET'])
 def list_tools():
     """List all available tools"""
@@ -55,11 +338,103 @@ def list_tools():
     return jsonify({"tools": tool_info})
 
 
+HISTORY_PAGE_SIZE = 50
+HISTORY_MAX_PAGE_SIZE = 500
+
+
+def _encode_cursor(task_id: int) -> str:
+    """Encode the position after a history page as an opaque cursor"""
+    return base64.urlsafe_b64encode(json.dumps({"before": task_id}).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> int:
+    """Decode a history cursor, raising ValueError if it is malformed"""
+    try:
+        return int(json.loads(base64.urlsafe_b64decode(cursor.encode()))["before"])
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def _parse_position(value):
+    """Parse a history since position, raising ValueError if it is malformed"""
+    if value is None:
+        return None
+    position = int(value)
+    if position < 0:
+        raise ValueError("since must not be negative")
+    return position
+
+
+def _parse_time(value):
+    """Parse an ISO 8601 query parameter into seconds since the epoch"""
+    return datetime.fromisoformat(value).timestamp() if value else None
+
+
 @app.route('/api/history', methods=['GET'])
 def get_history():
-    """Get task execution history"""
-    history = agent.get_task_history()
-    return jsonify({"history": history})
+    """
+    Get one page of task execution history, newest first
+    
+    Query parameters: limit, cursor (from the previous page's next_cursor),
+    status, tool, from/to (ISO 8601 start-time range) and since. Responses
+    carry an ETag; an unchanged page returns 304.
+    
+    Pollers pass since instead of cursor: 0 at first, then the previous
+    response's next_since. They get the tasks stored since then, oldest
+    first, including tasks with lower IDs that finished late; 304 means
+    nothing was stored.
+    """
+    try:
+        limit = min(int(request.args.get('limit', HISTORY_PAGE_SIZE)), HISTORY_MAX_PAGE_SIZE)
+        cursor = request.args.get('cursor')
+        before = _decode_cursor(cursor) if cursor else None
+        since = _parse_position(request.args.get('since'))
+        start_from = _parse_time(request.args.get('from'))
+        start_to = _parse_time(request.args.get('to'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    if limit < 1:
+        return jsonify({"error": "limit must be positive"}), 400
+    if since is not None and cursor:
+        return jsonify({"error": "since and cursor can't be combined"}), 400
+    
+    status = request.args.get('status')
+    tool = request.args.get('tool')
+    
+    if since is not None:
+        # Task IDs are handed out at start but tasks finish in any order,
+        # so polling follows the store's write order instead of IDs
+        history, next_since = agent.task_history.changes(since, limit)
+        if not history:
+            return '', 304
+        history = [
+            task for task in history
+            if (status is None or task["status"] == status)
+            and (tool is None or task.get("tool_used") == tool)
+            and (start_from is None or _parse_time(task["start_time"]) >= start_from)
+            and (start_to is None or _parse_time(task["start_time"]) < start_to)
+        ]
+        body = json.dumps({"history": history, "next_since": next_since}, default=str)
+    else:
+        history = agent.task_history.page(
+            limit,
+            before=before,
+            status=status,
+            tool=tool,
+            since=start_from,
+            until=start_to
+        )
+        next_cursor = _encode_cursor(history[-1]["task_id"]) if len(history) == limit else None
+        body = json.dumps({"history": history, "next_cursor": next_cursor}, default=str)
+    etag = hashlib.sha1(body.encode()).hexdigest()
+    
+    if etag in request.if_none_match:
+        return '', 304
+    
+    response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    return response
 
 
 @app.route('/api/task/<int:task_id>', methods=['GET'])
@@ -79,10 +454,46 @@ def health_check():
     return jsonify({
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
-        "agent": agent.name
+        "agent": agent.name,
+        "jobs": jobs.stats() if jobs is not None else None,
+        "event_streams": agent.events.subscribers
     })
 
 
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    Export agent metrics in the Prometheus text format
+    
+    Each server worker process keeps its own metrics, so scrape every
+    worker (or run a single worker) for complete numbers.
+    """
+    return Response(agent.metrics.to_prometheus(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@app.route('/api/profile', methods=['GET'])
+def get_profile():
+    """
+    Get the aggregate profile of every profiled task as collapsed stacks
+    
+    Covers tasks profiled on request and the ``CODEV_PROFILE_RATE``
+    fraction of all tasks; ``?mode=sample`` selects sampled profiles.
+    """
+    mode = request.args.get('mode', agent.profiler.mode)
+    if mode not in PROFILE_MODES:
+        return jsonify({"error": f"Invalid mode, expected one of {', '.join(PROFILE_MODES)}"}), 400
+    return Response(agent.profiler.collapsed(mode), content_type="text/plain; charset=utf-8")
+
+
+def shutdown():
+    """Finish queued jobs, end event streams, then flush and release agent resources; called by server workers on exit"""
+    if jobs is not None:
+        jobs.close()
+    agent.events.close()
+    workflows.memo.close()
+    agent.close()
+
+
 def run_server(host='0.0.0.0', port=5000, debug=True):
     """Run the Flask server"""
     app.run(host=host, port=port, debug=debug)
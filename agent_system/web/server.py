@@ -0,0 +1,405 @@
+"""
+Production Server
+Pre-fork WSGI server: a master process supervising forked worker processes
+"""
+
+import importlib
+import itertools
+import logging
+import os
+import queue
+import signal
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler
+from typing import Any, Dict, Optional, Set, Tuple
+from wsgiref.simple_server import ServerHandler, WSGIRequestHandler, WSGIServer
+from werkzeug.wsgi import LimitedStream
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_APP = "agent_system.web.app:app"
+
+# Workers that exit sooner than this after starting are respawned with a delay
+_MIN_WORKER_LIFETIME = 1.0
+
+
+class _ServerHandler(ServerHandler):
+    """WSGI handler answering in HTTP/1.1"""
+    
+    http_version = "1.1"
+    
+    def cleanup_headers(self):
+        super().cleanup_headers()
+        # Without a length the client can only find the end of a body
+        # (such as an event stream) by the connection closing
+        if "Content-Length" not in self.headers or self.request_handler.close_connection:
+            self.headers["Connection"] = "close"
+            self.request_handler.close_connection = True
+
+
+class _RequestHandler(WSGIRequestHandler):
+    """Request handler serving many requests per keep-alive connection"""
+    
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; don't let the second wait for an ACK
+    disable_nagle_algorithm = True
+    
+    # Loop over requests like http.server does, instead of wsgiref's
+    # single request per connection
+    handle = BaseHTTPRequestHandler.handle
+    
+    def handle_one_request(self):
+        try:
+            self.raw_requestline = self.rfile.readline(65537)
+        except socket.timeout:
+            # Idle keep-alive connection
+            self.close_connection = True
+            return
+        if not self.raw_requestline:
+            self.close_connection = True
+            return
+        if len(self.raw_requestline) > 65536:
+            self.requestline = ""
+            self.request_version = ""
+            self.command = ""
+            self.send_error(414)
+            return
+        if not self.parse_request():
+            return
+        
+        # Don't hold connections open once the worker starts shutting down
+        if self.server.draining:
+            self.close_connection = True
+        
+        environ = self.get_environ()
+        # Lets long-lived responses give up their pool thread
+        environ["codev.detach"] = self.server.detach
+        body = None
+        if self.headers.get("Transfer-Encoding"):
+            # Chunked request bodies can't be skipped safely; read to close
+            self.close_connection = True
+            body_stream = self.rfile
+        else:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = body_stream = LimitedStream(self.rfile, length)
+        
+        handler = _ServerHandler(body_stream, self.wfile, self.get_stderr(), environ, multithread=True)
+        handler.request_handler = self
+        handler.run(self.server.get_app())
+        
+        # Discard any part of the body the application didn't read, so it
+        # isn't parsed as the next request
+        if body is not None and not self.close_connection:
+            body.exhaust()
+
+
+class _PooledWSGIServer(WSGIServer):
+    """
+    WSGI server handling connections on a fixed-size thread pool
+    
+    A request that will hold its connection open for a long time, such
+    as an event stream, can call ``environ["codev.detach"]()`` to take
+    its thread out of the pool: a new pool thread replaces it, and the
+    detached thread exits once its connection is done. At most
+    ``max_streams`` threads are detached at a time.
+    """
+    
+    def __init__(self, sock: socket.socket, app: Any, threads: int, keep_alive: float,
+                 max_streams: int = 1000):
+        """
+        Serve an already-listening socket
+        
+        Args:
+            sock: Listening socket shared with the other workers
+            app: WSGI application
+            threads: Number of connections handled concurrently
+            keep_alive: Seconds an idle connection is kept open
+            max_streams: Maximum number of detached connections
+        """
+        handler = type("RequestHandler", (_RequestHandler,), {"timeout": keep_alive})
+        host, port = sock.getsockname()[:2]
+        super().__init__((host, port), handler, bind_and_activate=False)
+        self.socket.close()
+        self.socket = sock
+        # Every worker polls the same socket; the ones that lose the race
+        # to accept a connection must not block
+        self.socket.setblocking(False)
+        self.server_name = socket.getfqdn(host)
+        self.server_port = port
+        self.setup_environ()
+        self.set_app(app)
+        self.draining = False
+        self.threads = threads
+        self.max_streams = max_streams
+        # Accepted connections, or None to stop a pool thread
+        self._connections: "queue.SimpleQueue[Optional[Tuple[Any, Any]]]" = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._pool: Set[threading.Thread] = set()
+        self._detached: Set[threading.Thread] = set()
+        self._thread_ids = itertools.count()
+        for _ in range(threads):
+            self._start_thread()
+    
+    def _start_thread(self):
+        """Add a thread to the pool; the lock must be held"""
+        thread = threading.Thread(target=self._work, name=f"http-{next(self._thread_ids)}", daemon=True)
+        self._pool.add(thread)
+        thread.start()
+    
+    def process_request(self, request, client_address):
+        self._connections.put((request, client_address))
+    
+    def _work(self):
+        """Pool thread loop: handle connections until stopped or detached"""
+        current = threading.current_thread()
+        while True:
+            item = self._connections.get()
+            if item is None:
+                return
+            request, client_address = item
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+            
+            if current in self._detached:
+                with self._lock:
+                    self._detached.discard(current)
+                return
+    
+    def detach(self) -> bool:
+        """
+        Take the calling pool thread out of the pool until its connection ends
+        
+        Returns:
+            True if the thread is detached, False if ``max_streams``
+            connections are already detached (the thread stays pooled)
+        """
+        current = threading.current_thread()
+        with self._lock:
+            if current in self._detached:
+                return True
+            if current not in self._pool or len(self._detached) >= self.max_streams:
+                return False
+            self._pool.discard(current)
+            self._detached.add(current)
+            self._start_thread()
+        return True
+    
+    def drain(self, timeout: float) -> bool:
+        """
+        Stop accepting connections and wait for in-flight requests
+        
+        Must be called after ``serve_forever`` has returned. Detached
+        connections are not waited for; they end when the application
+        shuts down.
+        
+        Args:
+            timeout: Maximum number of seconds to wait
+        
+        Returns:
+            True if every request finished in time
+        """
+        self.draining = True
+        self.server_close()
+        for _ in range(self.threads):
+            self._connections.put(None)
+        
+        deadline = time.monotonic() + timeout
+        while True:
+            # Threads detaching meanwhile are replaced, so look again each time
+            with self._lock:
+                pending = [thread for thread in self._pool if thread.is_alive()]
+            if not pending:
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            pending[0].join(remaining)
+
+
+class PreforkServer:
+    """Master process that binds the socket and supervises worker processes"""
+    
+    def __init__(self, app: str = DEFAULT_APP, host: str = "0.0.0.0", port: int = 5000,
+                 workers: Optional[int] = None, threads: int = 8, keep_alive: float = 5.0,
+                 graceful_timeout: float = 30.0, backlog: int = 2048, max_streams: int = 1000):
+        """
+        Configure the server
+        
+        The application is imported by each worker after it is forked, so
+        every worker builds its own agent, history store and cache
+        connections instead of sharing the master's. If the application
+        module defines a ``shutdown`` function, workers call it on exit.
+        
+        Args:
+            app: Application as "module:attribute"
+            host: Host to listen on
+            port: Port to listen on
+            workers: Number of worker processes (defaults to the number of CPUs)
+            threads: Number of request threads per worker
+            keep_alive: Seconds an idle keep-alive connection is kept open
+            graceful_timeout: Seconds workers get to finish in-flight requests
+                on shutdown before they are killed
+            backlog: Listen queue length
+            max_streams: Long-lived connections (event streams) per worker
+                that may leave the request threads, so they don't tie them up
+        """
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.threads = threads
+        self.keep_alive = keep_alive
+        self.graceful_timeout = graceful_timeout
+        self.backlog = backlog
+        self.max_streams = max_streams
+        self._socket: Optional[socket.socket] = None
+        # Worker PID -> start time
+        self._children: Dict[int, float] = {}
+        self._stopping = False
+    
+    def _bind(self) -> socket.socket:
+        """Create the listening socket shared by every worker"""
+        family = socket.AF_INET6 if ":" in self.host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(self.backlog)
+        sock.set_inheritable(True)
+        return sock
+    
+    def _load_app(self) -> Tuple[Any, Any]:
+        """Import the application module and get (module, WSGI application)"""
+        module_name, _, attribute = self.app.partition(":")
+        module = importlib.import_module(module_name)
+        return module, getattr(module, attribute or "app")
+    
+    def _serve(self):
+        """Run one worker until it is told to stop"""
+        module, app = self._load_app()
+        server = _PooledWSGIServer(self._socket, app, self.threads, self.keep_alive, self.max_streams)
+        
+        def stop(signum, frame):
+            # shutdown() waits for serve_forever to return, so it can't run
+            # on the thread that is serving
+            threading.Thread(target=server.shutdown, daemon=True).start()
+        
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop if not hasattr(os, "fork") else signal.SIG_IGN)
+        
+        logger.info(f"Worker {os.getpid()} serving with {self.threads} threads")
+        server.serve_forever(poll_interval=0.5)
+        
+        if not server.drain(self.graceful_timeout):
+            logger.warning(f"Worker {os.getpid()} stopped with requests still running")
+        shutdown = getattr(module, "shutdown", None)
+        if callable(shutdown):
+            shutdown()
+    
+    def _spawn(self):
+        """Fork a worker process"""
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                self._serve()
+            except BaseException:
+                logger.exception(f"Worker {os.getpid()} crashed")
+                code = 1
+            finally:
+                os._exit(code)
+        
+        self._children[pid] = time.monotonic()
+    
+    def _reap(self):
+        """Collect exited workers and replace them unless shutting down"""
+        while self._children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self._children.clear()
+                return
+            if pid == 0:
+                return
+            
+            started = self._children.pop(pid, None)
+            if started is None or self._stopping:
+                continue
+            
+            logger.warning(f"Worker {pid} exited with status {status}; restarting")
+            # Avoid a fork loop when workers fail during startup
+            if time.monotonic() - started < _MIN_WORKER_LIFETIME:
+                time.sleep(_MIN_WORKER_LIFETIME)
+            self._spawn()
+    
+    def _stop_workers(self):
+        """Ask workers to finish, then kill any that outlive the graceful timeout"""
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        
+        deadline = time.monotonic() + self.graceful_timeout + 1
+        while self._children and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.05)
+        
+        for pid in list(self._children):
+            logger.warning(f"Killing worker {pid} after graceful timeout")
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+        self._children.clear()
+    
+    def run(self):
+        """
+        Serve until SIGINT or SIGTERM, then shut down gracefully
+        
+        On platforms without fork, a single worker is run in-process.
+        """
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+        
+        self._socket = self._bind()
+        
+        if not hasattr(os, "fork"):
+            os.environ["CODEV_SERVER_WORKERS"] = "1"
+            try:
+                self._serve()
+            finally:
+                self._socket.close()
+            return
+        
+        def stop(signum, frame):
+            self._stopping = True
+        
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        # Tells the application, imported after fork, that it doesn't have
+        # the host to itself (see the job queue in the web app)
+        os.environ["CODEV_SERVER_WORKERS"] = str(self.workers)
+        
+        logger.info(f"Master {os.getpid()} starting {self.workers} workers on {self.host}:{self.port}")
+        try:
+            for _ in range(self.workers):
+                self._spawn()
+            while not self._stopping:
+                self._reap()
+                time.sleep(0.2)
+        finally:
+            self._stopping = True
+            self._stop_workers()
+            self._socket.close()
+        logger.info("Server stopped")
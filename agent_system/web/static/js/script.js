@@ -5,6 +5,7 @@ const API_BASE = window.location.origin;
 document.addEventListener('DOMContentLoaded', function() {
     loadTools();
     loadHistory();
+    watchTasks();
 });
 
 // Execute Task
@@ -137,18 +138,28 @@ async function loadTools() {
     }
 }
 
+// ETag of the last history page, so unchanged pages come back as 304
+let historyEtag = null;
+
 // Load History
 async function loadHistory() {
     const historyDiv = document.getElementById('history');
 
     try {
-        const response = await fetch(`${API_BASE}/api/history`);
+        const headers = historyEtag ? { 'If-None-Match': historyEtag } : {};
+        const response = await fetch(`${API_BASE}/api/history?limit=20`, { headers });
+
+        if (response.status === 304) {
+            return;
+        }
+
+        historyEtag = response.headers.get('ETag');
         const data = await response.json();
 
         if (data.history && data.history.length > 0) {
             historyDiv.innerHTML = '';
-            // Show most recent first
-            data.history.reverse().forEach(task => {
+            // History is returned most recent first
+            data.history.forEach(task => {
                 const historyItem = document.createElement('div');
                 historyItem.className = 'history-item';
                 historyItem.innerHTML = `
@@ -170,6 +181,27 @@ async function loadHistory() {
     }
 }
 
+// Refresh history whenever any client's task finishes, instead of polling
+function watchTasks() {
+    if (!window.EventSource) {
+        return;
+    }
+
+    let refresh = null;
+    const events = new EventSource(`${API_BASE}/api/events`);
+    events.addEventListener('task', function(e) {
+        const event = JSON.parse(e.data);
+        if (event.status === 'started' || refresh) {
+            return;
+        }
+        // Collapse bursts of finished tasks into one request
+        refresh = setTimeout(() => {
+            refresh = null;
+            loadHistory();
+        }, 250);
+    });
+}
+
 // Helper function to escape HTML
 function escapeHtml(text) {
     const div = document.createElement('div');
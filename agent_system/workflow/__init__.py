@@ -0,0 +1,9 @@
+"""
+Workflow package
+Multi-step tool pipelines declared as DAGs
+"""
+
+from .workflow import Step, Workflow, WorkflowError
+from .runner import WorkflowRunner
+
+__all__ = ["Step", "Workflow", "WorkflowError", "WorkflowRunner"]
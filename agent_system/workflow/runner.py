@@ -0,0 +1,177 @@
+"""
+Workflow Runner
+Runs workflow steps on an agent, concurrently where the DAG allows
+"""
+
+import hashlib
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Dict, Hashable, Mapping, Optional
+from ..cache import CacheBackend, ResultCache, normalize_task
+from .workflow import Step, Workflow, WorkflowError
+
+
+def _memo_key(task: str) -> Hashable:
+    """Digest of a rendered task, so memo keys stay small when upstream results are large"""
+    return hashlib.sha256(normalize_task(task).encode("utf-8")).hexdigest()
+
+
+class WorkflowRunner:
+    """
+    Runs workflows through an agent
+    
+    A step starts as soon as every step it depends on has completed, so
+    independent branches run at the same time. Each step is an ordinary
+    agent task and shows up in its history, metrics and events.
+    
+    Step results are memoized on (tool, rendered task). Upstream results
+    are part of the rendered task, so when one step changes, a re-run
+    recomputes that step and only those downstream steps whose inputs
+    actually changed; everything else is served from the memo.
+    """
+    
+    # Default bound on steps run at once; each is a thread
+    DEFAULT_MAX_WORKERS = 32
+    
+    def __init__(self, agent: Any, max_workers: Optional[int] = None,
+                 memo_backend: Optional[CacheBackend] = None):
+        """
+        Initialize the runner
+        
+        Args:
+            agent: Agent running the steps
+            max_workers: Maximum number of steps run at once (defaults to
+                DEFAULT_MAX_WORKERS, or fewer for smaller workflows)
+            memo_backend: Storage for memoized step results; defaults to
+                1000 results in memory. A SQLiteCacheBackend keeps them
+                across runs of the CLI and shares them between processes
+        """
+        self.agent = agent
+        self.max_workers = max_workers or self.DEFAULT_MAX_WORKERS
+        self.memo = ResultCache(
+            max_entries=1000, default_ttl=None, normalize=_memo_key, backend=memo_backend
+        )
+    
+    def run(self, workflow: Workflow, params: Optional[Mapping[str, Any]] = None,
+            timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Run a workflow
+        
+        A failed step skips every step downstream of it; independent
+        branches still run to completion.
+        
+        Args:
+            workflow: Workflow to run
+            params: Values for the placeholders not filled by step inputs
+            timeout: Time budget in seconds for steps without their own
+        
+        Returns:
+            Workflow status, duration and the record of each step
+        
+        Raises:
+            WorkflowError: If a parameter is missing or a step names an
+                unknown tool
+        """
+        params = dict(params or {})
+        missing = [param for param in workflow.params if param not in params]
+        if missing:
+            raise WorkflowError(f"Missing workflow parameters: {', '.join(missing)}")
+        for step in workflow.steps.values():
+            if step.tool is not None and not self.agent.tool_registry.has_tool(step.tool):
+                raise WorkflowError(f"Step '{step.name}' uses unknown tool '{step.tool}'")
+        
+        start_time = time.perf_counter()
+        records: Dict[str, Dict[str, Any]] = {}
+        results: Dict[str, Any] = {}
+        waiting = {name: len(workflow.steps[name].depends_on) for name in workflow.order}
+        running: Dict[Future, str] = {}
+        
+        def skip(name: str):
+            for downstream in workflow.downstream(name):
+                if downstream not in records:
+                    records[downstream] = {
+                        "step": downstream, "status": "skipped",
+                        "error": f"Upstream step '{name}' did not complete"
+                    }
+                    waiting.pop(downstream, None)
+        
+        workers = max(1, min(self.max_workers, len(workflow.steps)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="workflow") as pool:
+            while waiting or running:
+                # Start every step whose dependencies have completed
+                for name in [name for name, count in waiting.items() if count == 0]:
+                    del waiting[name]
+                    future = pool.submit(self._run_step, workflow.steps[name], results, params, timeout)
+                    running[future] = name
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    record = records[name] = future.result()
+                    if record["status"] != "completed":
+                        skip(name)
+                        continue
+                    results[name] = record["result"]
+                    for downstream in workflow.dependents(name):
+                        if downstream in waiting:
+                            waiting[downstream] -= 1
+        
+        completed = sum(1 for record in records.values() if record["status"] == "completed")
+        return {
+            "workflow": workflow.name,
+            "status": "completed" if completed == len(workflow.steps) else "failed",
+            "completed": completed,
+            "memoized": sum(1 for record in records.values() if record.get("memoized")),
+            "duration": time.perf_counter() - start_time,
+            "end_time": datetime.now().isoformat(),
+            "steps": {name: records[name] for name in workflow.order}
+        }
+    
+    def _run_step(self, step: Step, results: Mapping[str, Any], params: Mapping[str, Any],
+                  timeout: Optional[float]) -> Dict[str, Any]:
+        """
+        Run one step, or serve it from the memo
+        
+        Args:
+            step: Step to run
+            results: Results of completed steps
+            params: Workflow parameters
+            timeout: Default time budget in seconds
+        
+        Returns:
+            Step record
+        """
+        started = time.perf_counter()
+        record: Dict[str, Any] = {"step": step.name, "tool_used": step.tool, "memoized": False}
+        try:
+            record["task"] = task = step.render(results, params)
+            # Route up front so the memo key names the tool that would run
+            tool_name = step.tool or self.agent.tool_registry.router.route(task)
+            if not self.agent.tool_registry.has_tool(tool_name):
+                raise WorkflowError(f"Tool '{tool_name}' not found")
+            # Loading a plugin tool can fail; that fails this step only
+            tool = self.agent.tool_registry.get_tool(tool_name)
+        except Exception as e:
+            record.update(status="failed", error=str(e), duration=time.perf_counter() - started)
+            return record
+        
+        record["tool_used"] = tool_name
+        memoize = step.memoize and self.memo.is_cacheable(tool)
+        if memoize:
+            hit, value = self.memo.get(tool_name, task)
+            if hit:
+                record.update(status="completed", result=value, error=None, memoized=True,
+                              duration=time.perf_counter() - started)
+                return record
+        
+        result = self.agent.execute_task(
+            task, tool_name, timeout=step.timeout if step.timeout is not None else timeout
+        )
+        record.update(
+            task_id=result["task_id"], status=result["status"], result=result["result"],
+            error=result["error"], duration=time.perf_counter() - started
+        )
+        if memoize and result["status"] == "completed":
+            self.memo.set(tool_name, task, result["result"])
+        return record
@@ -0,0 +1,272 @@
+"""
+Workflow Definition
+DAG of tool steps with data passed between them
+"""
+
+import json
+from collections import deque
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set
+from ..templating import Template
+
+
+class WorkflowError(ValueError):
+    """Raised for invalid workflow definitions and unresolvable step inputs"""
+
+
+class Step:
+    """One tool run in a workflow"""
+    
+    def __init__(self, name: str, task: str, tool: Optional[str] = None,
+                 inputs: Optional[Mapping[str, str]] = None, after: Iterable[str] = (),
+                 timeout: Optional[float] = None, memoize: bool = True):
+        """
+        Define a step
+        
+        The task is a template whose ``{placeholders}`` are filled from
+        ``inputs`` or, failing that, from the parameters the workflow is
+        run with. Each input is the name of an earlier step, optionally
+        followed by a dotted path into its result, such as
+        "search.results.0" for the first search hit.
+        
+        Args:
+            name: Step name, unique within the workflow
+            task: Task description template
+            tool: Tool to run (None = route the rendered task)
+            inputs: Placeholder name -> "step" or "step.path"
+            after: Steps that must finish first without passing data
+            timeout: Time budget in seconds
+            memoize: Whether the result may be reused by later runs
+        
+        Raises:
+            WorkflowError: If the name or task template is invalid
+        """
+        if not name or "." in name:
+            raise WorkflowError(f"Invalid step name '{name}'")
+        try:
+            self.template = Template(task, name=f"<step {name}>")
+        except ValueError as e:
+            raise WorkflowError(str(e)) from None
+        
+        self.name = name
+        self.task = task
+        self.tool = tool
+        self.inputs: Dict[str, str] = dict(inputs or {})
+        self.after: List[str] = list(after)
+        self.timeout = timeout
+        self.memoize = memoize
+        
+        self.depends_on: List[str] = []
+        for source in list(self.inputs.values()) + self.after:
+            upstream = source.split(".", 1)[0]
+            if upstream not in self.depends_on:
+                self.depends_on.append(upstream)
+    
+    @property
+    def params(self) -> List[str]:
+        """Placeholders filled from workflow parameters"""
+        return [field for field in self.template.fields if field not in self.inputs]
+    
+    def render(self, results: Mapping[str, Any], params: Mapping[str, Any]) -> str:
+        """
+        Build the task description from upstream results and parameters
+        
+        Args:
+            results: Results of finished steps, by step name
+            params: Workflow parameters
+        
+        Returns:
+            Task description
+        
+        Raises:
+            WorkflowError: If an input path doesn't exist in its step's result
+        """
+        values = {field: _text(params[field]) for field in self.params}
+        for field, source in self.inputs.items():
+            upstream, _, path = source.partition(".")
+            values[field] = _text(_lookup(results[upstream], path, source))
+        return self.template.render(values)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the step to a dictionary"""
+        return {
+            "name": self.name,
+            "task": self.task,
+            "tool": self.tool,
+            "inputs": self.inputs,
+            "after": self.after,
+            "timeout": self.timeout,
+            "memoize": self.memoize
+        }
+
+
+def _lookup(value: Any, path: str, source: str) -> Any:
+    """Follow a dotted path of dictionary keys and list indices"""
+    for part in path.split(".") if path else ():
+        try:
+            if isinstance(value, (list, tuple)):
+                value = value[int(part)]
+            else:
+                value = value[part]
+        except (KeyError, IndexError, TypeError, ValueError):
+            raise WorkflowError(f"Input '{source}' not found in the step result") from None
+    return value
+
+
+def _text(value: Any) -> str:
+    """Render a result value for use in a task description"""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (list, tuple)):
+        return "\n".join(_text(item) for item in value)
+    if isinstance(value, dict):
+        return json.dumps(value, default=str)
+    return str(value)
+
+
+class Workflow:
+    """
+    Directed acyclic graph of steps
+    
+    Steps are validated and put in dependency order when the workflow is
+    created, so a workflow that can be built can be run.
+    """
+    
+    def __init__(self, steps: Iterable[Step], name: str = "workflow"):
+        """
+        Build a workflow
+        
+        Args:
+            steps: Steps in any order
+            name: Workflow name
+        
+        Raises:
+            WorkflowError: On duplicate step names, unknown dependencies
+                or dependency cycles
+        """
+        self.name = name
+        self.steps: Dict[str, Step] = {}
+        for step in steps:
+            if step.name in self.steps:
+                raise WorkflowError(f"Duplicate step '{step.name}'")
+            self.steps[step.name] = step
+        
+        for step in self.steps.values():
+            for upstream in step.depends_on:
+                if upstream not in self.steps:
+                    raise WorkflowError(f"Step '{step.name}' depends on unknown step '{upstream}'")
+        
+        self.order = self._sort()
+    
+    def _sort(self) -> List[str]:
+        """Order steps so every step comes after its dependencies (Kahn's algorithm)"""
+        waiting = {name: len(step.depends_on) for name, step in self.steps.items()}
+        # Breadth first, so independent steps keep their definition order
+        ready = deque(name for name, count in waiting.items() if count == 0)
+        order: List[str] = []
+        
+        while ready:
+            name = ready.popleft()
+            order.append(name)
+            for downstream in self.dependents(name):
+                waiting[downstream] -= 1
+                if waiting[downstream] == 0:
+                    ready.append(downstream)
+        
+        if len(order) < len(self.steps):
+            cycle = sorted(name for name, count in waiting.items() if count)
+            raise WorkflowError(f"Dependency cycle between steps: {', '.join(cycle)}")
+        return order
+    
+    def dependents(self, name: str) -> List[str]:
+        """
+        Get the steps that directly depend on a step
+        
+        Args:
+            name: Step name
+        
+        Returns:
+            Names of the dependent steps
+        """
+        return [step.name for step in self.steps.values() if name in step.depends_on]
+    
+    def downstream(self, name: str) -> Set[str]:
+        """
+        Get every step that depends on a step, directly or not
+        
+        Args:
+            name: Step name
+        
+        Returns:
+            Names of the affected steps
+        """
+        found: Set[str] = set()
+        pending = [name]
+        while pending:
+            for dependent in self.dependents(pending.pop()):
+                if dependent not in found:
+                    found.add(dependent)
+                    pending.append(dependent)
+        return found
+    
+    @property
+    def params(self) -> List[str]:
+        """Parameters the workflow must be run with"""
+        params: List[str] = []
+        for name in self.order:
+            for param in self.steps[name].params:
+                if param not in params:
+                    params.append(param)
+        return params
+    
+    @classmethod
+    def from_dict(cls, definition: Mapping[str, Any]) -> "Workflow":
+        """
+        Build a workflow from a definition such as a parsed JSON file
+        
+        The definition has a "steps" list of objects with the arguments of
+        Step ("name", "task", and optionally "tool", "inputs", "after",
+        "timeout" and "memoize") and an optional "name".
+        
+        Args:
+            definition: Workflow definition
+        
+        Returns:
+            Workflow
+        
+        Raises:
+            WorkflowError: If the definition is invalid
+        """
+        steps = definition.get("steps") if isinstance(definition, Mapping) else None
+        if not isinstance(steps, list) or not steps:
+            raise WorkflowError("A workflow needs a non-empty 'steps' list")
+        
+        built = []
+        for i, step in enumerate(steps):
+            if not isinstance(step, Mapping) or "name" not in step or "task" not in step:
+                raise WorkflowError(f"Step {i + 1} needs a 'name' and a 'task'")
+            try:
+                built.append(Step(**step))
+            except TypeError as e:
+                raise WorkflowError(f"Invalid step '{step['name']}': {e}") from None
+        return cls(built, name=definition.get("name", "workflow"))
+    
+    @classmethod
+    def load(cls, path: str) -> "Workflow":
+        """
+        Load a workflow definition from a JSON file
+        
+        Args:
+            path: JSON file path
+        
+        Returns:
+            Workflow
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the workflow to a definition accepted by ``from_dict``"""
+        return {
+            "name": self.name,
+            "steps": [self.steps[name].to_dict() for name in self.order]
+        }
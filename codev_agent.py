@@ -4,8 +4,14 @@ Vinod-powered AI Agent for task execution and automation.
 """
 
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime
 from typing import Dict, Any, List, Optional
 from tool_registry import ToolRegistry
+from agent_system.history import HistoryStore, TaskHistory
+from agent_system.tools import TaskTimeout
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -14,10 +20,18 @@ logger = logging.getLogger(__name__)
 class CodevAgent:
     """Main agent class for task orchestration and execution."""
     
-    def __init__(self, name: str = "Codev"):
+    def __init__(self, name: str = "Codev", history: Optional[HistoryStore] = None,
+                 default_timeout: Optional[float] = None,
+                 tool_timeouts: Optional[Dict[str, float]] = None):
         self.name = name
         self.tool_registry = ToolRegistry()
-        self.task_history: List[Dict[str, Any]] = []
+        self.task_history: HistoryStore = history if history is not None else TaskHistory()
+        self._task_ids = self.task_history.task_ids()
+        # Time budgets in seconds; tasks over budget are recorded as 'timeout'
+        self.default_timeout = default_timeout
+        self.tool_timeouts: Dict[str, float] = dict(tool_timeouts or {})
+        self._timed_pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
         logger.info(f"Initialized {self.name} agent")
     
     def register_tool(self, tool_name: str, tool_func, description: str):
@@ -27,30 +41,58 @@ class CodevAgent:
     
     def execute_task(self, task_name: str, **kwargs) -> Dict[str, Any]:
         """Execute a registered task/tool."""
+        start_time = time.perf_counter()
+        task_record = {
+            'task_id': next(self._task_ids),
+            'task': task_name,
+            'tool_used': task_name,
+            'start_time': datetime.now().isoformat(),
+            'params': kwargs
+        }
+        
         try:
             logger.info(f"Executing task: {task_name}")
-            result = self.tool_registry.execute(task_name, **kwargs)
-            
-            # Record task execution
-            task_record = {
-                'task': task_name,
-                'status': 'success',
-                'result': result,
-                'params': kwargs
-            }
-            self.task_history.append(task_record)
-            
-            return task_record
+            task_record['result'] = self._run(task_name, kwargs)
+            task_record['status'] = 'success'
+        except TaskTimeout as e:
+            logger.error(f"Task timed out: {e}")
+            task_record['status'] = 'timeout'
+            task_record['error'] = str(e)
         except Exception as e:
             logger.error(f"Task execution failed: {e}")
-            task_record = {
-                'task': task_name,
-                'status': 'failed',
-                'error': str(e),
-                'params': kwargs
-            }
-            self.task_history.append(task_record)
-            return task_record
+            task_record['status'] = 'failed'
+            task_record['error'] = str(e)
+        
+        # Record task execution
+        task_record['duration'] = time.perf_counter() - start_time
+        task_record['end_time'] = datetime.now().isoformat()
+        self.task_history.append(task_record)
+        
+        return task_record
+    
+    def _budget(self, task_name: str) -> Optional[float]:
+        """Get the time budget of a tool."""
+        return self.tool_timeouts.get(task_name, self.default_timeout)
+    
+    def _run(self, task_name: str, kwargs: Dict[str, Any]) -> Any:
+        """Run a tool, giving up on it once its time budget is spent."""
+        budget = self._budget(task_name)
+        if budget is None:
+            return self.tool_registry.execute(task_name, **kwargs)
+        
+        if self._timed_pool is None:
+            with self._lock:
+                if self._timed_pool is None:
+                    self._timed_pool = ThreadPoolExecutor(thread_name_prefix=f"{self.name}-timed")
+        future = self._timed_pool.submit(self.tool_registry.execute, task_name, **kwargs)
+        try:
+            return future.result(timeout=budget)
+        except FutureTimeoutError:
+            # A TimeoutError raised by the tool itself is an ordinary failure
+            if future.done():
+                raise
+            future.cancel()
+            raise TaskTimeout(f"Task exceeded its {budget:g}s time budget")
     
     def list_tools(self) -> List[str]:
         """List all registered tools."""
@@ -58,11 +100,15 @@ class CodevAgent:
     
     def get_task_history(self) -> List[Dict[str, Any]]:
         """Get agent's task execution history."""
-        return self.task_history
+        return self.task_history.to_list()
+    
+    def get_task_by_id(self, task_id: int) -> Optional[Dict[str, Any]]:
+        """Get a recorded task by ID."""
+        return self.task_history.get(task_id)
     
     def clear_history(self):
         """Clear task execution history."""
-        self.task_history = []
+        self.task_history.clear()
         logger.info("Task history cleared")
 
 
@@ -14,6 +14,7 @@ def main():
         print("Usage: python main.py {cli|web} [options]")
         print("\nFor CLI mode: python main.py cli [cli-options]")
         print("For Web mode: python main.py web [--host HOST] [--port PORT] [--no-debug]")
+        print("              [--server prefork] [--workers N] [--threads N]")
         sys.exit(1)
     
     mode = sys.argv[1]
@@ -44,13 +45,63 @@ def main():
             action='store_true',
             help='Disable debug mode for web server'
         )
+        parser.add_argument(
+            '--server',
+            choices=['dev', 'prefork'],
+            default='dev',
+            help='dev: Flask development server; prefork: multi-process production server (default: dev)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Worker processes for the prefork server (default: CPU count)'
+        )
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=8,
+            help='Request threads per worker for the prefork server (default: 8)'
+        )
+        parser.add_argument(
+            '--keep-alive',
+            type=float,
+            default=5.0,
+            help='Seconds to keep idle connections open (default: 5)'
+        )
+        parser.add_argument(
+            '--graceful-timeout',
+            type=float,
+            default=30.0,
+            help='Seconds workers get to finish requests on shutdown (default: 30)'
+        )
+        parser.add_argument(
+            '--max-streams',
+            type=int,
+            default=1000,
+            help='Event streams per worker held outside the request threads (default: 1000)'
+        )
         args = parser.parse_args(sys.argv[2:])
         
-        from agent_system.web.app import run_server
         print(f"\n🚀 Starting Codev AI Agent Web Interface...")
         print(f"📍 Server running at http://{args.host}:{args.port}")
         print(f"Press CTRL+C to quit\n")
-        run_server(host=args.host, port=args.port, debug=not args.no_debug)
+        
+        if args.server == 'prefork':
+            # The app is imported by each worker after fork, not here
+            from agent_system.web.server import PreforkServer
+            PreforkServer(
+                host=args.host,
+                port=args.port,
+                workers=args.workers,
+                threads=args.threads,
+                keep_alive=args.keep_alive,
+                graceful_timeout=args.graceful_timeout,
+                max_streams=args.max_streams
+            ).run()
+        else:
+            from agent_system.web.app import run_server
+            run_server(host=args.host, port=args.port, debug=not args.no_debug)
     else:
         print(f"Error: Invalid mode '{mode}'. Use 'cli' or 'web'.")
         sys.exit(1)
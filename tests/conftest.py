@@ -0,0 +1,13 @@
+"""
+Test configuration
+Makes the agent_system package importable when pytest runs from any directory
+"""
+
+import logging
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Agents log every task at INFO; keep test output readable
+logging.disable(logging.INFO)
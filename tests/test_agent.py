@@ -0,0 +1,104 @@
+"""
+Agent tests
+"""
+
+import threading
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from agent_system.agent import Agent
+from agent_system.history import SQLiteTaskHistory
+from agent_system.tools import BaseTool
+
+
+class UpperTool(BaseTool):
+    def __init__(self):
+        super().__init__("upper", "Upper-case the task")
+
+    def execute(self, task):
+        return task.upper()
+
+
+class LocalTool(BaseTool):
+    """Holds a lock, so it can't be sent to worker processes"""
+
+    def __init__(self):
+        super().__init__("local", "Can't be pickled")
+        self.lock = threading.Lock()
+
+    def execute(self, task):
+        return task
+
+
+class SlowTool(BaseTool):
+    def __init__(self):
+        super().__init__("slow", "Sleeps")
+
+    def execute(self, task):
+        time.sleep(float(task))
+        return task
+
+
+@pytest.fixture
+def agent():
+    agent = Agent("test")
+    for tool in (UpperTool(), LocalTool(), SlowTool()):
+        agent.tool_registry.register_tool(tool)
+    yield agent
+    agent.close()
+
+
+def test_batch_results_follow_submission_order(agent):
+    # Later tasks finish first
+    batch = agent.execute_batch(["0.05", "0.02", "0"], "slow", max_workers=3)
+    assert [r["result"] for r in batch["results"]] == ["0.05", "0.02", "0"]
+    ids = [r["task_id"] for r in batch["results"]]
+    assert ids == sorted(ids) and len(set(ids)) == 3
+    assert batch["completed"] == 3
+
+
+def test_batch_routes_each_task(agent):
+    batch = agent.execute_batch(["Search for Python tutorials", "Generate a Python function"], max_workers=2)
+    assert [r["tool_used"] for r in batch["results"]] == ["search", "code_generator"]
+
+
+def test_process_batch_runs_custom_tools(agent):
+    batch = agent.execute_batch(["a", "b"], "upper", max_workers=2, executor="process")
+    assert [r["result"] for r in batch["results"]] == ["A", "B"]
+
+
+def test_process_batch_reports_unpicklable_tools(agent):
+    batch = agent.execute_batch(["a"], "local", executor="process")
+    (result,) = batch["results"]
+    assert result["status"] == "failed"
+    assert "thread executor" in result["error"]
+
+
+def test_batch_timeout(agent):
+    batch = agent.execute_batch(["1", "0"], "slow", max_workers=2, timeout=0.1)
+    assert [r["status"] for r in batch["results"]] == ["timeout", "completed"]
+    assert batch["timed_out"] == 1
+
+
+def test_unknown_executor(agent):
+    with pytest.raises(ValueError):
+        agent.execute_batch(["a"], executor="fiber")
+
+
+def test_concurrent_tasks_get_distinct_ids(agent):
+    with ThreadPoolExecutor(16) as pool:
+        results = list(pool.map(lambda i: agent.execute_task(str(i), "upper"), range(200)))
+    assert len({r["task_id"] for r in results}) == 200
+    assert len(agent.task_history) == 200
+
+
+def test_sqlite_stores_sharing_a_file_reserve_distinct_ids(tmp_path):
+    path = str(tmp_path / "history.db")
+    stores = [SQLiteTaskHistory(path, id_block_size=8) for _ in range(2)]
+    sources = [store.task_ids() for store in stores]
+    ids = [next(sources[i % 2]) for i in range(40)]
+    for store in stores:
+        store.close()
+    assert len(set(ids)) == 40
+    # Blocks interleave between the stores
+    assert ids[:4] == [1, 9, 2, 10]
@@ -0,0 +1,52 @@
+"""
+Legacy CodevAgent tests
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+import codev_agent
+from codev_agent import CodevAgent
+from agent_system.history import SQLiteTaskHistory
+
+
+def test_agents_sharing_a_database_get_distinct_ids(tmp_path):
+    path = str(tmp_path / "history.db")
+    agents = [CodevAgent(f"agent{i}", history=SQLiteTaskHistory(path, id_block_size=4))
+              for i in range(2)]
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda i: agents[i % 2].execute_task("echo", message=str(i)),
+                                range(40)))
+    for agent in agents:
+        agent.task_history.close()
+    task_ids = [result["task_id"] for result in results]
+    assert len(set(task_ids)) == len(task_ids)
+
+    # A restarted agent continues after every reserved block
+    agent = CodevAgent(history=SQLiteTaskHistory(path, id_block_size=4))
+    assert agent.execute_task("echo", message="again")["task_id"] > max(task_ids)
+    agent.task_history.close()
+
+
+def test_timed_tasks_share_one_pool(monkeypatch):
+    created = []
+
+    class CountingPool(ThreadPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            created.append(self)
+            time.sleep(0.01)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(codev_agent, "ThreadPoolExecutor", CountingPool)
+    agent = CodevAgent(default_timeout=1.0)
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda i: agent.execute_task("echo", message=str(i)), range(16)))
+    assert all(result["status"] == "success" for result in results)
+    assert len(created) == 1
+
+
+def test_timeout_is_recorded():
+    agent = CodevAgent(tool_timeouts={"sleep": 0.05})
+    agent.register_tool("sleep", lambda: time.sleep(1), "Sleep")
+    result = agent.execute_task("sleep")
+    assert result["status"] == "timeout"
+    assert 0 < result["duration"] < 1
@@ -0,0 +1,67 @@
+"""
+Disk index tests
+"""
+
+import os
+import pytest
+from agent_system.search import DiskIndex, InvertedIndex, write_index
+
+
+DOCS = [
+    "Python lists and dictionaries",
+    "Flask routes and Python views",
+    "Docker images for Python services",
+]
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    index = InvertedIndex()
+    for doc in DOCS:
+        index.add_document(doc)
+    path = str(tmp_path / "docs.idx")
+    write_index(index, path)
+    return path
+
+
+def open_fds():
+    return len(os.listdir("/proc/self/fd"))
+
+
+def test_disk_index_matches_memory_index(index_path):
+    memory = InvertedIndex()
+    for doc in DOCS:
+        memory.add_document(doc)
+    with DiskIndex(index_path) as disk:
+        assert disk.search("python flask") == memory.search("python flask")
+        assert disk.document(1) == DOCS[1]
+
+
+def test_close_with_live_postings(index_path):
+    index = DiskIndex(index_path)
+    doc_ids, freqs = index.postings("python")
+    lengths = index.doc_lengths()
+    index.close()
+    assert list(doc_ids) == [0, 1, 2]
+    assert list(freqs) == [1, 1, 1]
+    assert len(lengths) == 3
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc")
+@pytest.mark.parametrize("keep", [0, 16, 80, -8])
+def test_damaged_files_raise_value_error(index_path, keep):
+    with open(index_path, "rb") as f:
+        data = f.read()
+    with open(index_path, "wb") as f:
+        f.write(data[:keep])
+    before = open_fds()
+    with pytest.raises(ValueError):
+        DiskIndex(index_path)
+    assert open_fds() == before
+
+
+def test_not_an_index(tmp_path):
+    path = tmp_path / "junk.idx"
+    path.write_bytes(b"x" * 200)
+    with pytest.raises(ValueError, match="not a search index"):
+        DiskIndex(str(path))
@@ -0,0 +1,51 @@
+"""
+Event broker tests
+"""
+
+import itertools
+from agent_system.events import EventBroker
+
+
+def take(iterator, count):
+    return list(itertools.islice(iterator, count))
+
+
+def test_listen_resumes_after_last_event():
+    broker = EventBroker()
+    for i in range(3):
+        broker.publish("task", n=i)
+    events = take(broker.listen(1), 2)
+    assert [event["id"] for event in events] == [2, 3]
+
+
+def test_listen_without_last_event_gets_only_new_events():
+    broker = EventBroker()
+    broker.publish("task")
+    assert take(broker.listen(heartbeat=0.01), 1) == [None]
+
+
+def test_last_event_from_another_broker_replays_buffer():
+    # The client saw event 50 of a broker that has since restarted
+    broker = EventBroker()
+    broker.publish("task", n=1)
+    broker.publish("task", n=2)
+    events = take(broker.listen(50), 2)
+    assert [event["n"] for event in events] == [1, 2]
+
+
+def test_resume_point_checks_epoch():
+    broker = EventBroker()
+    for _ in range(5):
+        broker.publish("task")
+    assert broker.resume_point(broker.epoch, 3) == 3
+    assert broker.resume_point(EventBroker().epoch, 3) == 0
+    assert broker.resume_point(None, 3) == 0
+    assert broker.resume_point(broker.epoch, 9) == 0
+
+
+def test_listen_ends_when_closed():
+    broker = EventBroker()
+    listener = broker.listen(heartbeat=0.01)
+    assert next(listener) is None
+    broker.close()
+    assert list(listener) == []
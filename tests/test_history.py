@@ -0,0 +1,110 @@
+"""
+History store tests
+"""
+
+import sqlite3
+from datetime import datetime
+import pytest
+from agent_system.history import SQLiteTaskHistory, TaskHistory
+
+
+def task(task_id, status="completed", tool="search"):
+    now = datetime.now().isoformat()
+    return {"task_id": task_id, "task": f"task {task_id}", "status": status, "result": None,
+            "error": None, "tool_used": tool, "start_time": now, "end_time": now, "duration": 0.0}
+
+
+def ids(records):
+    return [record["task_id"] for record in records]
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        yield TaskHistory()
+    else:
+        store = SQLiteTaskHistory(str(tmp_path / "history.db"), flush_interval=0.01)
+        yield store
+        store.close()
+
+
+def append(store, *task_ids):
+    for task_id in task_ids:
+        store.append(task(task_id))
+    if isinstance(store, SQLiteTaskHistory):
+        store.flush()
+
+
+def test_changes_follow_write_order(store):
+    append(store, 1, 33, 2, 34)
+    records, position = store.changes(0)
+    assert ids(records) == [1, 33, 2, 34]
+
+    # A task started early that finishes after the poller saw task 34
+    append(store, 3)
+    records, position = store.changes(position)
+    assert ids(records) == [3]
+    assert store.changes(position) == ([], position)
+
+
+def test_changes_limit(store):
+    append(store, 5, 4, 3)
+    records, position = store.changes(0, limit=2)
+    assert ids(records) == [5, 4]
+    records, position = store.changes(position, limit=2)
+    assert ids(records) == [3]
+
+
+def test_changes_returns_updated_tasks_again(store):
+    append(store, 1, 2)
+    _, position = store.changes(0)
+    append(store, 1)
+    records, _ = store.changes(position)
+    assert ids(records) == [1]
+
+
+def test_unknown_position_starts_over(store):
+    append(store, 1, 2)
+    records, position = store.changes(1000)
+    assert ids(records) == [1, 2]
+    assert position == 2
+
+
+def test_page_is_in_id_order(store):
+    append(store, 1, 33, 2, 34, 3)
+    assert ids(store.page(3)) == [34, 33, 3]
+    assert ids(store.page(3, before=3)) == [2, 1]
+
+
+def test_sqlite_positions_survive_reopen(tmp_path):
+    path = str(tmp_path / "history.db")
+    store = SQLiteTaskHistory(path)
+    append(store, 2, 1)
+    _, position = store.changes(0)
+    store.close()
+
+    store = SQLiteTaskHistory(path)
+    append(store, 3)
+    records, _ = store.changes(position)
+    store.close()
+    assert ids(records) == [3]
+
+
+def test_sqlite_migrates_databases_without_positions(tmp_path):
+    path = str(tmp_path / "history.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE task_history (task_id INTEGER PRIMARY KEY, task TEXT NOT NULL, "
+        "status TEXT NOT NULL, tool_used TEXT, start_time REAL NOT NULL, "
+        "end_time REAL NOT NULL, duration REAL NOT NULL, data TEXT NOT NULL)"
+    )
+    conn.execute("INSERT INTO task_history VALUES (7, 'old', 'completed', NULL, 0, 0, 0, "
+                 "'{\"task_id\": 7}')")
+    conn.commit()
+    conn.close()
+
+    store = SQLiteTaskHistory(path)
+    append(store, 8)
+    records, _ = store.changes(0)
+    store.close()
+    assert ids(records) == [7, 8]
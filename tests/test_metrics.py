@@ -0,0 +1,63 @@
+"""
+Metrics tests
+"""
+
+import threading
+import pytest
+from agent_system.cli import CLI
+from agent_system.metrics import AgentMetrics
+
+
+def record(metrics, tasks):
+    for _ in range(tasks):
+        metrics.record_route("search", 0.001)
+        metrics.record_tool("search", 0.002)
+        metrics.record_task("search", "completed", 0.0001)
+    metrics.record_task("search", "failed", 0.0001)
+
+
+def test_records_from_many_threads_add_up():
+    metrics = AgentMetrics()
+    threads = [threading.Thread(target=record, args=(metrics, 100)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    record(metrics, 10)
+
+    summary = metrics.summary()
+    stats = summary["tools"]["search"]
+    assert stats["tasks"] == 415
+    assert stats["routed"] == 410
+    assert stats["error_rate"] == pytest.approx(5 / 415)
+    assert 0.002 <= stats["p50"] <= 0.0025
+    assert summary["history_writes"] == 415
+    assert metrics.tool_duration.labels("search").count == 410
+
+
+def test_unused_series_are_not_exported():
+    metrics = AgentMetrics()
+    metrics.record_task(None, "failed", 0.0001)
+    text = metrics.to_prometheus()
+    assert 'codev_tasks_total{tool="",status="failed"} 1' in text
+    assert "codev_route_decisions_total{" not in text
+    assert "codev_tool_duration_seconds_count{" not in text
+
+
+def test_metrics_command_requires_url(capsys):
+    with pytest.raises(SystemExit):
+        CLI().run(["metrics"])
+    assert "--url" in capsys.readouterr().err
+
+
+def test_metrics_command_reports_unreachable_server(capsys):
+    CLI().run(["metrics", "--url", "http://127.0.0.1:9"])
+    assert "Could not fetch metrics" in capsys.readouterr().out
+
+
+def test_batch_metrics_show_local_tasks(tmp_path, capsys):
+    tasks = tmp_path / "tasks.txt"
+    tasks.write_text("Search for Python tutorials\nGenerate a Python function\n")
+    CLI().run(["batch", str(tasks), "--metrics"])
+    out = capsys.readouterr().out
+    assert "search:" in out and "code_generator:" in out
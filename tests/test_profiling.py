@@ -0,0 +1,56 @@
+"""
+Profiler tests
+"""
+
+import time
+from agent_system.agent import Agent
+from agent_system.cli import CLI
+from agent_system.profiling import TaskProfiler
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_short_sampled_task_is_not_empty():
+    profiler = TaskProfiler(mode="sample", interval=1.0)
+    profile = profiler.start()
+    with profile.attach():
+        pass
+    assert profile.total == 1
+    (stack,) = profile.stacks
+    assert stack[-1] == "test_profiling:test_short_sampled_task_is_not_empty"
+
+
+def test_long_sampled_task_gets_samples():
+    profiler = TaskProfiler(mode="sample", interval=0.001)
+    profile = profiler.start()
+    with profile.attach():
+        busy(0.1)
+    assert profile.total > 1
+    assert any("test_profiling:busy" in stack for stack in profile.stacks)
+
+
+def test_trace_profile_times_calls():
+    profile = TaskProfiler().start("trace")
+    with profile.attach():
+        busy(0.001)
+    assert any(stack[-1] == "test_profiling:busy" for stack in profile.stacks)
+
+
+def test_agent_sample_profile_of_short_task():
+    agent = Agent("test", profiler=TaskProfiler(interval=1.0))
+    result = agent.execute_task("Search for Python tutorials", profile="sample")
+    assert result["profile"].strip()
+
+
+def test_cli_suggests_trace_mode_for_short_tasks(tmp_path, capsys):
+    cli = CLI()
+    cli.agent.profiler.interval = 1.0
+    path = tmp_path / "task.prof"
+    cli.run(["execute", "Search for Python tutorials", "--profile", str(path),
+             "--profile-mode", "sample"])
+    assert "--profile-mode trace" in capsys.readouterr().out
+    assert path.read_text().strip()
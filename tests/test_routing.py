@@ -0,0 +1,53 @@
+"""
+Routing tests
+"""
+
+import pytest
+from agent_system.routing import KeywordRouter
+from agent_system.tool_registry import ToolRegistry
+
+
+@pytest.fixture
+def router():
+    return ToolRegistry(entry_points=False, plugin_dirs=[]).router
+
+
+@pytest.mark.parametrize("task, tool", [
+    ("Write a Dockerfile for docker compose", "code_generator"),
+    ("Search docker docs", "search"),
+    ("Explain the docs for Flask", "docs"),
+    ("Show the documentation for Flask", "docs"),
+    ("Find Python tutorials", "search"),
+    ("Generate a Python function", "code_generator"),
+    ("Create classes for the user model", "code_generator"),
+])
+def test_builtin_routes(router, task, tool):
+    assert router.route(task) == tool
+
+
+def test_keywords_match_whole_words_only(router):
+    scores = router.explain("Decode unicode in a dockerfile")["scores"]
+    assert scores == {"search": 0.0, "code_generator": 0.0, "docs": 0.0}
+
+
+def test_keywords_match_plurals():
+    router = KeywordRouter()
+    router.add_rules("docs", keywords={"doc": 1.0, "class": 1.0})
+    matches = router.explain("docs about classes")["matches"]
+    assert [match["text"] for match in matches] == ["docs", "classes"]
+    assert [match["rule"] for match in matches] == ["doc", "class"]
+
+
+def test_keywords_with_symbols():
+    router = KeywordRouter()
+    router.add_rules("cpp", keywords={"c++": 1.0})
+    router.add_rules("other", keywords={"other": 0.5})
+    assert router.route("write it in c++") == "cpp"
+    assert router.explain("c++x")["scores"]["cpp"] == 0.0
+
+
+def test_patterns_are_not_word_bounded():
+    router = KeywordRouter()
+    router.add_rules("files", patterns={r"\.py": 1.0})
+    router.add_rules("other", keywords={"other": 1.0})
+    assert router.route("open main.pyc") == "files"
@@ -0,0 +1,76 @@
+"""
+Tool registry tests
+"""
+
+import json
+import pytest
+from agent_system.agent import Agent
+from agent_system.tool_registry import ToolRegistry
+from agent_system.tools import ToolSpec
+
+
+PLUGIN_MODULE = '''
+from agent_system.tools import BaseTool
+
+class EchoTool(BaseTool):
+    def __init__(self):
+        super().__init__("echo", "Echo the task")
+
+    def execute(self, task):
+        return task
+'''
+
+
+def write_manifest(directory, name, manifest):
+    (directory / name).write_text(json.dumps(manifest))
+
+
+@pytest.fixture
+def plugin_dir(tmp_path):
+    (tmp_path / "echo_plugin.py").write_text(PLUGIN_MODULE)
+    write_manifest(tmp_path, "echo.json", {
+        "name": "echo", "factory": "echo_plugin:EchoTool",
+        "routing_keywords": {"echo": 2.0}
+    })
+    return tmp_path
+
+
+def test_plugin_tools_load_lazily(plugin_dir):
+    registry = ToolRegistry(plugin_dirs=[str(plugin_dir)], entry_points=False)
+    assert registry.has_tool("echo")
+    assert not registry.get_spec("echo").loaded
+    assert registry.router.route("echo this") == "echo"
+    assert registry.get_tool("echo").execute("hi") == "hi"
+
+
+def test_bad_routing_pattern_is_skipped(plugin_dir, caplog):
+    write_manifest(plugin_dir, "bad.json", {
+        "name": "bad", "factory": "echo_plugin:EchoTool", "routing_patterns": {"(": 1.0}
+    })
+    registry = ToolRegistry(plugin_dirs=[str(plugin_dir)], entry_points=False)
+    assert not registry.has_tool("bad")
+    assert registry.has_tool("echo")
+    assert any("bad.json" in message for message in caplog.messages)
+
+
+def test_broken_manifests_are_skipped(plugin_dir):
+    (plugin_dir / "garbage.json").write_text("{not json")
+    write_manifest(plugin_dir, "incomplete.json", {"name": "nofactory"})
+    write_manifest(plugin_dir, "unknown.json", {"name": "x", "factory": "m:X", "colour": "red"})
+    registry = ToolRegistry(plugin_dirs=[str(plugin_dir)], entry_points=False)
+    assert sorted(registry.list_tools()) == ["code_generator", "docs", "echo", "search"]
+
+
+def test_agent_starts_with_broken_plugins(plugin_dir, monkeypatch):
+    write_manifest(plugin_dir, "bad.json", {
+        "name": "bad", "factory": "echo_plugin:EchoTool", "routing_patterns": {"[": 1.0}
+    })
+    monkeypatch.setenv("CODEV_PLUGIN_DIRS", str(plugin_dir))
+    agent = Agent("test")
+    assert "bad" not in agent.list_tools()
+    assert agent.execute_task("echo hello")["tool_used"] == "echo"
+
+
+def test_manifest_rejects_invalid_pattern():
+    with pytest.raises(ValueError, match="Invalid routing pattern"):
+        ToolSpec.from_manifest({"name": "bad", "factory": "m:X", "routing_patterns": {"(": 1.0}})
@@ -0,0 +1,92 @@
+"""
+Web API tests
+"""
+
+import pytest
+from agent_system.history import TaskHistory
+from agent_system.web import app as web
+from test_history import task
+
+
+@pytest.fixture
+def history(monkeypatch):
+    history = TaskHistory()
+    monkeypatch.setattr(web.agent, "task_history", history)
+    return history
+
+
+@pytest.fixture
+def client():
+    return web.app.test_client()
+
+
+def poll(client, since, **params):
+    return client.get("/api/history", query_string={"since": since, **params})
+
+
+def test_history_since_returns_late_tasks(history, client):
+    for task_id in (1, 33, 2, 34):
+        history.append(task(task_id))
+    response = poll(client, 0)
+    assert [t["task_id"] for t in response.json["history"]] == [1, 33, 2, 34]
+    since = response.json["next_since"]
+
+    assert poll(client, since).status_code == 304
+
+    # Task 3 started before task 34 but finished after the poller saw it
+    history.append(task(3))
+    response = poll(client, since)
+    assert [t["task_id"] for t in response.json["history"]] == [3]
+
+
+def test_history_since_filters(history, client):
+    history.append(task(1, status="failed"))
+    history.append(task(2))
+    response = poll(client, 0, status="failed")
+    assert [t["task_id"] for t in response.json["history"]] == [1]
+    assert response.json["next_since"] == 2
+
+
+def test_history_since_rejects_cursor_and_bad_values(history, client):
+    assert poll(client, 0, cursor="abc").status_code == 400
+    assert poll(client, -1).status_code == 400
+    assert poll(client, "x").status_code == 400
+
+
+def test_history_etag(history, client):
+    history.append(task(1))
+    response = client.get("/api/history")
+    assert [t["task_id"] for t in response.json["history"]] == [1]
+    etag = response.headers["ETag"]
+    assert client.get("/api/history", headers={"If-None-Match": etag}).status_code == 304
+
+    history.append(task(2))
+    assert client.get("/api/history", headers={"If-None-Match": etag}).status_code == 200
+
+
+def read_events(response, count):
+    chunks = response.response
+    try:
+        return [next(chunks).decode() for _ in range(count)]
+    finally:
+        response.close()
+
+
+def test_events_resume_from_another_process(client):
+    events = web.agent.events
+    event_id = events.publish("task", task_id=-1, status="started")
+    # A Last-Event-ID from another worker or from before a restart
+    response = client.get("/api/events", headers={"Last-Event-ID": f"other-{event_id + 100}"},
+                          query_string={"task_id": -1}, buffered=False)
+    chunks = read_events(response, 2)
+    assert chunks[1].startswith(f"id: {events.epoch}-{event_id}\n")
+
+
+def test_events_resume_after_last_event(client):
+    events = web.agent.events
+    first = events.publish("task", task_id=-2, status="started")
+    events.publish("task", task_id=-2, status="completed")
+    response = client.get("/api/events", headers={"Last-Event-ID": f"{events.epoch}-{first}"},
+                          query_string={"task_id": -2}, buffered=False)
+    chunks = read_events(response, 2)
+    assert '"status": "completed"' in chunks[1]